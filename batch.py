@@ -0,0 +1,13 @@
+"""
+Voice Dictation Widget - Batch Transcription
+Headless entry point: transcribe recorded voice notes in bulk with the
+widget's settings (see core/batch.py for options)
+"""
+import sys
+
+from utils.logger import setup_logging
+from core.batch import main
+
+if __name__ == "__main__":
+    setup_logging()
+    sys.exit(main())
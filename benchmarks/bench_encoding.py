@@ -0,0 +1,94 @@
+# Encoding Benchmark
+"""
+Resampling and codec throughput on the upload path.
+
+Usage:
+    python -m benchmarks.bench_encoding [--quick] [--json results.json]
+"""
+import sys
+import json
+import argparse
+import numpy as np
+
+from core.encoding import PolyphaseResampler, resample, encode_audio, available_codecs
+from benchmarks.fixtures import long_recording
+from benchmarks.harness import measure, blocks
+
+SAMPLE_RATE = 44100
+UPLOAD_RATE = 16000
+BLOCK_SIZE = 1024
+
+
+def bench_resample(seconds):
+    """Streaming and one-shot 44.1 -> 16 kHz resampling"""
+    samples = long_recording(seconds, SAMPLE_RATE)
+    data = blocks(samples, BLOCK_SIZE)
+    int16 = (data * 32767).astype(np.int16)
+    
+    def streaming():
+        resampler = PolyphaseResampler(SAMPLE_RATE, UPLOAD_RATE)
+        for block in int16:
+            resampler.process(block)
+        resampler.flush()
+    
+    results = {
+        "streaming": measure(streaming, repeat=3),
+        "one_shot": measure(lambda: resample(samples[:, None], SAMPLE_RATE, UPLOAD_RATE), repeat=3),
+    }
+    try:
+        from scipy.signal import resample_poly
+        results["scipy_reference"] = measure(lambda: resample_poly(samples, 160, 441), repeat=3)
+    except ImportError:
+        pass
+    
+    return {
+        name: {
+            "ms": round(timing["best"] * 1000, 2),
+            "realtime_factor": round(seconds / timing["best"], 1),
+        }
+        for name, timing in results.items()
+    }
+
+
+def bench_codecs(seconds):
+    """One-shot encode time and size of 16 kHz audio per codec"""
+    int16 = (long_recording(seconds, SAMPLE_RATE)[:, None] * 32767).astype(np.int16)
+    samples = resample(int16, SAMPLE_RATE, UPLOAD_RATE)
+    results = {}
+    for codec in available_codecs():
+        timing = measure(lambda: encode_audio(samples, UPLOAD_RATE, codec), repeat=3)
+        payload = encode_audio(samples, UPLOAD_RATE, codec)
+        results[codec] = {
+            "ms": round(timing["best"] * 1000, 2),
+            "realtime_factor": round(seconds / timing["best"], 1),
+            "payload_bytes": len(payload),
+        }
+    return results
+
+
+def run(quick=False):
+    """
+    Benchmark resampling and encoding
+    
+    Returns:
+        dict: {"resample": {...}, "codecs": {...}}
+    """
+    seconds = 20 if quick else 60
+    return {"resample": bench_resample(seconds), "codecs": bench_codecs(seconds)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark resampling and codecs")
+    parser.add_argument("--quick", action="store_true", help="Use shorter audio")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args(argv)
+    
+    output = json.dumps(run(args.quick), indent=2)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            f.write(output)
+    print(output)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+# Recorder Benchmark
+"""
+Per-block audio callback cost, record-loop work, and the time and peak
+memory of finalizing the upload payload versus recording length.
+
+Usage:
+    python -m benchmarks.bench_recorder [--quick] [--json results.json]
+"""
+import sys
+import json
+import time
+import argparse
+import tempfile
+import numpy as np
+
+from core.recorder import AudioRecorder
+from core.encoding import available_codecs
+from benchmarks.fixtures import long_recording
+from benchmarks.harness import peak_memory, blocks
+
+SAMPLE_RATE = 44100
+BLOCK_SIZE = 1024
+POLL_BLOCKS = 2  # The record loop polls every 50 ms, about two blocks
+THRESHOLD = 0.015
+
+
+def make_recorder(codec="wav", spill_dir=None):
+    """Recorder wired like the widget, with no-op UI callbacks"""
+    recorder = AudioRecorder(SAMPLE_RATE, 1, BLOCK_SIZE, upload_rate=16000, codec=codec)
+    recorder.set_spill(spill_dir)
+    recorder.on_volume_change = lambda vol: None
+    recorder.on_low_volume_warning = lambda is_low: None
+    return recorder
+
+
+def bench_callback(seconds=10.0):
+    """Cost of AudioRecorder._audio_callback per block"""
+    recorder = make_recorder()
+    data = blocks(long_recording(seconds, SAMPLE_RATE), BLOCK_SIZE)
+    recorder._reset(THRESHOLD)
+    
+    times = np.empty(len(data))
+    for i, block in enumerate(data):
+        start = time.perf_counter()
+        recorder._audio_callback(block, BLOCK_SIZE, None, None)
+        times[i] = time.perf_counter() - start
+    
+    return {
+        "blocks": len(data),
+        "us_per_block": round(float(np.mean(times)) * 1e6, 2),
+        "p99_us": round(float(np.percentile(times, 99)) * 1e6, 2),
+        "max_us": round(float(np.max(times)) * 1e6, 2),
+    }
+
+
+def record(recorder, data):
+    """Replay blocks through the callback and the record-loop work"""
+    recorder._reset(THRESHOLD)
+    for i, block in enumerate(data):
+        recorder._audio_callback(block, BLOCK_SIZE, None, None)
+        if i % POLL_BLOCKS == POLL_BLOCKS - 1:
+            recorder._run_vad()
+            recorder._feed_encoder()
+            recorder._spill()
+
+
+def finish(recorder):
+    """Run _process_audio and return the payload it reports"""
+    results = []
+    recorder.on_recording_complete = lambda payload, error=None, no_speech=False: results.append((payload, error))
+    recorder._process_audio(THRESHOLD)
+    payload, error = results[0]
+    if error:
+        raise RuntimeError(error)
+    size = len(payload) if payload else 0
+    if payload:
+        payload.close()
+    return size
+
+
+def bench_recording(seconds, codec, spill_dir=None):
+    """Record-loop CPU, encode time and peak memory for one recording length"""
+    data = blocks(long_recording(seconds, SAMPLE_RATE), BLOCK_SIZE)
+    recorder = make_recorder(codec, spill_dir)
+    
+    start = time.perf_counter()
+    record(recorder, data)
+    loop_time = time.perf_counter() - start
+    start = time.perf_counter()
+    payload_bytes = finish(recorder)
+    encode_time = time.perf_counter() - start
+    
+    # Memory pass separately, tracemalloc slows everything down
+    _, recording_mb = peak_memory(lambda: record(recorder, data))
+    _, encode_mb = peak_memory(lambda: finish(recorder))
+    
+    return {
+        "loop_ms_per_s": round(loop_time * 1000 / seconds, 3),
+        "encode_ms": round(encode_time * 1000, 2),
+        "payload_bytes": payload_bytes,
+        "peak_recording_mb": recording_mb,
+        "peak_encode_mb": encode_mb,
+    }
+
+
+def run(quick=False):
+    """
+    Benchmark the recorder hot paths
+    
+    Returns:
+        dict: {"callback": metrics, "recording": {length: {codec: metrics}}};
+        "<codec>_spill" entries are long-recording mode
+    """
+    lengths = (10, 60) if quick else (10, 60, 300)
+    codecs = [codec for codec in ("wav", "flac") if codec in available_codecs()]
+    results = {"callback": bench_callback(), "recording": {}}
+    with tempfile.TemporaryDirectory() as spill_dir:
+        for seconds in lengths:
+            entry = results["recording"][f"{seconds}s"] = {}
+            for codec in codecs:
+                entry[codec] = bench_recording(seconds, codec)
+                entry[f"{codec}_spill"] = bench_recording(seconds, codec, spill_dir)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the audio recorder")
+    parser.add_argument("--quick", action="store_true", help="Skip the longest recordings")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args(argv)
+    
+    output = json.dumps(run(args.quick), indent=2)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            f.write(output)
+    print(output)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+# Text Post-processing Benchmark
+"""
+Throughput of transcript post-processing on large transcripts.
+
+Usage:
+    python -m benchmarks.bench_text [--quick] [--json results.json]
+"""
+import sys
+import json
+import argparse
+
+from core.transcriber import Transcriber
+from core.chunking import AudioChunker
+from core.postprocess import PostProcessor, WhitespaceCleaner, Vocabulary
+from benchmarks.fixtures import transcript
+from benchmarks.harness import measure
+
+
+def bench_capitalize(chars):
+    """Transcriber.capitalize_text on a transcript of chars characters"""
+    text = transcript(chars)
+    timing = measure(lambda: Transcriber.capitalize_text(text), repeat=5)
+    return {
+        "ms": round(timing["best"] * 1000, 3),
+        "mb_per_s": round(len(text.encode("utf-8")) / 1e6 / timing["best"], 1),
+    }
+
+
+def bench_postprocess(chars, terms=5000):
+    """Full chain (cleanup, vocabulary of terms entries, capitalization), whole and streamed"""
+    text = transcript(chars)
+    vocabulary = {f"term{i} word{i % 97}": f"Term{i}" for i in range(terms)}
+    vocabulary["python code"] = "Python code"
+    processor = PostProcessor([WhitespaceCleaner(), Vocabulary(vocabulary)])
+    
+    def streamed():
+        stream = processor.stream()
+        for start in range(0, len(text), 200):
+            stream.feed(text[start:start + 200])
+        stream.flush()
+    
+    whole = measure(lambda: processor.apply(text), repeat=3)
+    incremental = measure(streamed, repeat=3)
+    return {
+        "ms": round(whole["best"] * 1000, 3),
+        "mb_per_s": round(len(text.encode("utf-8")) / 1e6 / whole["best"], 1),
+        "stream_ms": round(incremental["best"] * 1000, 3),
+    }
+
+
+# (texts, expected): chunk transcripts whose overlaps merge() must remove, or leave alone
+MERGE_CASES = [
+    (["the quick brown fox jumps", "fox jumps over the lazy dog"],
+     "the quick brown fox jumps over the lazy dog"),
+    (["we met at the station yesterday mor", "yesterday morning we walked home"],
+     "we met at the station yesterday morning we walked home"),
+    # Shared words away from the seam are not overlap
+    (["please send the report to Maria before noon", "then the report arrives tomorrow"],
+     "please send the report to Maria before noon then the report arrives tomorrow"),
+    (["the meeting moved to Thursday because", "everyone agreed Thursday works better"],
+     "the meeting moved to Thursday because everyone agreed Thursday works better"),
+    (["hello there", "general greetings"], "hello there general greetings"),
+    # Punctuation at the seam survives the merge
+    (["thanks again my dear friend", "dear friend, see you soon."],
+     "thanks again my dear friend, see you soon."),
+    (["she said it was over.", "it was over, then laughed"],
+     "she said it was over, then laughed"),
+]
+
+
+def bench_merge():
+    """Chunk seam merging: correct cases and time per merge"""
+    chunker = AudioChunker()
+    wrong = [expected for texts, expected in MERGE_CASES if chunker.merge(texts) != expected]
+    timing = measure(lambda: [chunker.merge(texts) for texts, _ in MERGE_CASES], repeat=5)
+    return {
+        "cases": len(MERGE_CASES),
+        "correct": len(MERGE_CASES) - len(wrong),
+        "us_per_merge": round(timing["best"] / len(MERGE_CASES) * 1e6, 1),
+    }
+
+
+def run(quick=False):
+    """
+    Benchmark post-processing
+    
+    Returns:
+        dict: {"capitalize": {size: metrics}, "postprocess": {size: metrics}, "merge": metrics}
+    """
+    sizes = (1_000, 100_000) if quick else (1_000, 100_000, 1_000_000)
+    return {
+        "capitalize": {f"{size}_chars": bench_capitalize(size) for size in sizes},
+        "postprocess": {f"{size}_chars": bench_postprocess(size) for size in sizes},
+        "merge": bench_merge(),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark transcript post-processing")
+    parser.add_argument("--quick", action="store_true", help="Skip the largest transcript")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args(argv)
+    
+    output = json.dumps(run(args.quick), indent=2)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            f.write(output)
+    print(output)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
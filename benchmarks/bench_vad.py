@@ -0,0 +1,134 @@
+# VAD Benchmark
+"""
+Accuracy, end-pointing and throughput of the detectors in core.vad over
+synthetic dictations mixed with different room noises.
+
+Usage:
+    python -m benchmarks.bench_vad [--json results.json]
+"""
+import sys
+import json
+import time
+import argparse
+import numpy as np
+
+from core.vad import VoiceActivityDetector, create_vad, frame_signal, volume_to_rms
+from benchmarks.fixtures import dictation, frame_labels
+
+SAMPLE_RATE = 44100
+BLOCK_SIZE = 1024
+SILENCE_DURATION = 1.2  # Default auto-stop timeout
+POLL_BLOCKS = 2  # The record loop polls every 50 ms, about two blocks
+
+
+class LegacyNormDetector(VoiceActivityDetector):
+    """The original end-pointing rule: np.linalg.norm(block) * 10 > 0.015"""
+    
+    def _detect(self, frames):
+        return np.linalg.norm(frames, axis=1) * 10 > 0.015
+
+
+# (name, noise kind, SNR in dB, speech RMS)
+SCENARIOS = [
+    ("quiet", None, None, 0.1),
+    ("pink_20db", "pink", 20.0, 0.1),
+    ("pink_10db", "pink", 10.0, 0.1),
+    ("hum_15db", "hum", 15.0, 0.1),
+    ("babble_15db", "babble", 15.0, 0.1),
+    ("white_10db", "white", 10.0, 0.1),
+    # Soft-spoken dictation and distant microphones
+    ("soft_0.02_pink_20db", "pink", 20.0, 0.02),
+    ("soft_0.01_pink_20db", "pink", 20.0, 0.01),
+    ("soft_0.005_pink_20db", "pink", 20.0, 0.005),
+    ("soft_0.003_pink_20db", "pink", 20.0, 0.003),
+    ("soft_0.003_quiet", None, None, 0.003),
+]
+
+
+def make_detectors(threshold=0.015):
+    """Detectors under test, keyed by name; threshold is the silence_threshold setting"""
+    rms = volume_to_rms(threshold, BLOCK_SIZE)  # As the recorder converts it
+    return {
+        "legacy": lambda: LegacyNormDetector(),
+        "energy": lambda: create_vad("energy", rms, SAMPLE_RATE),
+        "spectral": lambda: create_vad("spectral", rms, SAMPLE_RATE),
+    }
+
+
+def evaluate(detector, samples, labels):
+    """Run a detector the way the recorder does and score it"""
+    frames = frame_signal(samples, BLOCK_SIZE)
+    truth = frame_labels(labels, BLOCK_SIZE)
+    
+    start = time.perf_counter()
+    decisions = [detector.process(frames[i:i + POLL_BLOCKS]) for i in range(0, len(frames), POLL_BLOCKS)]
+    elapsed = time.perf_counter() - start
+    speech = np.concatenate(decisions)
+    
+    block_seconds = BLOCK_SIZE / SAMPLE_RATE
+    true_end = (np.flatnonzero(truth)[-1] + 1) * block_seconds
+    detected = np.flatnonzero(speech)
+    detected_end = (detected[-1] + 1) * block_seconds if len(detected) else 0.0
+    
+    # Auto-stop fires once SILENCE_DURATION passes without speech
+    stop_time = detected_end + SILENCE_DURATION
+    stops = stop_time <= len(frames) * block_seconds
+    
+    return {
+        "accuracy": float(np.mean(speech == truth)),
+        "recall": float(np.mean(speech[truth])) if truth.any() else 1.0,
+        "false_alarm": float(np.mean(speech[~truth])) if (~truth).any() else 0.0,
+        "endpoint_delay_s": round(max(0.0, detected_end - true_end), 3),
+        "stop_latency_s": round(stop_time - true_end, 3) if stops else None,
+        "realtime_factor": round((len(frames) * block_seconds) / max(elapsed, 1e-9), 1),
+        "us_per_block": round(elapsed / max(len(frames), 1) * 1e6, 2),
+    }
+
+
+def run(seeds=3, speech_seconds=6.0, trailing_seconds=3.0):
+    """
+    Benchmark every detector over every scenario
+    
+    Returns:
+        dict: {detector: {scenario: metrics averaged over seeds}}
+    """
+    results = {}
+    for name, factory in make_detectors().items():
+        results[name] = {}
+        for scenario, kind, snr, level in SCENARIOS:
+            runs = []
+            for seed in range(seeds):
+                samples, labels = dictation(speech_seconds, trailing_seconds, kind, snr or 0.0, SAMPLE_RATE, seed, level)
+                runs.append(evaluate(factory(), samples, labels))
+            results[name][scenario] = _average(runs)
+    return results
+
+
+def _average(runs):
+    """Average metrics across runs; a scenario only 'stops' if every run stopped"""
+    summary = {}
+    for key in runs[0]:
+        values = [r[key] for r in runs]
+        if any(v is None for v in values):
+            summary[key] = None
+        else:
+            summary[key] = round(float(np.mean(values)), 3)
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark voice activity detectors")
+    parser.add_argument("--seeds", type=int, default=3)
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args(argv)
+    
+    results = run(seeds=args.seeds)
+    output = json.dumps(results, indent=2)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            f.write(output)
+    print(output)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
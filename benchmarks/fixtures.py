@@ -0,0 +1,132 @@
+# Synthetic Audio Fixtures
+import numpy as np
+
+
+def speech_like(duration, sample_rate=44100, seed=0, level=0.1):
+    """
+    Voiced, syllable-rate modulated harmonic signal with pauses
+    
+    Args:
+        duration: Seconds of signal
+        sample_rate: Sample rate
+        seed: Random seed
+        level: Target RMS of the voiced parts
+    
+    Returns:
+        (samples, labels): float32 samples and a per-sample speech mask
+    """
+    rng = np.random.default_rng(seed)
+    total = int(duration * sample_rate)
+    samples = np.zeros(total, dtype=np.float32)
+    labels = np.zeros(total, dtype=bool)
+    
+    pos = int(rng.uniform(0.1, 0.3) * sample_rate)
+    while pos < total:
+        # A word: 1-3 syllables separated by short gaps
+        for _ in range(rng.integers(1, 4)):
+            length = int(rng.uniform(0.12, 0.3) * sample_rate)
+            end = min(pos + length, total)
+            if end <= pos:
+                break
+            t = np.arange(end - pos) / sample_rate
+            f0 = rng.uniform(100, 220) * (1 + 0.05 * np.sin(2 * np.pi * 3 * t))
+            phase = 2 * np.pi * np.cumsum(f0) / sample_rate
+            voiced = sum(np.sin(k * phase) / k for k in range(1, 12))
+            envelope = np.sin(np.pi * np.arange(end - pos) / (end - pos)) ** 0.5
+            syllable = voiced * envelope
+            syllable *= level / (np.sqrt(np.mean(syllable ** 2)) + 1e-9)
+            samples[pos:end] = syllable
+            labels[pos:end] = True
+            pos = end + int(rng.uniform(0.03, 0.08) * sample_rate)
+        # Pause between words or phrases
+        pos += int(rng.choice([rng.uniform(0.1, 0.25), rng.uniform(0.5, 0.9)]) * sample_rate)
+    
+    return samples, labels
+
+
+def tone(duration, freq=440.0, sample_rate=44100, level=0.1):
+    """Pure sine tone at the given RMS level"""
+    t = np.arange(int(duration * sample_rate)) / sample_rate
+    return (np.sin(2 * np.pi * freq * t) * level * np.sqrt(2)).astype(np.float32)
+
+
+def silence(duration, sample_rate=44100):
+    """Digital silence"""
+    return np.zeros(int(duration * sample_rate), dtype=np.float32)
+
+
+def noise(duration, kind="white", sample_rate=44100, seed=1, level=0.01):
+    """
+    Background noise at the given RMS level
+    
+    Args:
+        kind: "white", "pink", "hum" (mains hum + fan rumble) or "babble"
+    """
+    rng = np.random.default_rng(seed)
+    total = int(duration * sample_rate)
+    
+    if kind == "white":
+        signal = rng.standard_normal(total)
+    elif kind == "pink":
+        spectrum = np.fft.rfft(rng.standard_normal(total))
+        freqs = np.fft.rfftfreq(total)
+        freqs[0] = freqs[1]
+        signal = np.fft.irfft(spectrum / np.sqrt(freqs), total)
+    elif kind == "hum":
+        t = np.arange(total) / sample_rate
+        signal = sum(np.sin(2 * np.pi * 50 * k * t) / k for k in range(1, 6))
+        rumble = np.cumsum(rng.standard_normal(total))
+        rumble -= np.convolve(rumble, np.ones(512) / 512, mode='same')
+        signal = signal + rumble / (np.std(rumble) + 1e-9)
+    elif kind == "babble":
+        signal = sum(speech_like(duration, sample_rate, seed=seed + k, level=1.0)[0] for k in range(6))
+    else:
+        raise ValueError(f"Unknown noise kind: {kind}")
+    
+    signal = np.asarray(signal, dtype=np.float64)
+    signal *= level / (np.sqrt(np.mean(signal ** 2)) + 1e-12)
+    return signal.astype(np.float32)
+
+
+def dictation(speech=6.0, trailing=3.0, noise_kind="pink", snr_db=20.0, sample_rate=44100, seed=0, level=0.1):
+    """
+    Speech at an RMS level followed by trailing room tone, mixed at an SNR
+    
+    Returns:
+        (samples, labels): float32 samples and a per-sample speech mask
+    """
+    voice, labels = speech_like(speech, sample_rate, seed=seed, level=level)
+    voice = np.concatenate([voice, silence(trailing, sample_rate)])
+    labels = np.concatenate([labels, np.zeros(len(voice) - len(labels), dtype=bool)])
+    if noise_kind is None:
+        return voice, labels
+    
+    noise_level = level / (10 ** (snr_db / 20))
+    mixed = voice + noise(len(voice) / sample_rate, noise_kind, sample_rate, seed + 100, noise_level)
+    return np.clip(mixed, -1.0, 1.0).astype(np.float32), labels
+
+
+def long_recording(duration, sample_rate=44100, seed=0):
+    """Dictation of the given total length with 2 s of trailing room tone"""
+    samples, _ = dictation(max(duration - 2.0, 0.5), 2.0, "pink", 20.0, sample_rate, seed)
+    return samples
+
+
+def transcript(chars, seed=0):
+    """Lower-case English dictation text of roughly chars characters"""
+    rng = np.random.default_rng(seed)
+    words = ("the quick brown fox jumps over a lazy dog while we dictate notes about "
+             "meetings budgets deadlines and python code review").split()
+    parts = []
+    length = 0
+    while length < chars:
+        sentence = " ".join(rng.choice(words, rng.integers(4, 14))) + str(rng.choice([".", "!", "?", ",", "."]))
+        parts.append(sentence)
+        length += len(sentence) + 1
+    return " ".join(parts)[:chars]
+
+
+def frame_labels(labels, frame_size):
+    """Per-frame ground truth: a frame is speech if most of it is"""
+    count = len(labels) // frame_size
+    return labels[:count * frame_size].reshape(count, frame_size).mean(axis=1) > 0.5
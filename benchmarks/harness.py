@@ -0,0 +1,56 @@
+# Benchmark Harness
+import gc
+import time
+import tracemalloc
+import numpy as np
+
+
+def measure(fn, repeat=5, number=1):
+    """
+    Time a callable
+    
+    Args:
+        fn: Callable taking no arguments
+        repeat: Timed rounds
+        number: Calls per round
+    
+    Returns:
+        dict: best and median seconds per call
+    """
+    times = []
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(number):
+                fn()
+            times.append((time.perf_counter() - start) / number)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return {"best": min(times), "median": float(np.median(times))}
+
+
+def peak_memory(fn):
+    """
+    Run a callable once and report the peak traced allocation
+    
+    Returns:
+        (result, peak_mb)
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, round(peak / 1e6, 2)
+
+
+def blocks(samples, block_size, channels=1):
+    """Split a signal into the float32 (frames, channels) blocks sounddevice delivers"""
+    count = len(samples) // block_size
+    data = samples[:count * block_size].astype(np.float32).reshape(count, block_size, 1)
+    return np.repeat(data, channels, axis=2) if channels > 1 else data
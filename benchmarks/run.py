@@ -0,0 +1,150 @@
+# Benchmark Runner
+"""
+Runs every benchmark suite, writes the results as JSON and optionally
+compares them with a stored baseline.
+
+Usage:
+    python -m benchmarks.run [--quick] [--only recorder,text] [--json results.json]
+                             [--baseline baseline.json] [--tolerance 0.15] [--fail-on-regression]
+"""
+import sys
+import json
+import time
+import platform
+import argparse
+import numpy as np
+
+from benchmarks import bench_recorder, bench_encoding, bench_text, bench_vad
+
+SUITES = {
+    "recorder": bench_recorder.run,
+    "encoding": bench_encoding.run,
+    "text": bench_text.run,
+    "vad": lambda quick: bench_vad.run(seeds=1 if quick else 3),
+}
+
+# Metric name endings and whether a larger value is better
+HIGHER_IS_BETTER = ("realtime_factor", "mb_per_s", "accuracy", "recall")
+LOWER_IS_BETTER = ("_ms", "_us", "us_per_block", "_mb", "_ms_per_s", "delay_s", "latency_s", "false_alarm", "ms")
+
+
+def run(suites=None, quick=False):
+    """
+    Run the selected suites
+    
+    Returns:
+        dict: {"meta": {...}, "results": {suite: results}}
+    """
+    results = {}
+    for name in suites or SUITES:
+        start = time.perf_counter()
+        results[name] = SUITES[name](quick)
+        print(f"{name}: {time.perf_counter() - start:.1f}s", file=sys.stderr)
+    
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "quick": quick,
+        },
+        "results": results,
+    }
+
+
+def flatten(results, prefix=""):
+    """Nested results as {"suite.case.metric": value} for numeric metrics"""
+    flat = {}
+    for key, value in results.items():
+        path = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            flat.update(flatten(value, path))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[path] = value
+    return flat
+
+
+def direction(metric):
+    """1 if larger is better, -1 if smaller is better, 0 if not compared"""
+    name = metric.rsplit(".", 1)[-1]
+    if name.endswith(HIGHER_IS_BETTER):
+        return 1
+    if name.endswith(LOWER_IS_BETTER):
+        return -1
+    return 0
+
+
+def compare(current, baseline, tolerance=0.15, noise_floor=0.05):
+    """
+    Compare results against a baseline
+    
+    Args:
+        current: "results" of this run
+        baseline: "results" of the baseline run
+        tolerance: Relative change ignored as noise
+        noise_floor: Absolute change ignored as noise (timer resolution, rounding)
+    
+    Returns:
+        list: (metric, baseline value, current value, relative change, verdict)
+    """
+    now, before = flatten(current), flatten(baseline)
+    rows = []
+    for metric in sorted(now.keys() & before.keys()):
+        sign = direction(metric)
+        if not sign or not before[metric]:
+            continue
+        change = (now[metric] - before[metric]) / abs(before[metric])
+        if abs(now[metric] - before[metric]) <= noise_floor:
+            verdict = "same"
+        elif change * sign < -tolerance:
+            verdict = "regression"
+        elif change * sign > tolerance:
+            verdict = "improvement"
+        else:
+            verdict = "same"
+        rows.append((metric, before[metric], now[metric], change, verdict))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the benchmark suites")
+    parser.add_argument("--quick", action="store_true", help="Smaller inputs for CI")
+    parser.add_argument("--only", help=f"Comma-separated suites out of {', '.join(SUITES)}")
+    parser.add_argument("--json", help="Write results to this file")
+    parser.add_argument("--baseline", help="Compare against results saved with --json")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Relative change treated as noise")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args(argv)
+    
+    suites = args.only.split(",") if args.only else None
+    unknown = [name for name in suites or [] if name not in SUITES]
+    if unknown:
+        parser.error(f"Unknown suites: {', '.join(unknown)}")
+    
+    report = run(suites, args.quick)
+    output = json.dumps(report, indent=2)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            f.write(output)
+    else:
+        print(output)
+    
+    if not args.baseline:
+        return 0
+    
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    rows = compare(report["results"], baseline["results"], args.tolerance)
+    regressions = [row for row in rows if row[4] == "regression"]
+    for metric, before, now, change, verdict in rows:
+        if verdict != "same":
+            print(f"{verdict:>11}  {metric}: {before} -> {now} ({change:+.0%})")
+    print(f"{len(rows)} metrics compared, {len(regressions)} regressions "
+          f"(tolerance {args.tolerance:.0%})")
+    return 1 if regressions and args.fail_on_regression else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,17 +1,42 @@
 # Configuration Manager
 import os
 import json
+import time
+import atexit
+import tempfile
+import threading
 import logging
+from contextlib import contextmanager
 
 logger = logging.getLogger(__name__)
 
 
 class ConfigManager:
-    """Manages application configuration with validation"""
+    """
+    Manages application configuration with validation
     
-    def __init__(self, config_file="config.json"):
+    Changes are kept in memory and written in the background after
+    flush_delay seconds, so bursts of set() calls cost one atomic write.
+    """
+    
+    def __init__(self, config_file="config.json", flush_delay=0.5, watch=False, watch_interval=1.0):
         self.config_file = config_file
+        self.flush_delay = flush_delay
+        self.lock = threading.RLock()
+        self.save_lock = threading.Lock()  # One write at a time, so the newest snapshot lands last
+        self.batch_depth = 0
+        self.dirty = False
+        self.flush_timer = None
+        self.file_signature = None  # (mtime, size) after our last read or write
+        self.on_change = []  # Callbacks with the set of keys changed by an external edit
+        
         self.config = self.load()
+        self.file_signature = self._signature()
+        atexit.register(self.flush)
+        
+        self.watching = threading.Event()
+        if watch:
+            self.start_watching(watch_interval)
     
     def load(self):
         """Load configuration from file with defaults"""
@@ -24,7 +49,46 @@ class ConfigManager:
             "widget_x": None,
             "widget_y": None,
             "auto_capitalize": True,
-            "min_volume_threshold": 0.01
+            "min_volume_threshold": 0.01,
+            "ui_update_rate": 15,
+            "streaming_mode": False,
+            "upload_sample_rate": 16000,
+            "upload_codec": "flac",
+            "vad": "energy",
+            "trim_silence": True,
+            "max_pause": 1.0,
+            "standby_mode": False,
+            "preroll_ms": 400,
+            "connect_timeout": 5.0,
+            "request_timeout": 30.0,
+            "deadline": 20.0,
+            "max_retries": 2,
+            "hedge_requests": True,
+            "backend": "groq",
+            "backend_url": "",
+            "model": "whisper-large-v3",
+            "cache_dir": "",
+            "cache_disk_mb": 50,
+            "trace_file": "traces.jsonl",
+            "lazy_startup": True,
+            "long_recording": False,
+            "spill_dir": "recordings",
+            "spill_ram_seconds": 10,
+            "chunk_long_audio": True,
+            "chunk_seconds": 60,
+            "chunk_overlap": 1.5,
+            "chunk_workers": 4,
+            "max_upload_mb": 24,
+            "api_keys": [],
+            "rate_limit_queue": 300,
+            "arabic_normalization": [],
+            "digits": "",
+            "vocabulary": {},
+            "vocabulary_file": "",
+            "output_sinks": ["clipboard"],
+            "output_file": "dictations.txt",
+            "output_socket": "127.0.0.1:8766",
+            "typing_interval": 0
         }
         
         if os.path.exists(self.config_file):
@@ -54,19 +118,143 @@ class ConfigManager:
             return False
     
     def save(self):
-        """Save configuration to file"""
+        """Write configuration to file now, atomically"""
+        with self.save_lock:
+            self._write()
+    
+    def flush(self):
+        """Write pending changes now, if any"""
+        with self.save_lock:
+            with self.lock:
+                if not self.dirty:
+                    return
+            self._write()
+    
+    def _write(self):
+        """Snapshot the config and replace the file with it; the caller holds save_lock"""
+        with self.lock:
+            self._cancel_flush()
+            data = json.dumps(self.config, indent=2, ensure_ascii=False)
+            self.dirty = False
+        
+        # A unique temp file, so another process saving the same config cannot interleave with us
+        directory = os.path.dirname(os.path.abspath(self.config_file))
+        fd, tmp = tempfile.mkstemp(prefix=f"{os.path.basename(self.config_file)}.", suffix=".tmp", dir=directory)
         try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(self.config, f, indent=2, ensure_ascii=False)
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.config_file)
+            self.file_signature = self._signature()
             logger.info("Config saved")
         except Exception as e:
             logger.error(f"Config save error: {e}")
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            with self.lock:
+                self.dirty = True
+    
+    def close(self):
+        """Stop watching and write pending changes"""
+        self.watching.clear()
+        self.flush()
     
     def get(self, key):
         """Get configuration value"""
         return self.config.get(key)
     
     def set(self, key, value):
-        """Set configuration value and save"""
-        self.config[key] = value
-        self.save()
+        """Set configuration value; it is written shortly after in the background"""
+        with self.lock:
+            if self.config.get(key) == value and key in self.config:
+                return
+            self.config[key] = value
+            self.dirty = True
+            if not self.batch_depth:
+                self._schedule_flush()
+    
+    @contextmanager
+    def batch(self):
+        """Group several set() calls into a single write"""
+        with self.lock:
+            self.batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self.lock:
+                self.batch_depth -= 1
+                if not self.batch_depth and self.dirty:
+                    self._schedule_flush()
+    
+    def _schedule_flush(self):
+        """Write after flush_delay; later changes ride along with the pending write"""
+        if self.flush_timer is not None:
+            return
+        self.flush_timer = threading.Timer(self.flush_delay, self._flush_from_timer)
+        self.flush_timer.daemon = True
+        self.flush_timer.start()
+    
+    def _flush_from_timer(self):
+        with self.lock:
+            self.flush_timer = None
+        self.flush()
+    
+    def _cancel_flush(self):
+        if self.flush_timer is not None:
+            self.flush_timer.cancel()
+            self.flush_timer = None
+    
+    def _signature(self):
+        try:
+            stat = os.stat(self.config_file)
+            return (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            return None
+    
+    def start_watching(self, interval=1.0):
+        """Reload the file when another program changes it"""
+        if self.watching.is_set():
+            return
+        self.watching.set()
+        threading.Thread(target=self._watch, args=(interval,), daemon=True).start()
+    
+    def _watch(self, interval):
+        while self.watching.is_set():
+            time.sleep(interval)
+            signature = self._signature()
+            if signature is None or signature == self.file_signature:
+                continue
+            self.reload()
+    
+    def reload(self):
+        """Re-read the file, keeping changes not yet written"""
+        signature = self._signature()
+        try:
+            with open(self.config_file, encoding='utf-8') as f:
+                loaded = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable config change: {e}")
+            self.file_signature = signature
+            return
+        if not isinstance(loaded, dict) or not self._validate_config(loaded):
+            logger.warning("Ignoring invalid config change")
+            self.file_signature = signature
+            return
+        
+        with self.lock:
+            if self.dirty:
+                return  # Our pending write wins
+            old = dict(self.config)
+            self.config = {**self.config, **loaded}
+            self.file_signature = signature
+            changed = {key for key in self.config if self.config.get(key) != old.get(key)}
+        if changed:
+            logger.info(f"Config reloaded, changed: {', '.join(sorted(changed))}")
+            for callback in self.on_change:
+                try:
+                    callback(changed)
+                except Exception as e:
+                    logger.error(f"Config change callback error: {e}")
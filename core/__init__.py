@@ -1,5 +1,10 @@
 # Core package
 from .recorder import AudioRecorder
 from .transcriber import Transcriber
+from .streaming import StreamingSession
+from .transport import HttpTransport
+from .jobs import TranscriptionJob, TranscriptionQueue
+from .cache import TranscriptCache
 
-__all__ = ['AudioRecorder', 'Transcriber']
+__all__ = ['AudioRecorder', 'Transcriber', 'StreamingSession', 'HttpTransport',
+           'TranscriptionJob', 'TranscriptionQueue', 'TranscriptCache']
@@ -0,0 +1,48 @@
+# Transcription Backends
+import logging
+
+from .base import TranscriptionBackend
+from .openai_compat import OpenAICompatibleBackend
+from .local import LocalServer, LocalBackend, LatencyProfile, ErrorProfile, RateLimitProfile
+from ..transport import HttpTransport, GROQ_BASE_URL
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ("groq", "openai", "local")
+
+
+def create_backend(name="groq", transport=None, base_url=None, model=None, api_key=None):
+    """
+    Build a backend by name
+    
+    Args:
+        name: One of BACKENDS
+        transport: HttpTransport to send requests on
+        base_url: API root for the "openai" backend, e.g. https://api.groq.com/openai/v1
+        model: Model name, defaults to whisper-large-v3
+        api_key: API key
+    
+    Returns:
+        TranscriptionBackend
+    """
+    model = model or "whisper-large-v3"
+    if name not in BACKENDS:
+        logger.warning(f"Unknown backend '{name}', using groq")
+        name = "groq"
+    
+    if name == "local":
+        return LocalBackend(transport, model=model, api_key=api_key)
+    
+    if name == "openai":
+        base_url = base_url or f"{GROQ_BASE_URL}/openai/v1"
+        transport = transport or HttpTransport(base_url=base_url)
+        transport.base_url = base_url
+        return OpenAICompatibleBackend(transport, base_url, model, api_key)
+    
+    # Imported lazily so the other backends work without the SDK
+    from .groq_backend import GroqBackend
+    return GroqBackend(transport or HttpTransport(), model, api_key)
+
+
+__all__ = ['TranscriptionBackend', 'OpenAICompatibleBackend', 'LocalServer', 'LocalBackend',
+           'LatencyProfile', 'ErrorProfile', 'RateLimitProfile', 'BACKENDS', 'create_backend']
@@ -0,0 +1,103 @@
+# Transcription Backend Interface
+import time
+import logging
+import httpx
+
+from ..ratelimit import KeyPool
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUSES = {408, 409, 429, 500, 502, 503, 504}
+
+
+class TranscriptionBackend:
+    """Base class for speech-to-text services"""
+    
+    name = "base"
+    requires_api_key = True
+    
+    def __init__(self, transport, model="whisper-large-v3", api_key=None):
+        self.transport = transport
+        self.model = model
+        self.api_key = api_key
+        self.extra_keys = []
+        # Every key gets its own learned rate limits; requests go to the least loaded
+        self.keys = KeyPool([api_key] if api_key else [])
+    
+    def set_api_key(self, api_key):
+        """Update the API key used for requests"""
+        self.api_key = api_key
+        self._sync_keys()
+    
+    def set_extra_keys(self, keys):
+        """Additional API keys to spread requests over"""
+        self.extra_keys = [key for key in keys or () if key]
+        self._sync_keys()
+    
+    def _sync_keys(self):
+        self.keys.set_keys([key for key in [self.api_key, *self.extra_keys] if key])
+    
+    def prewarm(self):
+        """Open a connection ahead of the first request"""
+        self.transport.prewarm()
+    
+    def transcribe(self, upload, language, response_format="text", timeout=None):
+        """
+        Send one recording to the service
+        
+        Waits (within timeout) for a key with rate-limit budget, and feeds
+        the rate-limit headers of the response back into the key pool.
+        
+        Args:
+            upload: (filename, content) pair
+            language: Language code of the speech
+            response_format: Response format requested from the service
+            timeout: Seconds left before the caller's deadline
+        
+        Returns:
+            str: Raw transcript text
+        
+        Raises:
+            RateLimitExceeded: If no key has budget before the timeout
+        """
+        start = time.monotonic()
+        key = self.keys.acquire(timeout)
+        if timeout is not None:
+            timeout -= time.monotonic() - start
+        headers = status = None
+        try:
+            text, headers = self._send(upload, language, key, response_format, timeout)
+            return text
+        except Exception as e:
+            response = getattr(e, "response", None)
+            headers = getattr(response, "headers", None)
+            status = getattr(e, "status_code", None) or getattr(response, "status_code", None)
+            raise
+        finally:
+            self.keys.release(key, headers, status)
+    
+    def _send(self, upload, language, api_key, response_format, timeout):
+        """
+        Make the request with a given key
+        
+        Returns:
+            (text, headers): Raw transcript and the response headers
+        """
+        raise NotImplementedError
+    
+    def is_retryable(self, error):
+        """Whether a failed request may succeed if sent again"""
+        if isinstance(error, (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError)):
+            return True
+        status = getattr(error, "status_code", None)
+        if status is None:
+            response = getattr(error, "response", None)
+            status = getattr(response, "status_code", None)
+        return status in RETRYABLE_STATUSES
+    
+    def close(self):
+        """Release connections"""
+        self.transport.close()
+    
+    def __repr__(self):
+        return f"{type(self).__name__}(model={self.model})"
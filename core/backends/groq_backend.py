@@ -0,0 +1,50 @@
+# Groq Backend
+import logging
+from groq import Groq, APIConnectionError
+
+from .base import TranscriptionBackend
+
+logger = logging.getLogger(__name__)
+
+
+class GroqBackend(TranscriptionBackend):
+    """Groq SDK client running on the pooled transport"""
+    
+    name = "groq"
+    
+    def __init__(self, transport, model="whisper-large-v3", api_key=None):
+        super().__init__(transport, model, api_key)
+        self.clients = {}  # API key -> client, all on the pooled transport
+    
+    def _client(self, api_key):
+        """API client for a key, built on top of the pooled transport"""
+        client = self.clients.get(api_key)
+        if client is None:
+            client = self.clients[api_key] = Groq(
+                api_key=api_key,
+                http_client=self.transport.client,
+                timeout=self.transport.timeout,
+                max_retries=0  # Retries are left to the RequestPolicy
+            )
+        return client
+    
+    def _sync_keys(self):
+        super()._sync_keys()
+        for key in set(self.clients) - set(self.keys.keys):
+            del self.clients[key]
+    
+    def _send(self, upload, language, api_key, response_format, timeout):
+        # The raw response carries the rate-limit headers
+        response = self._client(api_key).audio.transcriptions.with_raw_response.create(
+            file=upload,
+            model=self.model,
+            language=language,
+            response_format=response_format,
+            timeout=self.transport.timeout_within(timeout)
+        )
+        self.transport.mark_used()
+        return response.parse(), response.headers
+    
+    def is_retryable(self, error):
+        # Covers APITimeoutError too; status errors carry status_code
+        return isinstance(error, APIConnectionError) or super().is_retryable(error)
@@ -0,0 +1,332 @@
+# Local Stand-in Server
+"""
+Offline stand-in for the transcription API.
+
+Serves the OpenAI-compatible /v1/audio/transcriptions route from a
+background thread and replays canned transcripts with configurable
+latency and failures, so the whole pipeline can run without a key or
+network.
+
+Usage:
+    python -m core.backends.local [--port 8765] [--latency 0.3] [--error-rate 0.1] [--rpm 20]
+"""
+import sys
+import math
+import json
+import time
+import random
+import argparse
+import threading
+import itertools
+import logging
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .openai_compat import OpenAICompatibleBackend
+from ..transport import HttpTransport
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TRANSCRIPTS = {
+    "ar": ["مرحبا، هذا نص تجريبي.", "كيف حالك اليوم؟"],
+    "en": ["hello, this is a test transcript.", "how are you today?"],
+}
+
+
+class LatencyProfile:
+    """How long the stand-in takes to answer"""
+    
+    def __init__(self, base=0.3, jitter=0.1, per_mb=0.5, slow_rate=0.0, slow_factor=5.0):
+        self.base = base  # Seconds for every request
+        self.jitter = jitter  # Uniform +/- spread around base
+        self.per_mb = per_mb  # Extra seconds per MB uploaded
+        self.slow_rate = slow_rate  # Fraction of requests hitting the slow tail
+        self.slow_factor = slow_factor  # Multiplier for tail requests
+    
+    def sample(self, rng, size):
+        """Latency in seconds for an upload of size bytes"""
+        delay = self.base + rng.uniform(-self.jitter, self.jitter) + self.per_mb * size / 1e6
+        if rng.random() < self.slow_rate:
+            delay *= self.slow_factor
+        return max(0.0, delay)
+
+
+class ErrorProfile:
+    """Which requests the stand-in fails"""
+    
+    def __init__(self, rate=0.0, statuses=(500, 503, 429), hang_rate=0.0, hang_seconds=60.0):
+        self.rate = rate  # Fraction of requests answered with an error status
+        self.statuses = tuple(statuses)
+        self.hang_rate = hang_rate  # Fraction of requests that stall before answering
+        self.hang_seconds = hang_seconds
+    
+    def sample(self, rng):
+        """
+        Returns:
+            (status, hang): Error status or None, and seconds to stall
+        """
+        hang = self.hang_seconds if rng.random() < self.hang_rate else 0.0
+        status = rng.choice(self.statuses) if rng.random() < self.rate else None
+        return status, hang
+
+
+class RateLimitProfile:
+    """Per-key request limit, announced in x-ratelimit-* headers like the real API"""
+    
+    def __init__(self, requests=20, window=60.0):
+        self.requests = requests  # Requests allowed per window and key
+        self.window = window  # Seconds for a drained budget to refill
+        self.buckets = {}  # Authorization header -> (tokens, updated)
+    
+    def admit(self, key, now):
+        """
+        Spend one request of a key's budget
+        
+        Returns:
+            (allowed, headers): Whether the request may proceed, and the headers to send
+        """
+        rate = self.requests / self.window
+        tokens, updated = self.buckets.get(key, (float(self.requests), now))
+        tokens = min(float(self.requests), tokens + (now - updated) * rate)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        self.buckets[key] = (tokens, now)
+        headers = {
+            "x-ratelimit-limit-requests": str(self.requests),
+            "x-ratelimit-remaining-requests": str(int(tokens)),
+            "x-ratelimit-reset-requests": f"{(self.requests - tokens) / rate:.2f}s",
+        }
+        if not allowed:
+            headers["retry-after"] = str(math.ceil((1 - tokens) / rate))
+        return allowed, headers
+
+
+class LocalServer:
+    """Groq/OpenAI-compatible transcription server on localhost"""
+    
+    def __init__(self, transcripts=None, latency=None, errors=None, host="127.0.0.1", port=0, seed=None,
+                 rate_limit=None):
+        """
+        Args:
+            transcripts: List of replies, or {language: [replies]}; cycled in order
+            latency: LatencyProfile
+            errors: ErrorProfile
+            host: Bind address
+            port: Bind port, 0 picks a free one
+            seed: Random seed for reproducible latency and failures
+            rate_limit: Optional RateLimitProfile
+        """
+        self.transcripts = transcripts or DEFAULT_TRANSCRIPTS
+        self.latency = latency or LatencyProfile()
+        self.errors = errors or ErrorProfile()
+        self.rate_limit = rate_limit
+        self.rng = random.Random(seed)
+        self.cycles = {}
+        self.lock = threading.Lock()
+        self.log = []  # One entry per request served
+        
+        self.httpd = _Server((host, port), _Handler)
+        self.httpd.stand_in = self
+        self.thread = None
+    
+    @property
+    def url(self):
+        """Base URL of the OpenAI-compatible API"""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+    
+    def start(self):
+        """Serve in a background thread"""
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+            self.thread.start()
+            logger.info(f"Local transcription server listening on {self.url}")
+        return self
+    
+    def stop(self):
+        """Stop serving and release the port"""
+        if self.thread is not None:
+            self.httpd.shutdown()
+            self.thread.join()
+            self.thread = None
+        self.httpd.server_close()
+    
+    def __enter__(self):
+        return self.start()
+    
+    def __exit__(self, *exc):
+        self.stop()
+    
+    def next_transcript(self, language):
+        """Next canned reply for a language"""
+        replies = self.transcripts
+        if isinstance(replies, dict):
+            replies = replies.get(language) or next(iter(replies.values()))
+        with self.lock:
+            cycle = self.cycles.setdefault(language, itertools.cycle(replies))
+            return next(cycle)
+    
+    def plan(self, size):
+        """Draw latency and failure for one request"""
+        with self.lock:
+            delay = self.latency.sample(self.rng, size)
+            status, hang = self.errors.sample(self.rng)
+        return delay + hang, status
+    
+    def admit(self, key):
+        """Check a request against the rate limit; returns (allowed, headers)"""
+        if self.rate_limit is None:
+            return True, {}
+        with self.lock:
+            return self.rate_limit.admit(key, time.monotonic())
+    
+    @property
+    def stats(self):
+        """Request counts by outcome"""
+        with self.lock:
+            errors = sum(1 for entry in self.log if entry["status"] != 200)
+            limited = sum(1 for entry in self.log if entry["status"] == 429)
+            return {"requests": len(self.log), "errors": errors, "rate_limited": limited}
+
+
+class _Server(ThreadingHTTPServer):
+    """HTTP server that treats dropped client connections as routine"""
+    
+    daemon_threads = True
+    
+    def handle_error(self, request, client_address):
+        logger.debug(f"Connection from {client_address} ended with an error", exc_info=True)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Request handler for LocalServer"""
+    
+    protocol_version = "HTTP/1.1"  # Keep-alive, like the real API
+    
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+    
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+    
+    def do_POST(self):
+        server = self.server.stand_in
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        
+        if not self.path.endswith("/audio/transcriptions"):
+            self._reply(404, "application/json", json.dumps({"error": {"message": "Not found"}}))
+            return
+        
+        fields, size = self._parse_form(body)
+        language = fields.get("language", "en")
+        allowed, headers = server.admit(self.headers.get("Authorization", ""))
+        if not allowed:
+            with server.lock:
+                server.log.append({"language": language, "bytes": size, "latency": 0.0, "status": 429})
+            reply = json.dumps({"error": {"message": "Rate limit reached for requests"}})
+            self._reply(429, "application/json", reply, headers)
+            return
+        
+        delay, status = server.plan(size)
+        time.sleep(delay)
+        
+        with server.lock:
+            server.log.append({
+                "language": language,
+                "bytes": size,
+                "latency": round(delay, 3),
+                "status": status or 200,
+            })
+        
+        if status:
+            reply = json.dumps({"error": {"message": f"Simulated error {status}"}})
+            self._reply(status, "application/json", reply, headers)
+        elif fields.get("response_format", "json") == "text":
+            reply = server.next_transcript(language)
+            self._reply(200, "text/plain; charset=utf-8", reply, headers)
+        else:
+            reply = json.dumps({"text": server.next_transcript(language)})
+            self._reply(200, "application/json", reply, headers)
+    
+    def _parse_form(self, body):
+        """Multipart form fields and uploaded file size"""
+        head = f"Content-Type: {self.headers.get('Content-Type', '')}\r\n\r\n".encode()
+        message = BytesParser(policy=HTTP).parsebytes(head + body)
+        fields, size = {}, 0
+        if message.is_multipart():
+            for part in message.iter_parts():
+                if part.get_filename():
+                    size += len(part.get_payload(decode=True) or b"")
+                else:
+                    fields[part.get_param("name", header="content-disposition")] = part.get_content().strip()
+        return fields, size
+    
+    def _reply(self, status, content_type, text, headers=None):
+        data = text.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class LocalBackend(OpenAICompatibleBackend):
+    """OpenAI-compatible backend talking to its own LocalServer"""
+    
+    name = "local"
+    requires_api_key = False
+    
+    def __init__(self, transport=None, server=None, model="whisper-large-v3", api_key=None):
+        self.server = (server or LocalServer()).start()
+        transport = transport or HttpTransport(base_url=self.server.url)
+        transport.base_url = self.server.url
+        super().__init__(transport, self.server.url, model, api_key)
+    
+    def close(self):
+        super().close()
+        self.server.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the local stand-in transcription server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--transcripts", help="JSON file with a list or {language: [replies]}")
+    parser.add_argument("--latency", type=float, default=0.3, help="Base latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.1)
+    parser.add_argument("--slow-rate", type=float, default=0.0, help="Fraction of slow-tail requests")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--hang-rate", type=float, default=0.0, help="Fraction of stalled requests")
+    parser.add_argument("--rpm", type=int, help="Requests per minute allowed per API key")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args(argv)
+    
+    transcripts = None
+    if args.transcripts:
+        with open(args.transcripts, encoding="utf-8") as f:
+            transcripts = json.load(f)
+    
+    server = LocalServer(
+        transcripts,
+        LatencyProfile(args.latency, args.jitter, slow_rate=args.slow_rate),
+        ErrorProfile(args.error_rate, hang_rate=args.hang_rate),
+        args.host, args.port, args.seed,
+        RateLimitProfile(args.rpm) if args.rpm else None
+    )
+    print(f"Serving {server.url} (Ctrl+C to stop)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,44 @@
+# OpenAI-compatible HTTP Backend
+import logging
+
+from .base import TranscriptionBackend
+
+logger = logging.getLogger(__name__)
+
+
+class OpenAICompatibleBackend(TranscriptionBackend):
+    """
+    Plain HTTP client for any /audio/transcriptions endpoint
+    
+    Works with Groq's OpenAI route, OpenAI, self-hosted Whisper servers
+    and the bundled LocalServer.
+    """
+    
+    name = "openai"
+    
+    def __init__(self, transport, base_url, model="whisper-large-v3", api_key=None):
+        super().__init__(transport, model, api_key)
+        self.base_url = base_url.rstrip("/")
+    
+    @property
+    def endpoint(self):
+        return f"{self.base_url}/audio/transcriptions"
+    
+    def _send(self, upload, language, api_key, response_format, timeout):
+        headers = {}
+        if api_key:
+            headers["Authorization"] = f"Bearer {api_key}"
+        
+        response = self.transport.client.post(
+            self.endpoint,
+            headers=headers,
+            files={"file": upload},
+            data={"model": self.model, "language": language, "response_format": response_format},
+            timeout=self.transport.timeout_within(timeout)
+        )
+        self.transport.mark_used()
+        response.raise_for_status()
+        
+        if response_format == "text":
+            return response.text, response.headers
+        return response.json().get("text", ""), response.headers
@@ -0,0 +1,277 @@
+# Batch Transcription
+"""
+Transcribes a backlog of audio files through the same pipeline as the
+widget, several at a time, streaming results to JSONL and/or text files.
+A manifest records finished files so an interrupted run picks up where
+it stopped.
+
+Usage:
+    python batch.py notes/ more.m4a [--list files.txt] [--output results.jsonl]
+                    [--txt-dir transcripts/] [--workers 4] [--language en] [--sink stdout]
+"""
+import os
+import json
+import time
+import argparse
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+logger = logging.getLogger(__name__)
+
+AUDIO_EXTENSIONS = (".wav", ".flac", ".mp3", ".m4a", ".ogg", ".opus", ".webm", ".mp4", ".mpeg", ".mpga")
+
+
+def find_audio(paths, list_file=None):
+    """
+    Expand files, directories (recursively) and a list file into audio paths
+    
+    Returns:
+        list: Absolute paths in a stable order, without duplicates
+    """
+    paths = list(paths)
+    if list_file:
+        with open(list_file, "r", encoding="utf-8") as f:
+            paths.extend(line.strip() for line in f if line.strip() and not line.startswith("#"))
+    
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                found.extend(os.path.join(root, name) for name in sorted(files)
+                             if name.lower().endswith(AUDIO_EXTENSIONS))
+        elif os.path.isfile(path):
+            found.append(path)
+        else:
+            logger.warning(f"Not found: {path}")
+    return list(dict.fromkeys(os.path.abspath(path) for path in sorted(found)))
+
+
+class Manifest:
+    """
+    Append-only JSONL record of finished files
+    
+    A file counts as done while its size and modification time match the
+    entry, so edited or replaced recordings are transcribed again.
+    """
+    
+    def __init__(self, path):
+        self.path = path
+        self.done = {}
+        self.lock = threading.Lock()
+        self._load()
+        self.file = open(path, "a", encoding="utf-8")
+    
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # Torn last line of a killed run
+                if entry.get("status") == "done":
+                    self.done[entry["path"]] = entry.get("signature")
+                else:
+                    self.done.pop(entry.get("path"), None)
+    
+    @staticmethod
+    def signature(path):
+        """[size, mtime] of a file, or None if it is gone or unreadable"""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return [stat.st_size, stat.st_mtime_ns]
+    
+    def is_done(self, path):
+        signature = self.signature(path)
+        return signature is not None and self.done.get(path) == signature
+    
+    def record(self, path, status, **fields):
+        """
+        Append an entry and make it durable before the next file is reported
+        
+        Files that vanished meanwhile are recorded with a None signature,
+        which never counts as done.
+        """
+        entry = {"path": path, "signature": self.signature(path), "status": status, **fields}
+        with self.lock:
+            self.file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self.file.flush()
+            os.fsync(self.file.fileno())
+            if status == "done":
+                self.done[path] = entry["signature"]
+    
+    def close(self):
+        self.file.close()
+
+
+class BatchRunner:
+    """Transcribes files on a worker pool and streams each result as it finishes"""
+    
+    def __init__(self, transcriber, manifest, workers=4, output=None, txt_dir=None,
+                 language=None, auto_capitalize=True, sinks=None):
+        self.transcriber = transcriber
+        self.manifest = manifest
+        self.workers = workers
+        self.output = open(output, "a", encoding="utf-8") if output else None
+        self.txt_dir = txt_dir
+        self.root = None  # Common directory of the inputs; .txt files mirror the layout below it
+        self.sinks = sinks  # Optional OutputRouter that also receives each transcript
+        self.language = language
+        self.auto_capitalize = auto_capitalize
+        self.lock = threading.Lock()
+        
+        # Totals for the summary
+        self.completed = 0
+        self.failed = 0
+        self.skipped = 0
+        self.audio_bytes = 0
+    
+    def run(self, paths):
+        """
+        Transcribe every path not already in the manifest
+        
+        Returns:
+            dict: Summary counts and timings
+        """
+        try:
+            self.root = os.path.commonpath([os.path.dirname(path) for path in paths]) if paths else None
+        except ValueError:
+            self.root = None  # Inputs on different drives
+        pending = [path for path in paths if not self.manifest.is_done(path)]
+        self.skipped = len(paths) - len(pending)
+        if self.skipped:
+            logger.info(f"Skipping {self.skipped} files already in the manifest")
+        logger.info(f"Transcribing {len(pending)} files with {self.workers} workers")
+        
+        start = time.perf_counter()
+        executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="batch")
+        try:
+            futures = {executor.submit(self._transcribe, path): path for path in pending}
+            for number, future in enumerate(as_completed(futures), 1):
+                path = futures[future]
+                try:
+                    text, elapsed = future.result()
+                    self._deliver(path, text, elapsed)
+                    logger.info(f"[{number}/{len(pending)}] {path} ({elapsed:.1f}s)")
+                except Exception as e:
+                    self.failed += 1
+                    self.manifest.record(path, "failed", error=str(e))
+                    logger.error(f"[{number}/{len(pending)}] {path} failed: {e}")
+        finally:
+            # Ctrl+C: drop files not started; finished ones are already in the manifest
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        return {
+            "files": len(paths),
+            "completed": self.completed,
+            "failed": self.failed,
+            "skipped": self.skipped,
+            "seconds": round(time.perf_counter() - start, 2),
+            "audio_mb": round(self.audio_bytes / 1e6, 2),
+        }
+    
+    def _transcribe(self, path):
+        start = time.perf_counter()
+        text = self.transcriber.transcribe(path, auto_capitalize=self.auto_capitalize, language=self.language)
+        with self.lock:
+            self.audio_bytes += os.path.getsize(path)
+        return text or "", time.perf_counter() - start
+    
+    def txt_path(self, path):
+        """Where the .txt for an input goes, e.g. <txt_dir>/a/note.txt for <root>/a/note.wav"""
+        if self.root:
+            relative = os.path.relpath(path, self.root)
+        else:
+            relative = os.path.splitdrive(path)[1].lstrip("\\/")
+        return os.path.join(self.txt_dir, os.path.splitext(relative)[0] + ".txt")
+    
+    def _deliver(self, path, text, elapsed):
+        """Write a result to the outputs, then mark it done"""
+        with self.lock:
+            if self.output:
+                self.output.write(json.dumps({"path": path, "text": text, "seconds": round(elapsed, 2)},
+                                             ensure_ascii=False) + "\n")
+                self.output.flush()
+            if self.txt_dir:
+                target = self.txt_path(path)
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                # Write beside the target and rename, so an interrupted run never leaves a torn file
+                temp = target + ".tmp"
+                with open(temp, "w", encoding="utf-8") as f:
+                    f.write(text + "\n")
+                os.replace(temp, target)
+            self.completed += 1
+        if self.sinks is not None:
+            delivery = self.sinks.open({"path": path})
+            delivery.write(text)
+            delivery.close()
+        self.manifest.record(path, "done", seconds=round(elapsed, 2))
+    
+    def close(self):
+        if self.output:
+            self.output.close()
+        if self.sinks is not None:
+            self.sinks.close()
+        self.manifest.close()
+
+
+def main(argv=None):
+    from config import ConfigManager
+    from core.transcriber import create_transcriber
+    from core.sinks import OutputRouter, create_sink
+    
+    parser = argparse.ArgumentParser(description="Transcribe audio files in bulk")
+    parser.add_argument("paths", nargs="*", help="Audio files or directories")
+    parser.add_argument("--list", help="Text file with one audio path per line")
+    parser.add_argument("--output", default="transcripts.jsonl", help="JSONL results file ('' for none)")
+    parser.add_argument("--txt-dir", help="Also write one .txt per recording here, mirroring the input folders")
+    parser.add_argument("--sink", action="append", choices=("file", "stdout", "socket"), default=[],
+                        help="Also send each transcript to an output sink (repeatable)")
+    parser.add_argument("--manifest", help="Resume manifest (default: <output>.manifest)")
+    parser.add_argument("--workers", type=int, default=4, help="Files transcribed at once")
+    parser.add_argument("--language", help="Override the configured language")
+    parser.add_argument("--no-capitalize", action="store_true", help="Skip auto-capitalization")
+    parser.add_argument("--config", default="config.json", help="Settings file shared with the widget")
+    args = parser.parse_args(argv)
+    
+    paths = find_audio(args.paths, args.list)
+    if not paths:
+        parser.error("no audio files given")
+    if not args.output and not args.txt_dir and not args.sink:
+        parser.error("nowhere to write results: give --output, --txt-dir or --sink")
+    
+    config = ConfigManager(args.config)
+    transcriber = create_transcriber(config, concurrency=args.workers)
+    if transcriber.requires_api_key and not transcriber.api_key:
+        parser.error(f"no API key in {args.config}")
+    
+    results = args.output or (os.path.join(args.txt_dir, "transcripts") if args.txt_dir else "transcripts")
+    manifest = Manifest(args.manifest or f"{results}.manifest")
+    runner = BatchRunner(
+        transcriber, manifest,
+        workers=args.workers,
+        output=args.output or None,
+        txt_dir=args.txt_dir,
+        language=args.language,
+        auto_capitalize=not args.no_capitalize and config.get("auto_capitalize") is not False,
+        sinks=OutputRouter([create_sink(name, config) for name in args.sink]) if args.sink else None
+    )
+    try:
+        summary = runner.run(paths)
+    except KeyboardInterrupt:
+        logger.warning("Interrupted; run the same command again to resume")
+        return 130
+    finally:
+        runner.close()
+        transcriber.policy.shutdown()
+        transcriber.backend.close()
+    
+    logger.info(
+        f"Done: {summary['completed']} transcribed, {summary['failed']} failed, "
+        f"{summary['skipped']} skipped in {summary['seconds']:.1f}s"
+    )
+    return 1 if summary["failed"] else 0
@@ -0,0 +1,343 @@
+# Audio Capture Buffer
+import os
+import glob
+import time
+import threading
+import logging
+import numpy as np
+
+from .encoding import wav_header
+
+logger = logging.getLogger(__name__)
+
+
+class CaptureBuffer:
+    """Preallocated, growable int16 sample store written in place by the audio callback"""
+    
+    def __init__(self, channels=1, capacity=44100 * 30):
+        self.channels = channels
+        self.data = np.zeros((capacity, channels), dtype=np.int16)
+        self.size = 0
+        self.read_position = 0
+    
+    def __len__(self):
+        return self.size
+    
+    @property
+    def capacity(self):
+        """Number of frames that fit without reallocating"""
+        return len(self.data)
+    
+    def clear(self):
+        """Forget recorded samples but keep the allocation for the next recording"""
+        self.size = 0
+        self.read_position = 0
+    
+    def write(self, block):
+        """
+        Append a float block, scaling it to int16 directly into the buffer
+        
+        Args:
+            block: Float samples in [-1, 1] with shape (frames, channels)
+        """
+        start = self.size
+        end = start + len(block)
+        if end > len(self.data):
+            self._grow(end)
+        np.multiply(block, 32767, out=self.data[start:end], casting='unsafe')
+        self.size = end
+    
+    def extend(self, samples):
+        """Append int16 frames as they are"""
+        start = self.size
+        end = start + len(samples)
+        if end > len(self.data):
+            self._grow(end)
+        self.data[start:end] = samples
+        self.size = end
+    
+    def _grow(self, min_capacity):
+        """Double the allocation (rare, amortized O(1) per block)"""
+        capacity = max(min_capacity, len(self.data) * 2)
+        data = np.empty((capacity, self.channels), dtype=np.int16)
+        data[:self.size] = self.data[:self.size]
+        self.data = data
+    
+    def view(self, start=0, end=None):
+        """
+        Zero-copy view of recorded frames
+        
+        Returns:
+            int16 array of shape (frames, channels) sharing memory with the buffer
+        """
+        if end is None:
+            end = self.size
+        return self.data[start:end]
+    
+    def unread_frames(self):
+        """Number of frames recorded since the previous read"""
+        return self.size - self.read_position
+    
+    def read(self):
+        """Zero-copy view of frames recorded since the previous read"""
+        end = self.size
+        block = self.data[self.read_position:end]
+        self.read_position = end
+        return block
+
+
+class PrerollRing:
+    """Fixed-size circular int16 store holding the most recent audio"""
+    
+    def __init__(self, channels=1, frames=44100 // 2):
+        self.channels = channels
+        self.data = np.zeros((max(frames, 1), channels), dtype=np.int16)
+        self.position = 0  # Next frame to overwrite
+        self.filled = 0
+    
+    def __len__(self):
+        return self.filled
+    
+    def clear(self):
+        """Forget buffered audio"""
+        self.position = 0
+        self.filled = 0
+    
+    def write(self, block):
+        """
+        Overwrite the oldest frames with a float block
+        
+        Args:
+            block: Float samples in [-1, 1] with shape (frames, channels)
+        """
+        capacity = len(self.data)
+        if len(block) >= capacity:
+            block = block[-capacity:]
+        count = len(block)
+        first = min(count, capacity - self.position)
+        np.multiply(block[:first], 32767, out=self.data[self.position:self.position + first], casting='unsafe')
+        if count > first:
+            np.multiply(block[first:], 32767, out=self.data[:count - first], casting='unsafe')
+        self.position = (self.position + count) % capacity
+        self.filled = min(capacity, self.filled + count)
+    
+    def snapshot(self):
+        """
+        Buffered frames in time order
+        
+        Returns:
+            int16 array of shape (frames, channels)
+        """
+        if self.filled < len(self.data):
+            return self.data[:self.filled].copy()
+        return np.concatenate([self.data[self.position:], self.data[:self.position]])
+
+
+
+class SpillBuffer:
+    """
+    Capture store with a fixed RAM window that spills older frames to disk
+    
+    The audio callback writes into the RAM window; the record loop moves
+    frames it has finished with into a WAV file, which later reads see
+    through a read-only memory map. The file is left behind if the
+    process dies mid-recording, and recover() turns it into a valid WAV.
+    """
+    
+    HEADER_SIZE = 44
+    
+    def __init__(self, directory, sample_rate=44100, channels=1, ram_frames=44100 * 10):
+        self.directory = directory
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.ram = np.zeros((ram_frames, channels), dtype=np.int16)
+        self.ram_start = 0  # Frame index of ram[0]; every earlier frame is on disk
+        self.size = 0
+        self.read_position = 0
+        self.path = None
+        self.file = None
+        self.map = None  # Memory map of the spilled frames, refreshed as the file grows
+        self.lock = threading.Lock()  # Callback writes vs. compaction of the RAM window
+        self.overflowed = False
+    
+    def __len__(self):
+        return self.size
+    
+    @property
+    def capacity(self):
+        """Number of frames that fit in RAM without spilling"""
+        return len(self.ram)
+    
+    @property
+    def spilled(self):
+        """Number of frames on disk"""
+        return self.ram_start
+    
+    def clear(self):
+        """Delete the spill file and start over"""
+        with self.lock:
+            self._close(remove=True)
+            self.ram_start = 0
+            self.size = 0
+            self.read_position = 0
+            self.overflowed = False
+    
+    def write(self, block):
+        """
+        Append a float block, scaling it to int16 directly into the RAM window
+        
+        Args:
+            block: Float samples in [-1, 1] with shape (frames, channels)
+        """
+        with self.lock:
+            start = self.size - self.ram_start
+            end = start + len(block)
+            if end > len(self.ram):
+                self._grow(end)
+            np.multiply(block, 32767, out=self.ram[start:end], casting='unsafe')
+            self.size += len(block)
+    
+    def extend(self, samples):
+        """Append int16 frames as they are"""
+        with self.lock:
+            start = self.size - self.ram_start
+            end = start + len(samples)
+            if end > len(self.ram):
+                self._grow(end)
+            self.ram[start:end] = samples
+            self.size += len(samples)
+    
+    def _grow(self, min_capacity):
+        """The record loop fell behind; grow rather than drop audio"""
+        if not self.overflowed:
+            self.overflowed = True
+            logger.warning("Spill buffer RAM window full, growing it")
+        ram = np.empty((max(min_capacity, len(self.ram) * 2), self.channels), dtype=np.int16)
+        ram[:self.size - self.ram_start] = self.ram[:self.size - self.ram_start]
+        self.ram = ram
+    
+    def spill(self, end=None):
+        """
+        Move frames before end from RAM to the spill file
+        
+        Call from the thread that reads the buffer, never the audio callback.
+        
+        Args:
+            end: First frame to keep in RAM (default: everything)
+        """
+        with self.lock:
+            end = self.size if end is None else min(end, self.size)
+        count = end - self.ram_start
+        if count <= 0:
+            return
+        if self.file is None:
+            self._open()
+        # The callback only writes past size, so this region is stable without the lock
+        self.file.write(np.ascontiguousarray(self.ram[:count]))
+        self.file.flush()
+        with self.lock:
+            remaining = self.size - end
+            self.ram[:remaining] = self.ram[count:count + remaining]
+            self.ram_start = end
+    
+    def _open(self):
+        os.makedirs(self.directory, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        self.path = os.path.join(self.directory, f"capture-{stamp}-{os.getpid()}.wav")
+        self.file = open(self.path, "wb")
+        # Sizes stay zero until recover() patches them
+        self.file.write(wav_header(self.sample_rate, self.channels))
+    
+    def _close(self, remove=False):
+        self.map = None
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+        if remove and self.path:
+            try:
+                os.remove(self.path)
+            except OSError as e:
+                logger.warning(f"Could not remove spill file {self.path}: {e}")
+        self.path = None
+    
+    def _disk(self):
+        """Read-only memory map of every spilled frame"""
+        if self.map is None or len(self.map) != self.ram_start:
+            self.map = np.memmap(self.path, dtype=np.int16, mode='r', offset=self.HEADER_SIZE,
+                                 shape=(self.ram_start, self.channels))
+        return self.map
+    
+    def view(self, start=0, end=None):
+        """
+        Recorded frames, without a copy unless the range spans disk and RAM
+        
+        Returns:
+            int16 array of shape (frames, channels): a RAM view, a memory-mapped
+            view of the spill file, or a copy joining the two
+        """
+        if end is None:
+            end = self.size
+        if start >= self.ram_start:
+            return self.ram[start - self.ram_start:end - self.ram_start]
+        disk = self._disk()
+        if end <= self.ram_start:
+            return disk[start:end]
+        return np.concatenate([disk[start:], self.ram[:end - self.ram_start]])
+    
+    def unread_frames(self):
+        """Number of frames recorded since the previous read"""
+        return self.size - self.read_position
+    
+    def read(self):
+        """Frames recorded since the previous read"""
+        end = self.size
+        block = self.view(self.read_position, end)
+        self.read_position = end
+        return block
+    
+    @classmethod
+    def recover(cls, directory, min_age=10.0):
+        """
+        Turn spill files left by an interrupted recording into playable WAV files
+        
+        Args:
+            directory: Spill directory
+            min_age: Skip files written to more recently than this (seconds),
+                which may belong to another running instance
+        
+        Returns:
+            list: Paths of the recovered recordings
+        """
+        recovered = []
+        now = time.time()
+        for path in sorted(glob.glob(os.path.join(directory, "capture-*.wav"))):
+            try:
+                if now - os.path.getmtime(path) < min_age:
+                    continue
+                with open(path, "r+b") as f:
+                    header = f.read(cls.HEADER_SIZE)
+                    if len(header) < cls.HEADER_SIZE:
+                        f.close()
+                        os.remove(path)
+                        continue
+                    channels = int.from_bytes(header[22:24], "little")
+                    sample_rate = int.from_bytes(header[24:28], "little")
+                    data_size = (os.path.getsize(path) - cls.HEADER_SIZE) // (2 * channels) * 2 * channels
+                    f.truncate(cls.HEADER_SIZE + data_size)
+                    f.seek(0)
+                    f.write(wav_header(sample_rate, channels, data_size))
+                target = os.path.join(directory, "recovered-" + os.path.basename(path)[len("capture-"):])
+                os.replace(path, target)
+                recovered.append(target)
+                logger.info(f"Recovered {data_size / (2 * channels * sample_rate):.1f}s recording: {target}")
+            except OSError as e:
+                logger.warning(f"Could not recover {path}: {e}")
+        
+        # Payload files are derived from captures and useless on their own
+        for path in glob.glob(os.path.join(directory, "payload-*")):
+            try:
+                if now - os.path.getmtime(path) >= min_age:
+                    os.remove(path)
+            except OSError:
+                pass
+        return recovered
@@ -0,0 +1,168 @@
+# Transcription Result Cache
+import os
+import hashlib
+import threading
+import logging
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+class TranscriptCache:
+    """
+    Content-addressed transcript store
+    
+    Keys hash the encoded audio together with everything that changes the
+    service's answer. A small in-memory LRU sits in front of an optional
+    size-bounded directory of text files.
+    """
+    
+    def __init__(self, max_entries=128, directory=None, max_disk_bytes=50 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+        
+        self.memory = OrderedDict()  # key -> text, most recent last
+        self.disk = OrderedDict()  # key -> file size, most recent last
+        self.disk_bytes = 0
+        self.lock = threading.Lock()
+        
+        # Counters
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            self._load_index()
+    
+    @staticmethod
+    def key(data, language, backend, model, options=None):
+        """
+        Hash encoded audio plus request parameters
+        
+        Args:
+            data: Encoded audio bytes
+            language: Language code
+            backend: Backend name
+            model: Model name
+            options: Optional dict of other parameters that change the transcript
+        
+        Returns:
+            str: Hex digest
+        """
+        h = hashlib.blake2b(digest_size=16)
+        h.update(memoryview(data))
+        params = [language or "", backend or "", model or ""]
+        if options:
+            params += [f"{k}={options[k]}" for k in sorted(options)]
+        h.update("\0".join(params).encode("utf-8"))
+        return h.hexdigest()
+    
+    def get(self, key):
+        """Cached transcript or None"""
+        with self.lock:
+            if key in self.memory:
+                self.memory.move_to_end(key)
+                self.hits += 1
+                return self.memory[key]
+            
+            text = self._disk_get(key)
+            if text is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.disk_hits += 1
+            self._memory_put(key, text)
+            return text
+    
+    def put(self, key, text):
+        """Store a transcript in both tiers"""
+        if not text:
+            return
+        with self.lock:
+            self._memory_put(key, text)
+            if self.directory:
+                self._disk_put(key, text)
+    
+    def clear(self):
+        """Drop every entry from both tiers"""
+        with self.lock:
+            self.memory.clear()
+            for key in list(self.disk):
+                self._disk_remove(key)
+    
+    @property
+    def stats(self):
+        """Hit/miss counters and tier sizes"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "memory_entries": len(self.memory),
+            "disk_entries": len(self.disk),
+            "disk_bytes": self.disk_bytes,
+        }
+    
+    def _memory_put(self, key, text):
+        self.memory[key] = text
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.max_entries:
+            self.memory.popitem(last=False)
+    
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.txt")
+    
+    def _load_index(self):
+        """Rebuild the disk index, oldest first, from file modification times"""
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and entry.name.endswith(".txt"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, entry.name[:-4], stat.st_size))
+        for _, key, size in sorted(entries):
+            self.disk[key] = size
+            self.disk_bytes += size
+        logger.info(f"Transcript cache: {len(self.disk)} entries on disk ({self.disk_bytes} bytes)")
+    
+    def _disk_get(self, key):
+        if key not in self.disk:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                text = f.read()
+            os.utime(path)  # Keeps recency across restarts
+        except OSError:
+            self._disk_remove(key)
+            return None
+        self.disk.move_to_end(key)
+        return text
+    
+    def _disk_put(self, key, text):
+        data = text.encode("utf-8")
+        if len(data) > self.max_disk_bytes:
+            return
+        path = self._path(key)
+        tmp = f"{path}.tmp"
+        try:
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning(f"Transcript cache write failed: {e}")
+            return
+        
+        self.disk_bytes += len(data) - self.disk.pop(key, 0)
+        self.disk[key] = len(data)
+        while self.disk_bytes > self.max_disk_bytes:
+            self._disk_remove(next(iter(self.disk)))
+    
+    def _disk_remove(self, key):
+        self.disk_bytes -= self.disk.pop(key, 0)
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
@@ -0,0 +1,246 @@
+# Chunked Transcription
+import io
+import re
+import struct
+import logging
+import numpy as np
+
+from .encoding import encode_audio, available_codecs, codec_suffix
+
+try:
+    import soundfile as sf
+except (ImportError, OSError):
+    sf = None
+
+logger = logging.getLogger(__name__)
+
+WORD_PATTERN = re.compile(r"\w+", re.UNICODE)
+TRAILING_PUNCTUATION = re.compile(r"\W*$", re.UNICODE)
+
+
+def probe_wav(data):
+    """
+    Locate the samples of a 16-bit PCM WAV file
+    
+    Args:
+        data: Bytes-like WAV contents
+    
+    Returns:
+        (sample_rate, channels, offset, frames), or None if data is not 16-bit PCM WAV
+    """
+    view = memoryview(data)
+    if len(view) < 12 or bytes(view[0:4]) != b"RIFF" or bytes(view[8:12]) != b"WAVE":
+        return None
+    fmt = None
+    pos = 12
+    while pos + 8 <= len(view):
+        chunk_id = bytes(view[pos:pos + 4])
+        size = struct.unpack("<I", view[pos + 4:pos + 8])[0]
+        body = pos + 8
+        if chunk_id == b"fmt ":
+            tag, channels, sample_rate, _, _, bits = struct.unpack("<HHIIHH", view[body:body + 16])
+            fmt = (tag, channels, sample_rate, bits)
+        elif chunk_id == b"data" and fmt is not None:
+            tag, channels, sample_rate, bits = fmt
+            if tag != 1 or bits != 16:
+                return None
+            # Writers that never patched the size (crashed captures) leave 0
+            available = len(view) - body
+            size = available if size == 0 or size > available else size
+            return sample_rate, channels, body, size // (2 * channels)
+        pos = body + size + (size & 1)
+    return None
+
+
+def decode_audio(data):
+    """
+    Decode a payload to int16 samples
+    
+    WAV is viewed in place (no copy, also for memory-mapped payloads);
+    other formats are decoded through soundfile.
+    
+    Returns:
+        (samples, sample_rate): int16 array of shape (frames, channels) and its rate
+    """
+    info = probe_wav(data)
+    if info is not None:
+        sample_rate, channels, offset, frames = info
+        samples = np.frombuffer(data, dtype=np.int16, count=frames * channels, offset=offset)
+        return samples.reshape(frames, channels), sample_rate
+    if sf is None:
+        raise ValueError("Cannot decode non-WAV audio without soundfile")
+    samples, sample_rate = sf.read(io.BytesIO(data), dtype="int16", always_2d=True)
+    return samples, sample_rate
+
+
+def can_decode(data):
+    """Whether decode_audio can read a payload: 16-bit WAV, or a format soundfile supports"""
+    if probe_wav(data) is not None:
+        return True
+    if sf is None:
+        return False
+    try:
+        sf.info(io.BytesIO(data))
+        return True
+    except Exception:
+        return False
+
+
+def audio_duration(data):
+    """Seconds of audio in a payload, or None if it cannot be told without decoding"""
+    info = probe_wav(data)
+    if info is not None:
+        return info[3] / info[0]
+    if sf is None:
+        return None
+    try:
+        return sf.info(io.BytesIO(data)).duration
+    except Exception:
+        return None
+
+
+class AudioChunker:
+    """
+    Splits long recordings into overlapping chunks cut at quiet points,
+    and merges the chunk transcripts back together
+    """
+    
+    def __init__(self, chunk_seconds=60.0, overlap=1.5, search=5.0, max_bytes=24 * 1024 * 1024, workers=4):
+        self.chunk_seconds = chunk_seconds  # Target chunk length
+        self.overlap = overlap  # Seconds each chunk repeats from the end of the previous one
+        self.search = search  # Seconds either side of a target cut searched for a quiet point
+        self.max_bytes = max_bytes  # Larger uploads are always split (API upload limit)
+        self.workers = workers  # Chunks transcribed at once
+        self.codec = "flac" if "flac" in available_codecs() else "wav"
+    
+    @property
+    def suffix(self):
+        return codec_suffix(self.codec)
+    
+    def should_split(self, data, duration=None):
+        """
+        Whether a payload is worth splitting
+        
+        Payloads that cannot be decoded here (e.g. M4A, or MP3 with an older
+        libsndfile) are never split; they are sent whole.
+        
+        Args:
+            data: Encoded payload
+            duration: Seconds of audio, if already known
+        """
+        if not can_decode(data):
+            if len(data) > self.max_bytes:
+                logger.warning(f"Cannot decode {len(data) / 1e6:.0f} MB payload to split it, sending it whole")
+            return False
+        if len(data) > self.max_bytes:
+            return True
+        if duration is None:
+            duration = audio_duration(data)
+        # Splitting only pays off once there are at least two full chunks
+        return duration is not None and duration >= 2 * self.chunk_seconds
+    
+    def cut_points(self, samples, sample_rate):
+        """
+        Frame indices where the recording is cut, each at the quietest 20 ms
+        near a multiple of chunk_seconds
+        
+        Returns:
+            list: Increasing cut positions, excluding 0 and the end
+        """
+        total = len(samples)
+        frame = max(1, sample_rate // 50)
+        step = int(self.chunk_seconds * sample_rate)
+        search = int(self.search * sample_rate)
+        cuts = []
+        target = step
+        while target < total - step // 2:
+            previous = cuts[-1] if cuts else 0
+            lo = max(previous + step // 2, target - search)
+            hi = min(total, target + search)
+            count = (hi - lo) // frame
+            if count < 1:
+                break
+            # Only the search window is read, so memory-mapped input stays on disk
+            window = samples[lo:lo + count * frame].astype(np.float32)
+            energy = np.square(window).reshape(count, frame, -1).mean(axis=(1, 2))
+            cut = lo + int(np.argmin(energy)) * frame + frame // 2
+            cuts.append(cut)
+            target = cut + step
+        return cuts
+    
+    def spans(self, samples, sample_rate):
+        """
+        (start, end) frame ranges of the chunks, each starting overlap seconds
+        before the previous chunk's end
+        """
+        bounds = [0] + self.cut_points(samples, sample_rate) + [len(samples)]
+        overlap = int(self.overlap * sample_rate)
+        return [(max(0, start - overlap) if i else 0, end)
+                for i, (start, end) in enumerate(zip(bounds[:-1], bounds[1:]))]
+    
+    def encode(self, samples, sample_rate):
+        """Encode one chunk for upload"""
+        return encode_audio(np.ascontiguousarray(samples), sample_rate, self.codec)
+    
+    @staticmethod
+    def _words(text):
+        """Words with their normalized form, for matching across chunk boundaries"""
+        words = text.split()
+        return words, ["".join(WORD_PATTERN.findall(word)).lower() for word in words]
+    
+    @staticmethod
+    def _seam(tail, head, slack=2):
+        """
+        Longest run of words ending near the end of tail and starting near the start of head
+        
+        Up to slack words either side of the run may differ, since words cut
+        off at a chunk boundary are often transcribed differently.
+        
+        Returns:
+            (end, start, size): The run is tail[end - size:end] == head[start:start + size]
+        """
+        for size in range(min(len(tail), len(head)), 0, -1):
+            for end in range(len(tail), max(size, len(tail) - slack) - 1, -1):
+                for start in range(min(slack, len(head) - size) + 1):
+                    if tail[end - size:end] == head[start:start + size]:
+                        return end, start, size
+        return len(tail), 0, 0
+    
+    def merge(self, texts):
+        """
+        Join chunk transcripts in order, dropping words repeated in the overlaps
+        
+        The tail of the text so far is aligned with the head of the next
+        chunk; the longest common run of words at the seam is kept once,
+        as the earlier chunk wrote it. The run's last word takes the next
+        chunk's punctuation, since only that chunk heard what followed.
+        Words both chunks share elsewhere are left alone.
+        
+        Args:
+            texts: Chunk texts in recording order (None entries are skipped)
+        
+        Returns:
+            str: Combined text
+        """
+        window = max(4, int(self.overlap * 5))  # Words that fit in an overlap, with slack
+        words, normalized = [], []
+        for text in texts:
+            if not text or not text.strip():
+                continue
+            new_words, new_normalized = self._words(text.strip())
+            if words:
+                tail = normalized[-window:]
+                head = new_normalized[:window]
+                end, start, size = self._seam(tail, head)
+                # A single word must sit right at the seam, and one short word is as likely chance as overlap
+                single = size == 1 and len(tail[end - 1]) > 3 and len(tail) - end <= 1 and start <= 1
+                if size >= 2 or single:
+                    keep = len(words) - len(tail) + end
+                    del words[keep:], normalized[keep:]
+                    seam_word = new_words[start + size - 1]
+                    words[-1] = TRAILING_PUNCTUATION.sub("", words[-1]) + TRAILING_PUNCTUATION.search(seam_word).group()
+                    new_words = new_words[start + size:]
+                    new_normalized = new_normalized[start + size:]
+            words.extend(new_words)
+            normalized.extend(new_normalized)
+        return " ".join(words)
@@ -0,0 +1,459 @@
+# Upload Encoding (resampling + payload codecs)
+import io
+import os
+import math
+import itertools
+import mmap
+import struct
+import weakref
+import logging
+import numpy as np
+
+try:
+    import soundfile as sf
+except (ImportError, OSError):
+    sf = None
+
+logger = logging.getLogger(__name__)
+
+_payload_ids = itertools.count(1)  # Unique payload file names within this process
+
+# Codec name -> (file suffix, soundfile format, soundfile subtype)
+CODECS = {
+    "wav": (".wav", None, None),
+    "flac": (".flac", "FLAC", "PCM_16"),
+    "opus": (".ogg", "OGG", "OPUS"),
+    "ogg": (".ogg", "OGG", "VORBIS"),
+}
+
+
+def available_codecs():
+    """List payload codecs usable in this environment"""
+    codecs = ["wav"]
+    if sf is None:
+        return codecs
+    for name, (_, fmt, subtype) in CODECS.items():
+        if fmt and subtype in sf.available_subtypes(fmt):
+            codecs.append(name)
+    return codecs
+
+
+def codec_suffix(codec):
+    """File suffix the API uses to detect the payload format"""
+    return CODECS[codec][0]
+
+
+class AudioPayload:
+    """Encoded recording held in memory, or memory-mapped from a file that is removed on close"""
+    
+    def __init__(self, data, suffix=".wav", duration=0.0, stats=None, path=None):
+        self.data = data
+        self.suffix = suffix
+        self.duration = duration
+        self.stats = stats or {}
+        self.path = path
+        # Runs on close() or garbage collection, whichever comes first
+        self._release = weakref.finalize(self, _release_mapping, data, path) if path else None
+    
+    def __len__(self):
+        return len(self.data)
+    
+    @property
+    def name(self):
+        """File name the API uses to detect the format"""
+        return f"audio{self.suffix}"
+    
+    @property
+    def mapped(self):
+        """Whether the data is a memory-mapped file rather than bytes"""
+        return self.path is not None
+    
+    def close(self):
+        """Unmap and delete the backing file of a mapped payload"""
+        if self._release is not None:
+            self._release()
+
+
+def _release_mapping(data, path):
+    try:
+        data.close()
+    except BufferError:
+        pass  # A reader still holds a view; the map closes when it is collected
+    try:
+        os.remove(path)
+    except OSError as e:
+        logger.debug(f"Could not remove payload file {path}: {e}")
+
+
+def map_file(path):
+    """Read-only memory map of a whole file"""
+    with open(path, "rb") as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class PayloadReader(io.RawIOBase):
+    """File object over a payload buffer, so each request streams it without a copy"""
+    
+    def __init__(self, data):
+        self.view = memoryview(data)
+        self.position = 0
+    
+    def readable(self):
+        return True
+    
+    def seekable(self):
+        return True
+    
+    def readinto(self, b):
+        count = max(0, min(len(b), len(self.view) - self.position))
+        b[:count] = self.view[self.position:self.position + count]
+        self.position += count
+        return count
+    
+    def seek(self, offset, whence=io.SEEK_SET):
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self.position, io.SEEK_END: len(self.view)}[whence]
+        self.position = max(0, base + offset)
+        return self.position
+    
+    def tell(self):
+        return self.position
+    
+    def close(self):
+        self.view.release()
+        super().close()
+
+
+def wav_header(sample_rate, channels=1, data_size=0):
+    """44-byte header of a 16-bit PCM WAV file"""
+    return struct.pack(
+        '<4sI4s4sIHHIIHH4sI',
+        b'RIFF', 36 + data_size, b'WAVE', b'fmt ', 16, 1, channels, sample_rate,
+        sample_rate * channels * 2, channels * 2, 16, b'data', data_size
+    )
+
+
+class WavWriter:
+    """PCM WAV built incrementally in memory or in a file; sizes are patched into the header at finalize"""
+    
+    HEADER_SIZE = 44
+    
+    def __init__(self, sample_rate, channels=1, path=None):
+        self.path = path
+        self.buf = open(path, "w+b") if path else io.BytesIO()
+        self.buf.write(wav_header(sample_rate, channels))
+    
+    def write(self, samples):
+        """Append int16 samples without an intermediate bytes copy"""
+        if len(samples):
+            self.buf.write(np.ascontiguousarray(samples))
+    
+    def finalize(self):
+        """Patch the RIFF and data chunk sizes and return the payload"""
+        data_size = self.buf.tell() - self.HEADER_SIZE
+        self.buf.seek(4)
+        self.buf.write(struct.pack('<I', 36 + data_size))
+        self.buf.seek(40)
+        self.buf.write(struct.pack('<I', data_size))
+        if self.path:
+            self.buf.close()
+            return map_file(self.path)
+        # CPython hands back the internal buffer without copying
+        return self.buf.getvalue()
+
+
+class SoundFileWriter:
+    """Compressed payload streamed into memory or a file through libsndfile"""
+    
+    def __init__(self, sample_rate, channels=1, codec="flac", path=None):
+        _, fmt, subtype = CODECS[codec]
+        self.path = path
+        self.buf = path or io.BytesIO()
+        self.file = sf.SoundFile(self.buf, 'w', sample_rate, channels, subtype=subtype, format=fmt)
+    
+    def write(self, samples):
+        """Encode the next block of int16 samples"""
+        if len(samples):
+            self.file.write(samples)
+    
+    def finalize(self):
+        """Flush the encoder and return the payload"""
+        self.file.close()
+        if self.path:
+            return map_file(self.path)
+        return self.buf.getvalue()
+
+
+def create_writer(sample_rate, channels=1, codec="wav", path=None):
+    """Create an incremental payload writer for a codec, writing to path if given"""
+    if codec == "wav":
+        return WavWriter(sample_rate, channels, path)
+    if codec not in available_codecs():
+        raise ValueError(f"Codec not available: {codec}")
+    return SoundFileWriter(sample_rate, channels, codec, path)
+
+
+def encode_audio(samples, sample_rate, codec="wav"):
+    """
+    Encode int16 samples in memory
+    
+    Args:
+        samples: int16 array of shape (frames, channels)
+        sample_rate: Sample rate of the samples
+        codec: One of available_codecs()
+    
+    Returns:
+        bytes: Encoded payload
+    """
+    channels = samples.shape[1] if samples.ndim > 1 else 1
+    writer = create_writer(sample_rate, channels, codec)
+    writer.write(samples)
+    return writer.finalize()
+
+
+class PolyphaseResampler:
+    """
+    Streaming rational-ratio resampler using a windowed-sinc polyphase filter bank
+    
+    Each output sample is the dot product of one filter phase with the
+    most recent input samples, computed for whole blocks at once.
+    """
+    
+    def __init__(self, rate_in, rate_out, channels=1, zero_crossings=12, beta=8.0):
+        self.rate_in = rate_in
+        self.rate_out = rate_out
+        self.channels = channels
+        
+        g = math.gcd(rate_in, rate_out)
+        self.up = rate_out // g
+        self.down = rate_in // g
+        
+        # Low-pass at the lower of the two Nyquist rates, designed at rate_in * up
+        factor = max(self.up, self.down)
+        half = zero_crossings * factor
+        n = np.arange(2 * half + 1) - half
+        h = np.sinc(n / factor) * np.kaiser(len(n), beta) * (self.up / factor)
+        self.delay = half
+        
+        # Polyphase bank: bank[p, j] = h[p + j * up]
+        self.taps = -(-len(h) // self.up)
+        padded = np.zeros(self.taps * self.up)
+        padded[:len(h)] = h
+        self.bank = padded.reshape(self.taps, self.up).T.copy()
+        self.offsets = np.arange(self.taps)
+        
+        self.reset()
+    
+    def reset(self):
+        """Start a new stream"""
+        # Zero history so the first outputs can reach back before the stream start
+        self.history = np.zeros((self.taps - 1, self.channels))
+        self.base = -(self.taps - 1)  # Absolute input index of history[0]
+        self.next_output = 0
+        self.frames_in = 0
+    
+    def process(self, block):
+        """
+        Resample the next block of a stream
+        
+        Args:
+            block: Samples of shape (frames, channels); int16 or float
+        
+        Returns:
+            Resampled samples available so far, same dtype as the input
+        """
+        dtype = block.dtype
+        self.frames_in += len(block)
+        self.history = np.concatenate([self.history, block.reshape(-1, self.channels)])
+        
+        # Last output whose filter window is fully covered by the input seen so far
+        t_last = (self.base + len(self.history)) * self.up - 1
+        end = (t_last - self.delay) // self.down + 1 if t_last >= self.delay else 0
+        out = self._compute(self.next_output, end)
+        self.next_output = max(self.next_output, end)
+        
+        # Drop history no longer needed by the next output
+        t_next = self.next_output * self.down + self.delay
+        keep_from = t_next // self.up - (self.taps - 1) - self.base
+        if keep_from > 0:
+            self.history = self.history[keep_from:]
+            self.base += keep_from
+        
+        return self._cast(out, dtype)
+    
+    def flush(self, dtype=np.int16):
+        """Emit the tail of the stream (zero-padded) and reset"""
+        total = -(-self.frames_in * self.up // self.down)
+        pad = np.zeros((self.delay // self.up + self.taps + 1, self.channels))
+        self.history = np.concatenate([self.history, pad])
+        out = self._compute(self.next_output, total)
+        self.reset()
+        return self._cast(out, dtype)
+    
+    def _compute(self, start, end, batch=4096):
+        """Compute outputs [start, end) from the current history"""
+        if end <= start:
+            return np.zeros((0, self.channels))
+        
+        out = np.empty((end - start, self.channels))
+        for s in range(start, end, batch):
+            n = np.arange(s, min(s + batch, end))
+            t = n * self.down + self.delay
+            phase = t % self.up
+            index = (t // self.up - self.base)[:, None] - self.offsets[None, :]
+            window = self.history[index]  # (outputs, taps, channels)
+            out[s - start:s - start + len(n)] = np.einsum('nk,nkc->nc', self.bank[phase], window)
+        return out
+    
+    @staticmethod
+    def _cast(samples, dtype):
+        """Convert filter output back to the input sample type"""
+        if np.issubdtype(dtype, np.integer):
+            info = np.iinfo(dtype)
+            return np.clip(np.rint(samples), info.min, info.max).astype(dtype)
+        return samples.astype(dtype)
+
+
+def resample(samples, rate_in, rate_out):
+    """
+    Resample a complete recording
+    
+    Args:
+        samples: Array of shape (frames, channels)
+        rate_in: Source sample rate
+        rate_out: Target sample rate
+    
+    Returns:
+        Resampled array with the same dtype
+    """
+    if rate_in == rate_out:
+        return samples
+    channels = samples.shape[1] if samples.ndim > 1 else 1
+    resampler = PolyphaseResampler(rate_in, rate_out, channels)
+    head = resampler.process(samples)
+    tail = resampler.flush(samples.dtype)
+    return np.concatenate([head, tail])
+
+
+class PayloadEncoder:
+    """
+    Builds the upload payload incrementally while audio is being captured
+    
+    Blocks are resampled and encoded as they arrive, so finishing a
+    recording only flushes the resampler tail and patches the header.
+    """
+    
+    def __init__(self, sample_rate, target_rate=16000, codec="wav", channels=1, directory=None):
+        self.sample_rate = sample_rate
+        self.target_rate = target_rate or sample_rate
+        self.channels = channels
+        self.codec = codec
+        if codec not in available_codecs():
+            logger.warning(f"Codec '{codec}' not available, falling back to WAV")
+            self.codec = "wav"
+        
+        self.resampler = None
+        if self.target_rate != sample_rate:
+            self.resampler = PolyphaseResampler(sample_rate, self.target_rate, channels)
+        self.writer = None
+        self.path = None
+        self.frames_in = 0
+        
+        # Payloads go to memory-mapped files here instead of RAM when set
+        self.directory = directory
+        self.max_block = sample_rate  # Frames resampled at once
+        
+        # Stats of the most recent payload
+        self.last_stats = None
+    
+    @property
+    def suffix(self):
+        """File suffix of the encoded payload"""
+        return codec_suffix(self.codec)
+    
+    @property
+    def duration(self):
+        """Seconds of captured audio fed into the current payload"""
+        return self.frames_in / self.sample_rate
+    
+    def begin(self):
+        """Start a new payload"""
+        if self.resampler:
+            self.resampler.reset()
+        self.path = None
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+            self.path = os.path.join(self.directory, f"payload-{os.getpid()}-{next(_payload_ids)}{self.suffix}")
+        self.writer = create_writer(self.target_rate, self.channels, self.codec, self.path)
+        self.frames_in = 0
+    
+    def feed(self, audio):
+        """
+        Resample and encode the next captured block
+        
+        Args:
+            audio: int16 array of shape (frames, channels)
+        """
+        if self.writer is None:
+            self.begin()
+        if not len(audio):
+            return
+        self.frames_in += len(audio)
+        # Large inputs (a whole recording) go through in slices so the
+        # float working set of the resampler stays bounded
+        for start in range(0, len(audio), self.max_block):
+            block = audio[start:start + self.max_block]
+            if self.resampler:
+                block = self.resampler.process(block)
+            self.writer.write(block)
+    
+    def finish(self):
+        """
+        Finalize the current payload
+        
+        Returns:
+            AudioPayload: Encoded recording
+        """
+        if self.writer is None:
+            self.begin()
+        if self.resampler:
+            self.writer.write(self.resampler.flush(np.int16))
+        data = self.writer.finalize()
+        self.writer = None
+        
+        # Baseline: 16-bit PCM WAV at the capture rate
+        raw_bytes = self.frames_in * self.channels * 2 + WavWriter.HEADER_SIZE
+        self.last_stats = {
+            "codec": self.codec,
+            "sample_rate": self.target_rate,
+            "raw_bytes": raw_bytes,
+            "encoded_bytes": len(data),
+            "bytes_saved": raw_bytes - len(data),
+        }
+        logger.info(
+            f"Encoded {raw_bytes} -> {len(data)} bytes "
+            f"({self.codec}, {self.target_rate} Hz, saved {raw_bytes - len(data)})"
+        )
+        return AudioPayload(data, self.suffix, self.duration, self.last_stats, self.path)
+    
+    def discard(self):
+        """Drop the current payload"""
+        if self.writer is not None:
+            data = self.writer.finalize()
+            self.writer = None
+            if self.path:
+                _release_mapping(data, self.path)
+        self.frames_in = 0
+    
+    def encode(self, audio):
+        """
+        Resample and encode a complete recording in one go
+        
+        Args:
+            audio: int16 array of shape (frames, channels)
+        
+        Returns:
+            AudioPayload: Encoded recording
+        """
+        self.begin()
+        self.feed(audio)
+        return self.finish()
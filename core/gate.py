@@ -0,0 +1,130 @@
+# Pre-upload Speech Gate
+import logging
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class SpeechGate:
+    """
+    Decides what part of a finished recording is worth uploading
+    
+    Uses per-block VAD decisions to skip recordings without speech, trim
+    leading/trailing silence and shorten long internal pauses.
+    """
+    
+    def __init__(self, sample_rate, padding=0.2, max_pause=1.0, min_speech=0.2, min_saving=0.5):
+        self.sample_rate = sample_rate
+        self.padding = padding  # Seconds kept around each speech region
+        self.max_pause = max_pause  # Longer internal pauses are shortened to this
+        self.min_speech = min_speech  # Less speech than this skips the request
+        self.min_saving = min_saving  # Trimming less than this is not worth re-encoding
+        
+        # Running totals across recordings
+        self.requests_skipped = 0
+        self.seconds_saved = 0.0
+    
+    def regions(self, speech, block_size, offset=0):
+        """
+        Convert per-block decisions into speech regions
+        
+        Args:
+            speech: Boolean array, one entry per block
+            block_size: Frames per block
+            offset: Frames between the start of block 0 and the start of the audio
+        
+        Returns:
+            (starts, ends): Frame indices of each region relative to the audio
+        """
+        edges = np.diff(np.concatenate([[0], speech.astype(np.int8), [0]]))
+        starts = np.flatnonzero(edges == 1) * block_size - offset
+        ends = np.flatnonzero(edges == -1) * block_size - offset
+        return np.maximum(starts, 0), np.maximum(ends, 0)
+    
+    def keep_segments(self, starts, ends, length):
+        """Frame ranges to keep: padded speech plus at most max_pause of each pause"""
+        pad = int(self.padding * self.sample_rate)
+        half_pause = max(pad, int(self.max_pause * self.sample_rate / 2))
+        
+        segments = []
+        seg_start = max(0, starts[0] - pad)
+        for prev_end, start in zip(ends[:-1], starts[1:]):
+            if start - prev_end > 2 * half_pause:
+                segments.append((seg_start, prev_end + half_pause))
+                seg_start = start - half_pause
+        segments.append((seg_start, min(length, ends[-1] + pad)))
+        return segments
+    
+    def select(self, length, speech, block_size, offset=0):
+        """
+        Decide which frames of a recording to upload
+        
+        Args:
+            length: Frames in the recording
+            speech: Per-block VAD decisions covering the audio
+            block_size: Frames per block
+            offset: Frames between the start of block 0 and the start of the audio
+        
+        Returns:
+            None if there is no speech, [(0, length)] if trimming is not
+            worthwhile, or the (start, end) frame ranges to keep
+        """
+        duration = length / self.sample_rate
+        starts, ends = self.regions(speech, block_size, offset)
+        ends = np.minimum(ends, length)
+        speech_seconds = float(np.sum(ends - starts)) / self.sample_rate
+        
+        if speech_seconds < self.min_speech:
+            self.requests_skipped += 1
+            self.seconds_saved += duration
+            logger.info(
+                f"No speech in {duration:.1f}s recording, skipping upload "
+                f"(skipped {self.requests_skipped} requests, saved {self.seconds_saved:.1f}s)"
+            )
+            return None
+        
+        segments = self.keep_segments(starts, ends, length)
+        kept = sum(end - start for start, end in segments)
+        saved = float(length - kept) / self.sample_rate
+        if saved < self.min_saving:
+            return [(0, length)]
+        
+        self.seconds_saved += saved
+        logger.info(
+            f"Trimmed {saved:.1f}s of silence from {duration:.1f}s recording "
+            f"(saved {self.seconds_saved:.1f}s total)"
+        )
+        return segments
+    
+    def apply(self, audio, speech, block_size, offset=0):
+        """
+        Gate a recording
+        
+        Args:
+            audio: Frames of shape (frames, channels)
+            speech: Per-block VAD decisions covering the audio
+            block_size: Frames per block
+            offset: Frames between the start of block 0 and the start of the audio
+        
+        Returns:
+            None if there is no speech, the original audio if trimming is not
+            worthwhile, or the trimmed audio
+        """
+        length = len(audio)
+        segments = self.select(length, speech, block_size, offset)
+        if segments is None:
+            return None
+        if segments == [(0, length)]:
+            return audio
+        if len(segments) == 1:
+            start, end = segments[0]
+            return audio[start:end]
+        return np.concatenate([audio[start:end] for start, end in segments])
+    
+    @property
+    def stats(self):
+        """Running totals of what the gate avoided uploading"""
+        return {
+            "requests_skipped": self.requests_skipped,
+            "seconds_saved": round(self.seconds_saved, 2),
+        }
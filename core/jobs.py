@@ -0,0 +1,185 @@
+# Transcription Job Queue
+import itertools
+import threading
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+
+class TranscriptionJob:
+    """One recording on its way to text"""
+    
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+    
+    def __init__(self, job_id, work, on_cancel=None, context=None):
+        self.id = job_id
+        self.work = work
+        self.on_cancel = on_cancel
+        self.context = context  # Caller data carried through to delivery
+        self.status = self.PENDING
+        self.result = None
+        self.error = None
+        self.future = None
+        self.finished = threading.Event()
+        self.lock = threading.Lock()  # Guards status changes, so a cancel and a start or finish cannot interleave
+    
+    @property
+    def cancelled(self):
+        return self.status == self.CANCELLED
+    
+    def start(self):
+        """Move a pending job to running; returns False if it was cancelled first"""
+        with self.lock:
+            if self.status != self.PENDING:
+                return False
+            self.status = self.RUNNING
+            return True
+    
+    def complete(self, result=None, error=None):
+        """Record the outcome of work(), unless the job was cancelled meanwhile"""
+        with self.lock:
+            if self.status == self.CANCELLED:
+                return False
+            if error is not None:
+                self.error = error
+                self.status = self.FAILED
+            else:
+                self.result = result
+                self.status = self.DONE
+            return True
+    
+    def cancel(self):
+        """Cancel the job; a running job finishes but its result is discarded"""
+        with self.lock:
+            if self.status not in (self.PENDING, self.RUNNING):
+                return False
+            self.status = self.CANCELLED
+        if self.future is not None:
+            self.future.cancel()
+        if self.on_cancel:
+            try:
+                self.on_cancel()
+            except Exception as e:
+                logger.warning(f"Job {self.id} cancel hook failed: {e}")
+        self.finished.set()
+        return True
+    
+    def wait(self, timeout=None):
+        """Block until the job finishes; returns whether it did"""
+        return self.finished.wait(timeout)
+    
+    def __repr__(self):
+        return f"TranscriptionJob(id={self.id}, status={self.status})"
+
+
+class TranscriptionQueue:
+    """
+    Worker pool for transcription jobs
+    
+    Jobs run concurrently, but results are delivered strictly in
+    submission order so pastes never reorder.
+    """
+    
+    def __init__(self, max_workers=2, on_result=None, on_error=None):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.on_result = on_result  # Called with each finished job, in order
+        self.on_error = on_error  # Called with each failed job, in order
+        self.ids = itertools.count(1)
+        self.jobs = {}
+        self.pending = deque()
+        self.lock = threading.Lock()
+        self.deliver_lock = threading.RLock()
+    
+    def submit(self, work, on_cancel=None, context=None):
+        """
+        Queue a job
+        
+        Args:
+            work: Callable returning the transcribed text
+            on_cancel: Optional hook run when the job is cancelled
+            context: Optional data available to the delivery callbacks
+        
+        Returns:
+            TranscriptionJob
+        """
+        with self.lock:
+            job = TranscriptionJob(next(self.ids), work, on_cancel, context)
+            self.jobs[job.id] = job
+            self.pending.append(job)
+            job.future = self.executor.submit(self._run, job)
+        logger.info(f"Job {job.id} queued ({len(self.pending)} pending)")
+        return job
+    
+    def _run(self, job):
+        """Execute a job on a worker thread"""
+        if not job.start():
+            self._deliver()
+            return
+        try:
+            job.complete(result=job.work())
+        except Exception as e:
+            if job.complete(error=e):
+                logger.error(f"Job {job.id} failed: {e}")
+        finally:
+            job.finished.set()
+            self._deliver()
+    
+    def _deliver(self):
+        """Hand out finished jobs from the head of the queue, in submission order"""
+        with self.deliver_lock:
+            while True:
+                with self.lock:
+                    if not self.pending or not self.pending[0].finished.is_set():
+                        return
+                    job = self.pending.popleft()
+                    self.jobs.pop(job.id, None)
+                
+                if job.status == TranscriptionJob.DONE and self.on_result:
+                    self._callback(self.on_result, job)
+                elif job.status == TranscriptionJob.FAILED and self.on_error:
+                    self._callback(self.on_error, job)
+    
+    @staticmethod
+    def _callback(callback, job):
+        try:
+            callback(job)
+        except Exception as e:
+            logger.error(f"Job {job.id} delivery error: {e}")
+    
+    def get(self, job_id):
+        """Look up a job that has not been delivered yet"""
+        with self.lock:
+            return self.jobs.get(job_id)
+    
+    def cancel(self, job_id):
+        """Cancel a job by ID; returns whether it was still pending or running"""
+        job = self.get(job_id)
+        if job is None:
+            return False
+        cancelled = job.cancel()
+        self._deliver()
+        return cancelled
+    
+    def cancel_all(self):
+        """Cancel every job not yet delivered"""
+        with self.lock:
+            jobs = list(self.pending)
+        for job in jobs:
+            job.cancel()
+        self._deliver()
+    
+    @property
+    def pending_count(self):
+        with self.lock:
+            return len(self.pending)
+    
+    def shutdown(self):
+        """Cancel outstanding jobs and stop the workers"""
+        self.cancel_all()
+        self.executor.shutdown(wait=False)
@@ -0,0 +1,32 @@
+# Volume Meter
+class VolumeMeter:
+    """Mean of the last few block volumes, updated in constant time"""
+    
+    def __init__(self, window=10):
+        self.window = window
+        self.values = [0.0] * window
+        self.index = 0
+        self.count = 0
+        self.total = 0.0
+    
+    def reset(self):
+        """Forget the history"""
+        self.values = [0.0] * self.window
+        self.index = 0
+        self.count = 0
+        self.total = 0.0
+    
+    def add(self, value):
+        """Push a volume, dropping the oldest once the window is full"""
+        self.total += value - self.values[self.index]
+        self.values[self.index] = value
+        self.index += 1
+        if self.index == self.window:
+            self.index = 0
+            self.total = sum(self.values)  # Resync once per window so rounding cannot drift
+        if self.count < self.window:
+            self.count += 1
+    
+    @property
+    def average(self):
+        return self.total / self.count if self.count else 0.0
@@ -0,0 +1,169 @@
+# Request Policy
+import time
+import random
+import threading
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+logger = logging.getLogger(__name__)
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a request could not complete within its deadline"""
+
+
+class RequestPolicy:
+    """
+    Deadlines, retries and hedging around a blocking request
+    
+    Each call gets an overall deadline. Retryable failures are retried with
+    jittered exponential backoff while time remains. When hedging is on and
+    an attempt runs longer than the observed p90 latency, a duplicate is
+    sent and whichever answers first wins; the loser is abandoned and its
+    result discarded once its own timeout (bounded by the deadline) expires.
+    """
+    
+    def __init__(self, deadline=20.0, max_retries=2, backoff=0.25, max_backoff=2.0,
+                 hedge=True, hedge_quantile=0.9, min_hedge_delay=0.5, min_samples=10, history=50,
+                 max_workers=4):
+        self.deadline = deadline  # Seconds for the whole call, retries included
+        self.max_retries = max_retries
+        self.backoff = backoff  # First retry waits up to this, doubling each time
+        self.max_backoff = max_backoff
+        self.hedge = hedge
+        self.hedge_quantile = hedge_quantile
+        self.min_hedge_delay = min_hedge_delay  # Never hedge sooner than this
+        self.min_samples = min_samples  # Latencies needed before hedging starts
+        
+        self.latencies = deque(maxlen=history)
+        # Attempts of concurrent calls (e.g. chunks) and their hedges share these threads
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="request")
+        self.lock = threading.Lock()
+        
+        # Counters, updated from the request threads under the lock
+        self.calls = 0
+        self.retries = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.deadlines_exceeded = 0
+    
+    def _count(self, name):
+        """Increment a counter; concurrent calls update them from several threads"""
+        with self.lock:
+            setattr(self, name, getattr(self, name) + 1)
+    
+    def hedge_delay(self):
+        """Seconds to wait before sending a duplicate, or None to not hedge"""
+        with self.lock:
+            if not self.hedge or len(self.latencies) < self.min_samples:
+                return None
+            ordered = sorted(self.latencies)
+        index = min(len(ordered) - 1, int(self.hedge_quantile * len(ordered)))
+        return max(self.min_hedge_delay, ordered[index])
+    
+    def call(self, request, is_retryable=None):
+        """
+        Run a request under the policy
+        
+        Args:
+            request: Callable taking the seconds left before the deadline
+            is_retryable: Callable deciding whether an error is worth retrying
+        
+        Returns:
+            The request's result
+        
+        Raises:
+            DeadlineExceeded: If no attempt succeeded in time
+            Exception: The last error if it is not retryable or retries ran out
+        """
+        self._count("calls")
+        deadline = time.monotonic() + self.deadline
+        attempt = 0
+        while True:
+            try:
+                return self._attempt(request, deadline)
+            except DeadlineExceeded:
+                self._count("deadlines_exceeded")
+                raise
+            except Exception as e:
+                if attempt >= self.max_retries or not (is_retryable and is_retryable(e)):
+                    raise
+                delay = self._backoff(attempt, e)
+                if time.monotonic() + delay >= deadline:
+                    self._count("deadlines_exceeded")
+                    raise DeadlineExceeded(f"Request deadline of {self.deadline:.1f}s exceeded") from e
+                attempt += 1
+                self._count("retries")
+                logger.warning(f"Request failed ({e}), retry {attempt}/{self.max_retries} in {delay:.2f}s")
+                time.sleep(delay)
+    
+    def _backoff(self, attempt, error):
+        """Full-jitter exponential backoff, honouring Retry-After when given"""
+        delay = random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+        response = getattr(error, "response", None)
+        retry_after = getattr(response, "headers", {}).get("retry-after") if response is not None else None
+        try:
+            return max(delay, float(retry_after))
+        except (TypeError, ValueError):
+            return delay
+    
+    def _attempt(self, request, deadline):
+        """One attempt, possibly hedged"""
+        start = time.monotonic()
+        remaining = deadline - start
+        if remaining <= 0:
+            raise DeadlineExceeded(f"Request deadline of {self.deadline:.1f}s exceeded")
+        
+        primary = self.executor.submit(request, remaining)
+        pending = {primary}
+        hedge_delay = self.hedge_delay()
+        if hedge_delay is not None and hedge_delay < remaining:
+            done, _ = wait(pending, timeout=hedge_delay)
+            if not done:
+                self._count("hedges")
+                logger.info(f"Request slower than p{self.hedge_quantile * 100:.0f} ({hedge_delay:.2f}s), hedging")
+                pending.add(self.executor.submit(request, deadline - time.monotonic()))
+        
+        error = None
+        while pending:
+            done, pending = wait(pending, timeout=max(0.0, deadline - time.monotonic()), return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            for future in done:
+                if future.exception() is None:
+                    if future is not primary:
+                        self._count("hedge_wins")
+                    for other in pending:
+                        other.cancel()
+                    self._record(time.monotonic() - start)
+                    return future.result()
+                error = future.exception()
+        
+        if error is not None and not pending:
+            raise error
+        for other in pending:
+            other.cancel()
+        raise DeadlineExceeded(f"Request deadline of {self.deadline:.1f}s exceeded")
+    
+    def _record(self, latency):
+        with self.lock:
+            self.latencies.append(latency)
+    
+    @property
+    def stats(self):
+        """Counters and the current hedge delay"""
+        delay = self.hedge_delay()
+        with self.lock:
+            return {
+                "calls": self.calls,
+                "retries": self.retries,
+                "hedges": self.hedges,
+                "hedge_wins": self.hedge_wins,
+                "deadlines_exceeded": self.deadlines_exceeded,
+                "hedge_delay_s": round(delay, 3) if delay is not None else None,
+            }
+    
+    def shutdown(self):
+        """Stop the request threads without waiting for abandoned attempts"""
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,396 @@
+# Transcript Post-processing
+import os
+import re
+import json
+import logging
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+SENTENCE_END = ".!?؟"
+SENTENCE_PATTERN = re.compile(r"([.!?؟]\s+)(\w)")
+LEADING_PATTERN = re.compile(r"^(\s+)(\w)")
+SPACES_PATTERN = re.compile(r"[^\S\n]+")
+NEWLINES_PATTERN = re.compile(r"\s*\n\s*")
+SPACE_BEFORE_PUNCTUATION = re.compile(r" +(?=[,.!?;:،؛؟])")
+REPEATED_PUNCTUATION = re.compile(r"([,;:،؛])\1+")
+
+ARABIC_DIGITS = "٠١٢٣٤٥٦٧٨٩"
+PERSIAN_DIGITS = "۰۱۲۳۴۵۶۷۸۹"
+WESTERN_DIGITS = "0123456789"
+ARABIC_OPTIONS = ("alef", "yaa", "tatweel", "diacritics")
+CONFIG_KEYS = ("arabic_normalization", "digits", "vocabulary", "vocabulary_file")
+
+
+def is_word_char(char):
+    return char.isalnum() or char == "_"
+
+
+class ArabicNormalizer:
+    """Single-pass character mapping for Arabic spelling variants and digit forms"""
+    
+    lookahead = 0
+    
+    def __init__(self, alef=False, yaa=False, tatweel=True, diacritics=False, digits=None):
+        """
+        Args:
+            alef: Map hamza/madda alef forms (أ إ آ ٱ) to bare alef (ا)
+            yaa: Map alef maqsura (ى) to yaa (ي)
+            tatweel: Remove the tatweel stretching character (ـ)
+            diacritics: Remove harakat (fatha, damma, kasra, tanwin, shadda, sukun)
+            digits: "western" (0-9), "arabic" (٠-٩), or None to leave digits alone
+        """
+        table = {}
+        if alef:
+            table.update(dict.fromkeys(map(ord, "أإآٱ"), "ا"))
+        if yaa:
+            table[ord("ى")] = "ي"
+        if tatweel:
+            table[ord("ـ")] = None
+        if diacritics:
+            table.update(dict.fromkeys(range(0x064B, 0x0653), None))
+            table[0x0670] = None  # Superscript alef
+        if digits == "western":
+            table.update(str.maketrans(ARABIC_DIGITS + PERSIAN_DIGITS, WESTERN_DIGITS * 2))
+        elif digits == "arabic":
+            table.update(str.maketrans(WESTERN_DIGITS + PERSIAN_DIGITS, ARABIC_DIGITS * 2))
+        elif digits:
+            raise ValueError(f"Unknown digit form: {digits}")
+        self.table = table
+    
+    def apply(self, text, before="", after=""):
+        return text.translate(self.table)
+
+
+class WhitespaceCleaner:
+    """Collapses runs of spaces, drops spaces before punctuation and doubled commas"""
+    
+    lookahead = 0
+    
+    def apply(self, text, before="", after=""):
+        text = SPACES_PATTERN.sub(" ", text)
+        if "\n" in text:
+            text = NEWLINES_PATTERN.sub("\n", text)
+        text = SPACE_BEFORE_PUNCTUATION.sub("", text)
+        text = REPEATED_PUNCTUATION.sub(r"\1", text)
+        if not before:
+            text = text.lstrip()
+        elif before in ",;:،؛" and text.startswith(before):
+            text = text.lstrip(before)
+        return text
+
+
+class Capitalizer:
+    """Upper-cases the first letter of the text and of every sentence"""
+    
+    lookahead = 0
+    
+    @staticmethod
+    def _upper(match):
+        return match.group(1) + match.group(2).upper()
+    
+    def apply(self, text, before="", after=""):
+        if not text:
+            return text
+        if not before:
+            text = text[0].upper() + text[1:]
+        elif before in SENTENCE_END:
+            text = LEADING_PATTERN.sub(self._upper, text, count=1)
+        return SENTENCE_PATTERN.sub(self._upper, text)
+
+
+class Vocabulary:
+    """
+    Custom term replacement with an Aho-Corasick automaton
+    
+    All terms are matched in one pass over the text, so the cost does not
+    grow with the size of the vocabulary. Overlapping matches resolve
+    leftmost-longest; only whole words match unless whole_words is off.
+    """
+    
+    def __init__(self, terms, ignore_case=True, whole_words=True):
+        """
+        Args:
+            terms: {term: replacement}
+            ignore_case: Match terms regardless of case
+            whole_words: Only match terms not embedded in a longer word
+        """
+        self.ignore_case = ignore_case
+        self.whole_words = whole_words
+        self.goto = [{}]  # Node -> {char: node}
+        self.length = [0]  # Length of the term ending at a node (0: none)
+        self.replacement = [None]
+        
+        for term, replacement in terms.items():
+            key = self._fold(" ".join(term.split()))
+            if not key:
+                continue
+            node = 0
+            for char in key:
+                following = self.goto[node].get(char)
+                if following is None:
+                    following = self.goto[node][char] = len(self.goto)
+                    self.goto.append({})
+                    self.length.append(0)
+                    self.replacement.append(None)
+                node = following
+            self.length[node] = len(key)
+            self.replacement[node] = replacement
+        self.size = sum(1 for length in self.length if length)
+        self.max_length = max(self.length)
+        self.lookahead = self.max_length + 1
+        self._link()
+    
+    def _link(self):
+        """Failure links, and output links to the next node on the failure chain ending a term"""
+        self.fail = [0] * len(self.goto)
+        self.output = [0] * len(self.goto)
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self.goto[node].items():
+                state = self.fail[node]
+                while state and char not in self.goto[state]:
+                    state = self.fail[state]
+                fallback = self.goto[state].get(char, 0)
+                self.fail[child] = fallback if fallback != child else 0
+                self.output[child] = fallback if self.length[fallback] else self.output[fallback]
+                queue.append(child)
+    
+    def _fold(self, text):
+        if not self.ignore_case:
+            return text
+        folded = text.lower()
+        if len(folded) != len(text):
+            # A few characters lower-case to two; keep positions aligned
+            folded = "".join(char if len(char.lower()) != 1 else char.lower() for char in text)
+        return folded
+    
+    def find(self, text, before="", after=""):
+        """
+        Matches in text, leftmost-longest and non-overlapping
+        
+        Args:
+            text: Text to search
+            before: Character preceding text, for the word-boundary check
+            after: Character following text
+        
+        Returns:
+            list: (start, end, replacement) tuples in order
+        """
+        goto, fail, length, output = self.goto, self.fail, self.length, self.output
+        root = goto[0]
+        candidates = []
+        state = 0
+        for index, char in enumerate(self._fold(text)):
+            if not state and char not in root:
+                continue
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            node = state if length[state] else output[state]
+            while node:
+                start = index + 1 - length[node]
+                if not self.whole_words or self._bounded(text, start, index + 1, before, after):
+                    candidates.append((start, -length[node], node))
+                node = output[node]
+        
+        matches = []
+        end = 0
+        for start, negative_length, node in sorted(candidates):
+            if start >= end:
+                end = start - negative_length
+                matches.append((start, end, self.replacement[node]))
+        return matches
+    
+    @staticmethod
+    def _bounded(text, start, end, before, after):
+        """Whether a match is not glued to word characters on either side"""
+        previous = text[start - 1] if start else before
+        if previous and is_word_char(previous) and is_word_char(text[start]):
+            return False
+        following = text[end] if end < len(text) else after
+        return not (following and is_word_char(following) and is_word_char(text[end - 1]))
+    
+    def safe_cut(self, text, cut, before=""):
+        """Move a cut point past a match that straddles it"""
+        for start, end, _ in self.find(text, before):
+            if start >= cut:
+                break
+            if end > cut:
+                return end
+        return cut
+    
+    def apply(self, text, before="", after=""):
+        pieces = []
+        position = 0
+        for start, end, replacement in self.find(text, before, after):
+            pieces.append(text[position:start])
+            pieces.append(replacement)
+            position = end
+        if not pieces:
+            return text
+        pieces.append(text[position:])
+        return "".join(pieces)
+
+
+def load_vocabulary(path):
+    """
+    Read replacement terms from a file
+    
+    JSON files hold a {term: replacement} object; any other file has one
+    "term => replacement" per line, with # comments.
+    
+    Returns:
+        dict: {term: replacement}
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        if path.lower().endswith(".json"):
+            return json.load(f)
+        terms = {}
+        for number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            term, separator, replacement = line.partition("=>")
+            if not separator:
+                logger.warning(f"{path}:{number}: expected 'term => replacement'")
+                continue
+            terms[term.strip()] = replacement.strip()
+        return terms
+
+
+class PostProcessor:
+    """
+    Chain of text steps applied to every transcript
+    
+    Built once; each step is a compiled pattern, translation table or
+    automaton, so a transcript is processed in time linear in its length.
+    """
+    
+    def __init__(self, steps=None, capitalizer=None):
+        self.steps = list(steps) if steps is not None else [WhitespaceCleaner()]
+        self.capitalizer = capitalizer or Capitalizer()
+    
+    def _chain(self, capitalize):
+        return self.steps + [self.capitalizer] if capitalize else list(self.steps)
+    
+    def apply(self, text, capitalize=True):
+        """
+        Post-process a whole transcript
+        
+        Args:
+            text: Raw transcript
+            capitalize: Whether to capitalize sentences
+        
+        Returns:
+            str: Processed text
+        """
+        if not text:
+            return text
+        for step in self._chain(capitalize):
+            text = step.apply(text)
+        return text.strip()
+    
+    def stream(self, capitalize=True):
+        """Incremental processor for text that arrives in pieces"""
+        return TextStream(self._chain(capitalize))
+
+
+class TextStream:
+    """
+    Post-processes partial transcripts as they arrive
+    
+    Every step holds back the tail it cannot finish yet (a partial word,
+    or a vocabulary term that may continue) and carries the last character
+    it emitted as context, so the concatenated output equals processing
+    the whole text at once.
+    """
+    
+    def __init__(self, steps):
+        self.steps = steps
+        self.pending = [""] * len(steps)  # Input each step is holding back
+        self.before = [""] * len(steps)  # Last character each step emitted
+    
+    def feed(self, text):
+        """
+        Add text
+        
+        Returns:
+            str: Newly finished output (may be empty)
+        """
+        return self._run(text, final=False)
+    
+    def flush(self):
+        """Finish the stream, returning the remaining output"""
+        return self._run("", final=True)
+    
+    def _run(self, text, final):
+        for index, step in enumerate(self.steps):
+            buffer = self.pending[index] + text
+            cut = len(buffer) if final else self._cut(buffer, len(buffer) - step.lookahead)
+            if cut and not final and isinstance(step, Vocabulary):
+                cut = step.safe_cut(buffer, cut, self.before[index])
+            segment, self.pending[index] = buffer[:cut], buffer[cut:]
+            text = step.apply(segment, self.before[index], self.pending[index][:1]) if segment else ""
+            if text:
+                self.before[index] = text[-1]
+        if final:
+            text = text.rstrip()
+        return text
+    
+    @staticmethod
+    def _cut(buffer, limit):
+        """Start of the last whitespace run at or before limit (0 if there is none)"""
+        index = min(limit, len(buffer) - 1)
+        while index > 0 and not buffer[index].isspace():
+            index -= 1
+        while index > 0 and buffer[index - 1].isspace():
+            index -= 1
+        return index if index > 0 and buffer[index].isspace() else 0
+
+
+def config_signature(config):
+    """Value that changes whenever the post-processing settings or the vocabulary file do"""
+    path = config.get("vocabulary_file")
+    mtime = os.path.getmtime(path) if path and os.path.exists(path) else None
+    return json.dumps([config.get(key) for key in CONFIG_KEYS] + [mtime], sort_keys=True, default=str)
+
+
+def create_postprocessor(config):
+    """
+    Build the post-processing chain described by the app config
+    
+    Args:
+        config: ConfigManager (or anything with get(key))
+    
+    Returns:
+        PostProcessor
+    """
+    steps = []
+    options = set(config.get("arabic_normalization") or ())
+    digits = config.get("digits") or None
+    normalizer = None
+    if options or digits:
+        unknown = options - set(ARABIC_OPTIONS)
+        if unknown:
+            logger.warning(f"Ignoring unknown Arabic normalization options: {sorted(unknown)}")
+        normalizer = ArabicNormalizer(**{option: option in options for option in ARABIC_OPTIONS}, digits=digits)
+        steps.append(normalizer)
+    steps.append(WhitespaceCleaner())
+    
+    terms = dict(config.get("vocabulary") or {})
+    path = config.get("vocabulary_file")
+    if path:
+        if os.path.exists(path):
+            terms.update(load_vocabulary(path))
+        else:
+            logger.warning(f"Vocabulary file not found: {path}")
+    if terms:
+        if normalizer is not None:
+            # Terms are matched against normalized text
+            terms = {normalizer.apply(term): replacement for term, replacement in terms.items()}
+        vocabulary = Vocabulary(terms)
+        steps.append(vocabulary)
+        logger.info(f"Loaded {vocabulary.size} vocabulary terms")
+    return PostProcessor(steps)
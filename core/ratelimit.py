@@ -0,0 +1,292 @@
+# Client-side Rate Limiting
+import re
+import time
+import itertools
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+# x-ratelimit-{limit,remaining,reset}-{requests,tokens,...}
+HEADER_PATTERN = re.compile(r"^x-ratelimit-(limit|remaining|reset)-([a-z0-9_-]+)$")
+DURATION_PATTERN = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+UNITS = {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 0.001}
+
+
+class RateLimitExceeded(TimeoutError):
+    """Raised when no API key gets capacity within the allowed wait"""
+
+
+def parse_duration(value):
+    """
+    Parse a reset time such as "7.66s", "2m59.56s", "1h2m" or "120ms"
+    
+    Returns:
+        float: Seconds, or None if the value is not understood
+    """
+    if value is None:
+        return None
+    value = str(value).strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = DURATION_PATTERN.findall(value)
+    if not parts or "".join(number + unit for number, unit in parts) != value:
+        return None
+    return sum(float(number) * UNITS[unit] for number, unit in parts)
+
+
+def parse_headers(headers):
+    """
+    Rate-limit state from response headers
+    
+    Returns:
+        (limits, retry_after): {resource: (limit, remaining, reset_seconds)}
+        and the Retry-After seconds (or None)
+    """
+    if headers is None:
+        return {}, None
+    fields = {}
+    for name, value in headers.items():
+        match = HEADER_PATTERN.match(name.lower())
+        if match:
+            fields.setdefault(match.group(2), {})[match.group(1)] = value
+    limits = {}
+    for resource, values in fields.items():
+        try:
+            limit = float(values["limit"])
+            remaining = float(values["remaining"])
+        except (KeyError, TypeError, ValueError):
+            continue
+        limits[resource] = (limit, remaining, parse_duration(values.get("reset")))
+    return limits, parse_duration(headers.get("retry-after"))
+
+
+class TokenBucket:
+    """
+    Token bucket whose size and refill rate are learned from the server
+    
+    Until the first rate-limit headers arrive the bucket is unlimited.
+    Tokens may go negative: each one below zero is a request queued
+    behind the refill.
+    """
+    
+    def __init__(self, capacity=None, rate=None):
+        self.capacity = capacity  # None: not learned yet
+        self.rate = rate  # Tokens per second
+        self.tokens = capacity
+        self.updated = time.monotonic()
+    
+    def _refill(self, now):
+        if self.capacity is not None and self.rate:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+    
+    def wait_time(self, cost, now):
+        """Seconds until cost tokens are available (a cost of 0 waits for the bucket to be non-empty)"""
+        if self.capacity is None:
+            return 0.0
+        self._refill(now)
+        missing = cost - self.tokens if cost else -self.tokens
+        if missing <= 0 and (cost or self.tokens > 0):
+            return 0.0
+        if not self.rate:
+            return float("inf")
+        return max(missing, 1e-3) / self.rate
+    
+    def take(self, cost, now):
+        if self.capacity is not None:
+            self._refill(now)
+            self.tokens -= cost
+    
+    def learn(self, limit, remaining, reset, in_flight, now):
+        """
+        Adopt the server's view of the budget
+        
+        Args:
+            limit: Budget per window
+            remaining: Budget left as of this response
+            reset: Seconds until the budget is full again (None if not sent)
+            in_flight: Requests sent but not yet counted in remaining
+            now: Monotonic time
+        """
+        self._refill(now)
+        self.capacity = limit
+        if reset:
+            if remaining < limit:
+                self.rate = (limit - remaining) / reset
+            elif not self.rate:
+                self.rate = limit / reset
+        # Responses arrive out of order; never trust a stale, larger remaining
+        estimate = remaining - in_flight
+        self.tokens = estimate if self.tokens is None else min(self.tokens, estimate)
+    
+    def drain(self, seconds, now):
+        """Empty the bucket so it refills no sooner than seconds from now"""
+        self._refill(now)
+        if self.capacity is None:
+            self.capacity = 1.0
+        if seconds > 0:
+            self.rate = min(self.rate or float("inf"), self.capacity / seconds)
+            self.tokens = min(self.tokens, 0.0)
+
+
+class KeyState:
+    """Rate-limit buckets and load of one API key"""
+    
+    def __init__(self, key):
+        self.key = key
+        self.buckets = {}  # resource -> TokenBucket
+        self.in_flight = 0
+        self.blocked_until = 0.0  # From Retry-After on a 429
+        self.requests = 0
+        self.throttled = 0
+        self.last_turn = -1  # Pool turn of the last request; rotates keys with equal budget
+    
+    def wait_time(self, now):
+        wait = max(0.0, self.blocked_until - now)
+        for resource, bucket in self.buckets.items():
+            wait = max(wait, bucket.wait_time(1 if resource == "requests" else 0, now))
+        return wait
+    
+    def take(self, now):
+        bucket = self.buckets.get("requests")
+        if bucket is not None:
+            bucket.take(1, now)
+        self.in_flight += 1
+        self.requests += 1
+
+
+class KeyPool:
+    """
+    API keys with per-key rate-limit buckets
+    
+    acquire() hands out the key that can send soonest (fewest requests in
+    flight, then least recently used on a tie), waiting while every key is out of budget; release()
+    feeds the response headers back into that key's buckets.
+    """
+    
+    def __init__(self, keys=()):
+        self.condition = threading.Condition()
+        self.states = {}
+        self.turns = itertools.count()
+        self.set_keys(keys)
+    
+    def set_keys(self, keys):
+        """Replace the pool, keeping what was learned about keys still in it"""
+        keys = list(dict.fromkeys(keys)) or [None]
+        with self.condition:
+            self.states = {key: self.states.get(key) or KeyState(key) for key in keys}
+            self.condition.notify_all()
+    
+    @property
+    def keys(self):
+        return [key for key in self.states if key is not None]
+    
+    def __len__(self):
+        return len(self.states)
+    
+    def _best(self, now):
+        return min(self.states.values(), key=lambda state: (state.wait_time(now), state.in_flight, state.last_turn))
+    
+    def wait_time(self):
+        """Seconds until some key has budget"""
+        with self.condition:
+            return self._best(time.monotonic()).wait_time(time.monotonic())
+    
+    def wait(self, timeout=None):
+        """
+        Block until some key has budget, without taking it
+        
+        Raises:
+            RateLimitExceeded: If that takes longer than timeout
+        """
+        self._wait(timeout, take=False)
+    
+    def acquire(self, timeout=None):
+        """
+        Take a request slot on the least-loaded key
+        
+        Returns:
+            The API key (None for a keyless backend)
+        
+        Raises:
+            RateLimitExceeded: If no key has budget within timeout
+        """
+        return self._wait(timeout, take=True)
+    
+    def _wait(self, timeout, take):
+        start = time.monotonic()
+        logged = False
+        with self.condition:
+            while True:
+                now = time.monotonic()
+                state = self._best(now)
+                wait = state.wait_time(now)
+                if wait <= 0:
+                    if take:
+                        state.take(now)
+                        state.last_turn = next(self.turns)
+                        return state.key
+                    return None
+                left = None if timeout is None else timeout - (now - start)
+                if left is not None and wait > left:
+                    raise RateLimitExceeded(f"Rate limited on all {len(self.states)} key(s) for another {wait:.1f}s")
+                if not logged:
+                    logged = True
+                    state.throttled += 1
+                    logger.info(f"Rate limit reached, queueing request for {wait:.1f}s")
+                # Released keys and new headers wake waiters early
+                self.condition.wait(wait if left is None else min(wait, left))
+    
+    def release(self, key, headers=None, status=None):
+        """
+        Return a slot and learn from the response
+        
+        Args:
+            key: Key returned by acquire()
+            headers: Response headers, if there was a response
+            status: HTTP status of the response, if any
+        """
+        limits, retry_after = parse_headers(headers)
+        with self.condition:
+            state = self.states.get(key)
+            if state is None:
+                return  # Key was removed from the pool meanwhile
+            state.in_flight = max(0, state.in_flight - 1)
+            now = time.monotonic()
+            for resource, (limit, remaining, reset) in limits.items():
+                bucket = state.buckets.setdefault(resource, TokenBucket())
+                bucket.learn(limit, remaining, reset, state.in_flight if resource == "requests" else 0, now)
+            if status == 429:
+                # Which budget ran out is not always said; hold the key until it resets
+                hold = retry_after
+                if hold is None:
+                    resets = [reset for _, remaining, reset in limits.values() if reset and remaining <= 0]
+                    hold = max(resets) if resets else 1.0
+                state.blocked_until = max(state.blocked_until, now + hold)
+                state.buckets.setdefault("requests", TokenBucket()).drain(hold, now)
+                logger.warning(f"Rate limited (429), holding key for {hold:.1f}s")
+            self.condition.notify_all()
+    
+    @property
+    def stats(self):
+        """Per-key load and learned limits"""
+        with self.condition:
+            now = time.monotonic()
+            return [
+                {
+                    "key": f"...{state.key[-4:]}" if state.key else None,
+                    "requests": state.requests,
+                    "in_flight": state.in_flight,
+                    "throttled": state.throttled,
+                    "wait_s": round(state.wait_time(now), 2),
+                    "limits": {
+                        resource: {"capacity": bucket.capacity, "rate_per_s": round(bucket.rate or 0.0, 4),
+                                   "tokens": round(bucket.tokens, 2) if bucket.tokens is not None else None}
+                        for resource, bucket in state.buckets.items()
+                    },
+                }
+                for state in self.states.values()
+            ]
@@ -1,50 +1,126 @@
 # Audio Recorder
-import sounddevice as sd
 import numpy as np
-import wave
-import tempfile
-import os
 import threading
-import queue
 import time
 import logging
 
+from .buffer import CaptureBuffer, PrerollRing, SpillBuffer
+from .encoding import PayloadEncoder
+from .vad import create_vad, frame_signal, volume_to_rms
+from .gate import SpeechGate
+from .meter import VolumeMeter
+
+try:
+    import sounddevice as sd
+except (ImportError, OSError):
+    sd = None  # No PortAudio (e.g. headless CI); everything but capture still works
+
 logger = logging.getLogger(__name__)
 
 
 class AudioRecorder:
     """Handles audio recording with silence detection"""
     
-    def __init__(self, sample_rate=44100, channels=1, block_size=1024):
+    def __init__(self, sample_rate=44100, channels=1, block_size=1024,
+                 upload_rate=16000, codec="wav"):
         self.sample_rate = sample_rate
         self.channels = channels
         self.block_size = block_size
         
-        self.audio_queue = queue.Queue()
+        # Resampling + compression applied before upload
+        self.upload_format = (upload_rate, codec)
+        self.encoder = PayloadEncoder(sample_rate, upload_rate, codec, channels)
+        
+        # Preallocated capture store (about 30 s, grows on demand)
+        self.buffer = CaptureBuffer(channels, capacity=sample_rate * 30)
+        self.spill_dir = None  # Long-recording mode: audio and payloads live on disk here
+        self.capturing = False  # Whether the callback writes to the buffer or the pre-roll
+        self.capture_lock = threading.Lock()
         self.stop_event = threading.Event()
         self.is_recording = False
         self.last_speech_time = 0
         self.current_volume = 0
         
-        # Volume tracking for quality indicator
-        self.recent_volumes = []
-        self.max_volume_history = 10
+        # End-pointing: detector name from core.vad.DETECTORS
+        self.vad_mode = "energy"
+        self.vad = create_vad(self.vad_mode, volume_to_rms(0.015, block_size * channels), sample_rate)
+        self.vad_position = 0  # Buffer frame up to which the VAD has run
+        self.speech_blocks = []  # Per-block VAD decisions of the current recording
+        
+        # Pre-upload gating: skip silent recordings, trim silence and long pauses
+        self.trim_silence = True
+        self.gate = SpeechGate(sample_rate)
+        self.payload_start = 0  # Buffer frame where the current payload starts
+        
+        # Volume tracking for quality indicator; the audio thread only
+        # stores values, the record loop hands them to the UI
+        self.meter = VolumeMeter(window=10)
+        self.low_volume_threshold = 0.01  # Average volume (same scale as silence_threshold) below this warns the user
+        self.ui_rate = 15.0  # Max UI notifications per second (capped by the 20 Hz poll)
+        self.last_ui_update = 0.0
+        self.reported_volume = None
+        self.low_volume = None
+        
+        # Streaming mode: cut the recording into chunks at natural pauses
+        self.streaming = False
+        self.chunk_min_duration = 3.0  # Seconds of audio before a cut is allowed
+        self.chunk_pause_duration = 0.4  # Seconds of silence that mark a pause
+        self.chunk_has_speech = False
+        
+        # Standby: a stream kept open between recordings, filling a pre-roll ring
+        self.standby_stream = None
+        self.preroll = None
+        
+        # Latency trace of the current dictation
+        self.trace = None
         
         # Callbacks
         self.on_volume_change = None  # Callback for volume updates
-        self.on_recording_complete = None  # Callback with WAV file path
+        self.on_recording_complete = None  # Callback with the encoded AudioPayload (no_speech=True when the gate skipped it)
         self.on_low_volume_warning = None  # Callback for low volume warning
+        self.on_chunk_ready = None  # Callback with the AudioPayload of a streamed chunk
+    
+    def set_upload_format(self, upload_rate, codec):
+        """Change the sample rate and codec of the upload payload"""
+        if (upload_rate, codec) != self.upload_format:
+            self.upload_format = (upload_rate, codec)
+            self.encoder = PayloadEncoder(self.sample_rate, upload_rate, codec, self.channels, self.spill_dir)
     
-    def start(self, silence_threshold=0.015, silence_duration=1.2):
-        """Start recording audio"""
+    def set_spill(self, directory=None, ram_seconds=10.0):
+        """
+        Switch long-recording mode on or off
+        
+        With a directory, captured audio beyond a fixed RAM window is spilled
+        to a file there and payloads are memory-mapped files instead of bytes.
+        
+        Args:
+            directory: Spill directory, or None to keep everything in RAM
+            ram_seconds: Seconds of audio held in RAM in long-recording mode
+        """
+        ram_frames = int(ram_seconds * self.sample_rate)
+        if directory == self.spill_dir and (directory is None or self.buffer.capacity == ram_frames):
+            return
+        if self.is_recording:
+            logger.warning("Cannot change long-recording mode while recording")
+            return
+        with self.capture_lock:
+            if directory:
+                self.buffer = SpillBuffer(directory, self.sample_rate, self.channels, ram_frames)
+            else:
+                self.buffer = CaptureBuffer(self.channels, capacity=self.sample_rate * 30)
+        self.spill_dir = directory
+        self.encoder.directory = directory
+        logger.info(f"Long-recording mode {'on (' + directory + ')' if directory else 'off'}")
+    
+    def start(self, silence_threshold=0.015, silence_duration=1.2, trace=None):
+        """Start recording audio, optionally marking steps on a Trace"""
         if self.is_recording:
             logger.warning("Already recording")
             return
         
         self.is_recording = True
         self.stop_event.clear()
-        self.audio_queue = queue.Queue()
-        self.last_speech_time = time.time()
+        self._reset(silence_threshold, trace)
         
         logger.info("Recording started")
         
@@ -55,6 +131,97 @@ class AudioRecorder:
             daemon=True
         ).start()
     
+    def _reset(self, silence_threshold, trace=None):
+        """Prepare buffers, encoder and VAD for a new recording"""
+        with self.capture_lock:
+            self.buffer.clear()
+            if self.preroll is not None and len(self.preroll):
+                # Start from the audio captured just before the hotkey
+                self.buffer.extend(self.preroll.snapshot())
+                self.preroll.clear()
+            self.capturing = True
+        self.meter.reset()
+        self.reported_volume = None
+        self.low_volume = None
+        self.encoder.begin()
+        # silence_threshold is on the volume-meter scale, like low_volume_threshold
+        self.vad = create_vad(
+            self.vad_mode,
+            volume_to_rms(silence_threshold, self.block_size * self.channels),
+            self.sample_rate
+        )
+        self.vad_position = 0
+        self.speech_blocks = []
+        self.payload_start = 0
+        self.last_speech_time = time.time()
+        self.chunk_has_speech = False
+        self.trace = trace
+    
+    @property
+    def in_standby(self):
+        return self.standby_stream is not None
+    
+    def enter_standby(self, preroll=0.4):
+        """
+        Keep the input stream open between recordings
+        
+        Recordings then start without device-open delay and include the
+        last preroll seconds of audio before start() was called.
+        
+        Args:
+            preroll: Seconds of audio kept from before each recording
+        
+        Returns:
+            bool: Whether the stream was opened
+        """
+        if sd is None:
+            logger.warning("Standby unavailable: sounddevice is not available")
+            return False
+        frames = int(preroll * self.sample_rate)
+        with self.capture_lock:
+            if self.preroll is None or len(self.preroll.data) != max(frames, 1):
+                self.preroll = PrerollRing(self.channels, frames)
+        if self.standby_stream is not None:
+            return True
+        try:
+            stream = sd.InputStream(
+                samplerate=self.sample_rate,
+                channels=self.channels,
+                blocksize=self.block_size,
+                callback=self._audio_callback
+            )
+            stream.start()
+        except Exception as e:
+            logger.error(f"Could not open standby stream: {e}")
+            return False
+        self.standby_stream = stream
+        logger.info(f"Standby stream open ({preroll * 1000:.0f} ms pre-roll)")
+        return True
+    
+    def leave_standby(self):
+        """Close the standby stream; the next recording opens its own"""
+        stream = self.standby_stream
+        if stream is None:
+            return
+        self.standby_stream = None
+        if not self.is_recording:
+            self.preroll = None
+        try:
+            stream.close()
+        except Exception as e:
+            logger.warning(f"Error closing standby stream: {e}")
+        logger.info("Standby stream closed")
+    
+    def _standby_ready(self):
+        """Whether the standby stream can serve the next recording"""
+        if self.standby_stream is None:
+            return False
+        if self.standby_stream.active:
+            return True
+        logger.warning("Standby stream stopped (device lost?), reopening per recording")
+        self.leave_standby()
+        return False
+    
     def stop(self):
         """Stop recording"""
         if not self.is_recording:
@@ -62,23 +229,29 @@ class AudioRecorder:
         
         logger.info("Stopping recording")
         self.is_recording = False
+        if self.trace is not None:
+            self.trace.mark("stop")
+            self.trace.meta.setdefault("stop", "manual")
         self.stop_event.set()
     
     def _record_loop(self, silence_threshold, silence_duration):
         """Recording loop with silence detection"""
         try:
-            with sd.InputStream(
-                samplerate=self.sample_rate,
-                channels=self.channels,
-                blocksize=self.block_size,
-                callback=self._audio_callback
-            ):
-                while not self.stop_event.is_set():
-                    if time.time() - self.last_speech_time > silence_duration:
-                        logger.info("Silence detected, stopping")
-                        self.stop_event.set()
-                        break
-                    time.sleep(0.05)
+            if sd is None:
+                raise RuntimeError("sounddevice is not available")
+            if self._standby_ready():
+                self._capture(silence_duration)
+            else:
+                with sd.InputStream(
+                    samplerate=self.sample_rate,
+                    channels=self.channels,
+                    blocksize=self.block_size,
+                    callback=self._audio_callback
+                ):
+                    self._capture(silence_duration)
+            
+            if self.trace is not None and any(block.any() for block in self.speech_blocks):
+                self.trace.mark_wall("last_speech", self.last_speech_time)
             
             # Process recorded audio
             self._process_audio(silence_threshold)
@@ -88,72 +261,213 @@ class AudioRecorder:
             if self.on_recording_complete:
                 self.on_recording_complete(None, error=str(e))
     
-    def _audio_callback(self, indata, frames, time_info, status):
-        """Callback for each audio block"""
-        self.audio_queue.put(indata.copy())
+    def _capture(self, silence_duration):
+        """Poll VAD, encoder and chunking until silence or stop()"""
+        if self.trace is not None:
+            self.trace.mark("stream_open")
+            self.trace.meta["standby"] = self.in_standby
+        try:
+            while not self.stop_event.is_set():
+                self._run_vad()
+                if time.time() - self.last_speech_time > silence_duration:
+                    logger.info("Silence detected, stopping")
+                    if self.trace is not None:
+                        self.trace.mark("stop")
+                        self.trace.meta.setdefault("stop", "silence")
+                    self.stop_event.set()
+                    break
+                # Encode what arrived since the last poll
+                self._feed_encoder()
+                self._spill()
+                if self.streaming and self._should_cut_chunk(silence_duration):
+                    self._emit_chunk()
+                self._notify_ui()
+                time.sleep(0.05)
+        finally:
+            # A standby stream keeps running; its blocks go back to the pre-roll
+            with self.capture_lock:
+                self.capturing = False
+            self.is_recording = False
+            self._notify_ui(final=True)
+    
+    def _notify_ui(self, final=False):
+        """
+        Pass the latest volume state to the UI callbacks
         
-        # Calculate volume
-        vol = np.linalg.norm(indata) * 10
-        self.current_volume = vol
+        Runs on the record loop thread, at most ui_rate times per second,
+        and only calls back when the value or warning state changed.
+        
+        Args:
+            final: Recording ended; settle the meter at zero and clear the warning
+        """
+        now = time.monotonic()
+        if not final and now - self.last_ui_update < 1.0 / self.ui_rate:
+            return
+        self.last_ui_update = now
+        
+        volume = 0.0 if final else self.current_volume
+        if self.on_volume_change and volume != self.reported_volume:
+            self.reported_volume = volume
+            self.on_volume_change(volume)
+        
+        if final:
+            is_low = False if self.low_volume else None
+        elif self.meter.count >= 5:  # Need some history
+            is_low = self.meter.average < self.low_volume_threshold
+        else:
+            is_low = None
+        if self.on_low_volume_warning and is_low is not None and is_low != self.low_volume:
+            self.low_volume = is_low
+            self.on_low_volume_warning(is_low)
+    
+    def _should_cut_chunk(self, silence_duration):
+        """Check whether the current chunk ends at a natural pause"""
+        if not self.chunk_has_speech:
+            return False
+        if self.encoder.duration < self.chunk_min_duration:
+            return False
+        pause = time.time() - self.last_speech_time
+        # Leave the final pause to the silence timeout so the last chunk is not empty
+        return self.chunk_pause_duration <= pause < silence_duration
+    
+    def _run_vad(self):
+        """Classify the complete blocks captured since the previous run as one batch"""
+        size = len(self.buffer)
+        end = self.vad_position + (size - self.vad_position) // self.block_size * self.block_size
+        if end <= self.vad_position:
+            return
+        
+        audio = self.buffer.view(self.vad_position, end)
+        samples = audio.mean(axis=1) if self.channels > 1 else audio[:, 0]
+        frames = frame_signal(samples.astype(np.float32) / 32767, self.block_size)
+        speech = self.vad.process(frames)
+        self.speech_blocks.append(speech)
+        start = self.vad_position
+        self.vad_position = end
+        
+        if speech.any():
+            # Date the last speech block by how much audio arrived after it
+            speech_end = start + (np.flatnonzero(speech)[-1] + 1) * self.block_size
+            speech_time = time.time() - (size - speech_end) / self.sample_rate
+            self.last_speech_time = max(self.last_speech_time, speech_time)
+            self.chunk_has_speech = True
+    
+    def _feed_encoder(self):
+        """Append frames captured since the previous feed to the payload"""
+        self.encoder.feed(self.buffer.read())
+    
+    def _spill(self):
+        """In long-recording mode, move frames already encoded and classified out of RAM"""
+        if self.spill_dir:
+            self.buffer.spill(min(self.vad_position, self.buffer.read_position))
+    
+    def _emit_chunk(self):
+        """Hand the audio captured since the last cut to the chunk callback"""
+        self._feed_encoder()
+        self.chunk_has_speech = False
         
-        # Track volume history for quality indicator
-        self.recent_volumes.append(vol)
-        if len(self.recent_volumes) > self.max_volume_history:
-            self.recent_volumes.pop(0)
+        try:
+            payload = self._finish_payload()
+            if payload and self.on_chunk_ready:
+                logger.info(f"Chunk encoded: {len(payload)} bytes, {payload.duration:.1f}s")
+                self.on_chunk_ready(payload)
+        except Exception as e:
+            logger.error(f"Chunk processing error: {e}")
+        finally:
+            self.encoder.begin()
+    
+    def _finish_payload(self):
+        """
+        Finalize the current payload through the speech gate
+        
+        Returns:
+            AudioPayload, or None when the audio holds no speech
+        """
+        start = self.payload_start
+        end = len(self.buffer)
+        self.payload_start = end
+        if not self.trim_silence:
+            return self.encoder.finish()
         
-        # Update last speech time if volume above threshold
-        if vol > 0.015:  # Use a default threshold here
-            self.last_speech_time = time.time()
+        # Decisions for the blocks overlapping this payload
+        self._run_vad()
+        speech = np.concatenate(self.speech_blocks) if self.speech_blocks else np.zeros(0, dtype=bool)
+        first_block = start // self.block_size
+        speech = speech[first_block:-(-end // self.block_size)]
         
-        # Check for low volume warning
-        if len(self.recent_volumes) >= 5:  # Need some history
-            avg_volume = sum(self.recent_volumes) / len(self.recent_volumes)
-            if self.on_low_volume_warning:
-                # Emit warning if average is below 0.01 (configurable threshold)
-                self.on_low_volume_warning(avg_volume < 0.01)
+        segments = self.gate.select(end - start, speech, self.block_size, start - first_block * self.block_size)
+        if segments is None:
+            self.encoder.discard()
+            return None
+        if segments == [(0, end - start)]:
+            return self.encoder.finish()
+        
+        # Enough was trimmed to be worth encoding again; feed the kept ranges
+        # straight from the buffer rather than joining them into a copy
+        self.encoder.discard()
+        self.encoder.begin()
+        for seg_start, seg_end in segments:
+            self.encoder.feed(self.buffer.view(start + seg_start, start + seg_end))
+        return self.encoder.finish()
+    
+    def _audio_callback(self, indata, frames, time_info, status):
+        """Callback for each audio block"""
+        with self.capture_lock:
+            if not self.capturing:
+                if self.preroll is not None:
+                    self.preroll.write(indata)
+                return
+            self.buffer.write(indata)
         
-        # Notify volume change
-        if self.on_volume_change:
-            self.on_volume_change(vol)
+        # Latest value for the record loop to pick up; no UI work on the audio thread
+        vol = float(np.linalg.norm(indata)) * 10
+        self.current_volume = vol
+        self.meter.add(vol)
     
     def _process_audio(self, silence_threshold):
-        """Process recorded audio into WAV file"""
-        if self.audio_queue.empty():
+        """Finalize the upload payload"""
+        self._feed_encoder()
+        if self.spill_dir:
+            # Capture has ended; the gate reads the rest through the memory map
+            self.buffer.spill()
+        try:
+            self._finish_recording()
+        finally:
+            if self.spill_dir:
+                self.buffer.clear()
+    
+    def _finish_recording(self):
+        """Hand the payload of a finished recording to on_recording_complete"""
+        
+        if not self.encoder.frames_in:
             logger.warning("No audio data recorded")
+            self.encoder.discard()
             if self.on_recording_complete:
                 self.on_recording_complete(None)
             return
         
-        # Collect all frames
-        frames = []
-        while not self.audio_queue.empty():
-            frames.append(self.audio_queue.get())
-        
-        audio = np.concatenate(frames, axis=0)
-        
         # Check minimum duration
-        if len(audio) < self.sample_rate * 0.5:
+        if self.encoder.duration < 0.5:
             logger.warning("Audio too short, skipping")
+            self.encoder.discard()
             if self.on_recording_complete:
                 self.on_recording_complete(None)
             return
         
-        # Save to temporary WAV file
+        # Only the resampler tail and the header are left to write
         try:
-            temp_file = tempfile.NamedTemporaryFile(suffix=".wav", delete=False)
-            temp_path = temp_file.name
-            temp_file.close()
-            
-            with wave.open(temp_path, 'wb') as wf:
-                wf.setnchannels(self.channels)
-                wf.setsampwidth(2)
-                wf.setframerate(self.sample_rate)
-                wf.writeframes((audio * 32767).astype(np.int16).tobytes())
+            payload = self._finish_payload()
+            if not payload:
+                if self.on_recording_complete:
+                    self.on_recording_complete(None, no_speech=True)
+                return
             
-            logger.info(f"Audio saved to: {temp_path}")
+            logger.info(f"Audio encoded: {len(payload)} bytes, {payload.duration:.1f}s")
+            if self.trace is not None:
+                self.trace.mark("encoded")
             
             if self.on_recording_complete:
-                self.on_recording_complete(temp_path)
+                self.on_recording_complete(payload)
                 
         except Exception as e:
             logger.error(f"Audio processing error: {e}")
@@ -0,0 +1,457 @@
+# Output Sinks
+import sys
+import json
+import time
+import socket
+import threading
+import logging
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+SINKS = ("clipboard", "typing", "file", "stdout", "socket")
+
+
+class OutputSink:
+    """
+    Destination for dictated text
+    
+    Each dictation arrives as begin(), any number of write() calls with
+    consecutive segments of the text, then end(). Writes are timed so the
+    sink can report its delivery latency.
+    """
+    
+    name = "sink"
+    
+    def __init__(self):
+        self.latencies = deque(maxlen=200)  # Seconds per write
+    
+    def begin(self, context=None):
+        """
+        Start a dictation
+        
+        Args:
+            context: Caller data, e.g. {"window": handle} for the paste target
+        """
+    
+    def write(self, segment):
+        """
+        Deliver the next piece of text
+        
+        Returns:
+            float: Seconds the delivery took
+        """
+        start = time.perf_counter()
+        self._write(segment)
+        elapsed = time.perf_counter() - start
+        self.latencies.append(elapsed)
+        return elapsed
+    
+    def _write(self, segment):
+        raise NotImplementedError
+    
+    def end(self):
+        """Finish the current dictation"""
+    
+    def close(self):
+        """Release files, sockets and the like"""
+    
+    @property
+    def stats(self):
+        """Write latency percentiles in milliseconds"""
+        ordered = sorted(self.latencies)
+        if not ordered:
+            return {"count": 0}
+        return {
+            "count": len(ordered),
+            "p50_ms": round(ordered[len(ordered) // 2] * 1000, 1),
+            "p95_ms": round(ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))] * 1000, 1),
+        }
+
+
+class ClipboardPasteSink(OutputSink):
+    """Copies each segment to the clipboard and pastes it into the dictation's window"""
+    
+    name = "clipboard"
+    
+    def __init__(self, paste=None, settle=0.05):
+        """
+        Args:
+            paste: Callable taking a window handle that sends the paste keystroke;
+                returning False means the window is gone
+            settle: Seconds to leave a paste before the clipboard is replaced
+        """
+        super().__init__()
+        self.paste = paste
+        self.settle = settle  # The target reads the clipboard some time after Ctrl+V
+        self.window = None
+        self.parts = []
+        self.last_paste = 0.0
+    
+    def begin(self, context=None):
+        self.window = (context or {}).get("window")
+        self.parts = []
+    
+    def _copy(self, text):
+        import pyperclip
+        
+        wait = self.last_paste + self.settle - time.perf_counter()
+        if wait > 0:
+            time.sleep(wait)
+        pyperclip.copy(text)
+    
+    def _write(self, segment):
+        self.parts.append(segment)
+        self._copy(segment)
+        if self.paste and self.window:
+            if self.paste(self.window) is False:
+                # Warned once; the rest of the dictation collects on the clipboard
+                self.window = None
+            self.last_paste = time.perf_counter()
+        elif len(self.parts) == 1:
+            logger.info("No previous window saved - text in clipboard only")
+    
+    def end(self):
+        # Leave the whole dictation on the clipboard, not just its last segment
+        if len(self.parts) > 1:
+            self._copy("".join(self.parts))
+        self.parts = []
+
+
+class TypingSink(OutputSink):
+    """Types each segment into the focused window as simulated keystrokes"""
+    
+    name = "typing"
+    
+    def __init__(self, focus=None, interval=0.0):
+        """
+        Args:
+            focus: Callable taking a window handle that brings it to the foreground
+            interval: Seconds between keystrokes (0 types as fast as possible)
+        """
+        super().__init__()
+        self.focus = focus
+        self.interval = interval
+        self.window = None
+    
+    def begin(self, context=None):
+        self.window = (context or {}).get("window")
+    
+    def _write(self, segment):
+        import keyboard
+        
+        if self.focus and self.window:
+            self.focus(self.window)
+            self.window = None  # Focused once per dictation
+        keyboard.write(segment, delay=self.interval)
+
+
+class FileSink(OutputSink):
+    """Appends each dictation to a text file, one line per dictation"""
+    
+    name = "file"
+    
+    def __init__(self, path="dictations.txt"):
+        super().__init__()
+        self.path = path
+        self.file = None
+    
+    def _write(self, segment):
+        if self.file is None:
+            self.file = open(self.path, "a", encoding="utf-8")
+        self.file.write(segment)
+        self.file.flush()
+    
+    def end(self):
+        if self.file is not None:
+            self.file.write("\n")
+            self.file.flush()
+    
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+class StdoutSink(OutputSink):
+    """Prints dictations as they arrive, one line each"""
+    
+    name = "stdout"
+    
+    def __init__(self, stream=None):
+        super().__init__()
+        self.stream = stream or sys.stdout
+    
+    def _write(self, segment):
+        self.stream.write(segment)
+        self.stream.flush()
+    
+    def end(self):
+        self.stream.write("\n")
+        self.stream.flush()
+
+
+class SocketSink(OutputSink):
+    """
+    Serves dictations to local TCP clients as JSON lines
+    
+    Every connected client receives {"event": "start", "id": n}, then
+    {"event": "text", "id": n, "text": segment} per segment, then
+    {"event": "end", "id": n}. Clients that stall are dropped.
+    """
+    
+    name = "socket"
+    
+    def __init__(self, host="127.0.0.1", port=8766, send_timeout=1.0):
+        super().__init__()
+        self.send_timeout = send_timeout
+        self.server = socket.create_server((host, port))
+        self.clients = []
+        self.lock = threading.Lock()
+        self.sequence = 0
+        self.thread = threading.Thread(target=self._accept, daemon=True)
+        self.thread.start()
+        logger.info(f"Dictation socket listening on {self.address[0]}:{self.address[1]}")
+    
+    @property
+    def address(self):
+        return self.server.getsockname()[:2]
+    
+    def _accept(self):
+        while True:
+            try:
+                client, address = self.server.accept()
+            except OSError:
+                return  # Server closed
+            client.settimeout(self.send_timeout)
+            with self.lock:
+                self.clients.append(client)
+            logger.info(f"Dictation socket client connected: {address[0]}:{address[1]}")
+    
+    def _send(self, message):
+        data = (json.dumps(message, ensure_ascii=False) + "\n").encode("utf-8")
+        with self.lock:
+            for client in list(self.clients):
+                try:
+                    client.sendall(data)
+                except OSError:
+                    self.clients.remove(client)
+                    client.close()
+    
+    def begin(self, context=None):
+        self.sequence += 1
+        self._send({"event": "start", "id": self.sequence})
+    
+    def _write(self, segment):
+        self._send({"event": "text", "id": self.sequence, "text": segment})
+    
+    def end(self):
+        self._send({"event": "end", "id": self.sequence})
+    
+    def close(self):
+        try:
+            self.server.shutdown(socket.SHUT_RDWR)  # Wakes the accept thread
+        except OSError:
+            pass
+        self.server.close()
+        with self.lock:
+            for client in self.clients:
+                client.close()
+            self.clients = []
+
+
+class Delivery:
+    """One dictation's text on its way to the sinks"""
+    
+    def __init__(self, router, context=None, trace=None, on_finish=None):
+        self.router = router
+        self.context = context
+        self.trace = trace  # Receives first_text and delivered marks
+        self.on_finish = on_finish  # Called with the delivery once the sinks have it all
+        self.outcome = None
+        self.buffer = []  # Segments waiting for earlier dictations to finish
+        self.started = False
+        self.closed = False
+        self.segments = 0
+        self.seconds = {}  # Sink name -> delivery time
+    
+    def write(self, segment):
+        """Deliver a segment now, or once the dictations before this one are done"""
+        if not segment:
+            return
+        with self.router.lock:
+            if self.closed:
+                return
+            if self.started:
+                self._send(segment)
+            else:
+                self.buffer.append(segment)
+    
+    def close(self, outcome="ok"):
+        """
+        Mark the text complete
+        
+        Args:
+            outcome: Recorded with the trace, e.g. "ok", "empty" or "error"
+        """
+        with self.router.lock:
+            if self.closed:
+                return
+            self.closed = True
+            self.outcome = outcome
+        self.router._pump()
+    
+    def cancel(self):
+        """Drop segments not delivered yet and close"""
+        with self.router.lock:
+            self.buffer = []
+        self.close("cancelled")
+    
+    def _start(self):
+        self.started = True
+        buffered, self.buffer = self.buffer, []
+        for segment in buffered:
+            self._send(segment)
+    
+    def _send(self, segment):
+        if not self.segments:
+            # Sinks only hear of dictations that produced text
+            for sink in self.router.sinks:
+                self.router._call(sink, sink.begin, self.context)
+        for sink in self.router.sinks:
+            elapsed = self.router._call(sink, sink.write, segment)
+            if elapsed is not None:
+                self.seconds[sink.name] = self.seconds.get(sink.name, 0.0) + elapsed
+        self.segments += 1
+        if self.trace is not None:
+            self.trace.mark("first_text")
+    
+    def _end(self):
+        if self.segments:
+            for sink in self.router.sinks:
+                self.router._call(sink, sink.end)
+            if self.trace is not None:
+                self.trace.mark("delivered")
+                self.trace.meta["sinks"] = {name: round(seconds * 1000, 1) for name, seconds in self.seconds.items()}
+    
+    def _finish(self):
+        if self.on_finish:
+            try:
+                self.on_finish(self)
+            except Exception as e:
+                logger.error(f"Delivery callback error: {e}")
+
+
+class OutputRouter:
+    """
+    Fans dictations out to the output sinks
+    
+    Dictations reach the sinks one at a time, in the order they were
+    opened. The oldest open dictation streams its segments straight
+    through; later ones are held until it closes.
+    """
+    
+    def __init__(self, sinks):
+        self.sinks = list(sinks)
+        self.lock = threading.RLock()
+        self.queue = deque()
+    
+    def open(self, context=None, trace=None, on_finish=None):
+        """
+        Start delivering a dictation
+        
+        Args:
+            context: Passed to each sink's begin(), e.g. {"window": handle}
+            trace: Optional Trace of the dictation
+            on_finish: Called with the Delivery once it has reached the sinks
+        
+        Returns:
+            Delivery
+        """
+        delivery = Delivery(self, context, trace, on_finish)
+        with self.lock:
+            self.queue.append(delivery)
+        self._pump()
+        return delivery
+    
+    def _pump(self):
+        """Start the oldest dictation and retire it once closed"""
+        finished = []
+        with self.lock:
+            while self.queue:
+                head = self.queue[0]
+                if not head.started:
+                    head._start()
+                if not head.closed:
+                    break
+                head._end()
+                finished.append(self.queue.popleft())
+        for delivery in finished:
+            delivery._finish()
+    
+    @staticmethod
+    def _call(sink, method, *args):
+        """Run a sink method; a failing sink does not stop the others"""
+        try:
+            return method(*args)
+        except Exception as e:
+            logger.error(f"Output sink '{sink.name}' failed: {e}")
+            return None
+    
+    @property
+    def idle(self):
+        """Whether no dictation is being delivered"""
+        with self.lock:
+            return not self.queue
+    
+    @property
+    def stats(self):
+        """Write latency per sink"""
+        return {sink.name: sink.stats for sink in self.sinks}
+    
+    def close(self):
+        for sink in self.sinks:
+            self._call(sink, sink.close)
+
+
+def create_sink(name, config, paste=None, focus=None):
+    """
+    Build an output sink by name
+    
+    Args:
+        name: One of SINKS
+        config: ConfigManager (or anything with get(key))
+        paste: Paste callable for the clipboard sink
+        focus: Focus callable for the typing sink
+    
+    Returns:
+        OutputSink
+    """
+    if name == "clipboard":
+        return ClipboardPasteSink(paste)
+    if name == "typing":
+        return TypingSink(focus, config.get("typing_interval") or 0.0)
+    if name == "file":
+        return FileSink(config.get("output_file") or "dictations.txt")
+    if name == "stdout":
+        return StdoutSink()
+    if name == "socket":
+        host, _, port = (config.get("output_socket") or "127.0.0.1:8766").rpartition(":")
+        return SocketSink(host or "127.0.0.1", int(port))
+    raise ValueError(f"Unknown output sink: {name}")
+
+
+def create_output(config, paste=None, focus=None):
+    """
+    Build the router for the sinks listed in the app config
+    
+    Returns:
+        OutputRouter
+    """
+    sinks = []
+    for name in config.get("output_sinks") or ["clipboard"]:
+        try:
+            sinks.append(create_sink(name, config, paste, focus))
+        except (ValueError, OSError) as e:
+            logger.error(f"Output sink '{name}' unavailable: {e}")
+    return OutputRouter(sinks)
@@ -0,0 +1,115 @@
+# Streaming Transcription
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+
+class StreamingSession:
+    """Transcribes recording chunks in the background and stitches them in order"""
+    
+    def __init__(self, transcriber, auto_capitalize=True, max_workers=2, on_text=None):
+        self.transcriber = transcriber
+        self.auto_capitalize = auto_capitalize
+        self.on_text = on_text  # Called with each new piece of finished text, in order
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.futures = []
+        self.lock = threading.Lock()
+        
+        # Chunk texts are post-processed as they arrive, in order
+        self.stream = transcriber.postprocessor.stream(capitalize=auto_capitalize)
+        self.consumed = 0  # Chunks fed to the stream
+        self.parts = []
+    
+    @property
+    def chunk_count(self):
+        """Number of chunks submitted so far"""
+        return len(self.futures)
+    
+    def submit(self, payload):
+        """Queue a finished chunk for transcription"""
+        with self.lock:
+            index = len(self.futures)
+            future = self.executor.submit(self._transcribe_chunk, payload, index)
+            self.futures.append(future)
+        future.add_done_callback(lambda _: self._advance())
+        logger.info(f"Chunk {index} submitted for transcription")
+    
+    def _transcribe_chunk(self, payload, index):
+        """Transcribe a single chunk"""
+        # Post-processing runs over the stitched text, in _advance
+        try:
+            text = self.transcriber.transcribe(payload, postprocess=False)
+        finally:
+            payload.close()
+        logger.info(f"Chunk {index} transcribed")
+        return text
+    
+    def _advance(self):
+        """Feed chunks finished in order so far through the post-processing stream"""
+        with self.lock:
+            while self.consumed < len(self.futures):
+                future = self.futures[self.consumed]
+                if not future.done() or future.cancelled() or future.exception() is not None:
+                    return
+                text = (future.result() or "").strip()
+                if text:
+                    self._emit(self.stream.feed(text + " "))
+                self.consumed += 1
+    
+    def _emit(self, segment):
+        """Record a piece of output and pass it on (lock held, so pieces stay in order)"""
+        self.parts.append(segment)
+        if segment and self.on_text:
+            try:
+                self.on_text(segment)
+            except Exception as e:
+                logger.error(f"Streaming text callback error: {e}")
+    
+    @property
+    def partial_text(self):
+        """Post-processed text of the chunks transcribed so far"""
+        with self.lock:
+            return "".join(self.parts)
+    
+    def finish(self, trace=None):
+        """
+        Wait for all chunks and return the stitched transcription
+        
+        Args:
+            trace: Optional Trace of the dictation
+        
+        Returns:
+            str: Combined text in chunk order, or None if nothing was transcribed
+        """
+        with self.lock:
+            futures = list(self.futures)
+        
+        if trace is not None:
+            trace.mark("job_start")
+        try:
+            for future in futures:
+                future.result()
+        except Exception:
+            self.cancel()
+            raise
+        finally:
+            self.executor.shutdown(wait=False)
+        
+        if trace is not None:
+            trace.mark("transcribed")
+        self._advance()
+        with self.lock:
+            self._emit(self.stream.flush())
+            result = "".join(self.parts)
+        if trace is not None:
+            trace.mark("postprocessed")
+        return result or None
+    
+    def cancel(self):
+        """Drop chunks that have not started yet"""
+        with self.lock:
+            for future in self.futures:
+                future.cancel()
+        self.executor.shutdown(wait=False)
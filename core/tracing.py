@@ -0,0 +1,218 @@
+# Dictation Latency Tracing
+import os
+import json
+import time
+import itertools
+import threading
+import logging
+from collections import deque
+from contextlib import contextmanager
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Stage name -> (start mark, end mark)
+STAGES = {
+    "dispatch": ("hotkey", "toggle"),  # Hotkey thread to the Tk main loop
+    "stream_open": ("toggle", "stream_open"),  # Opening sd.InputStream
+    "endpoint": ("last_speech", "stop"),  # Waiting for the silence timeout (or the user)
+    "encode": ("stop", "encoded"),  # Finalizing the upload payload
+    "queue": ("encoded", "job_start"),  # Waiting for a transcription worker
+    "connect": ("connect_start", "upload_start"),  # TCP/TLS when no pooled connection was ready
+    "upload": ("upload_start", "upload_end"),  # Sending the request body
+    "api_response": ("upload_end", "response"),  # Server processing until response headers
+    "transcribe": ("job_start", "transcribed"),  # Whole API call, retries included
+    "postprocess": ("transcribed", "postprocessed"),
+    "output": ("postprocessed", "delivered"),  # Output sinks (paste, typing, file...)
+    "first_text": ("last_speech", "first_text"),  # Until the first words are visible
+    "speech_to_text": ("last_speech", "delivered"),  # What the user waits for
+    "total": ("hotkey", "delivered"),
+}
+
+# httpcore trace events -> marks
+HTTP_EVENTS = {
+    "connection.connect_tcp.started": "connect_start",
+    "http11.send_request_headers.started": "upload_start",
+    "http2.send_request_headers.started": "upload_start",
+    "http11.send_request_body.complete": "upload_end",
+    "http2.send_request_body.complete": "upload_end",
+    "http11.receive_response_headers.complete": "response",
+    "http2.receive_response_headers.complete": "response",
+}
+
+_local = threading.local()
+
+
+class Trace:
+    """Timestamps of one dictation, from hotkey to paste"""
+    
+    def __init__(self, trace_id):
+        self.id = trace_id
+        self.t0 = time.perf_counter()
+        self.wall = time.time()
+        self.marks = {"hotkey": 0.0}  # Seconds since the hotkey
+        self.meta = {}
+        self.lock = threading.Lock()
+    
+    def mark(self, name, at=None):
+        """
+        Record when a step happened; the first mark of a name wins
+        
+        Args:
+            name: Mark name, see STAGES
+            at: time.perf_counter() value, defaults to now
+        """
+        at = time.perf_counter() if at is None else at
+        with self.lock:
+            self.marks.setdefault(name, at - self.t0)
+    
+    def mark_wall(self, name, wall_time):
+        """Record a mark given as a time.time() value"""
+        self.mark(name, time.perf_counter() - (time.time() - wall_time))
+    
+    def on_http_event(self, event, info):
+        """httpx/httpcore trace extension callback"""
+        name = HTTP_EVENTS.get(event)
+        if name:
+            self.mark(name)
+    
+    def stages(self):
+        """Stage durations in milliseconds for the marks recorded"""
+        with self.lock:
+            marks = dict(self.marks)
+        durations = {}
+        for stage, (start, end) in STAGES.items():
+            if start in marks and end in marks and marks[end] >= marks[start]:
+                durations[stage] = round((marks[end] - marks[start]) * 1000, 1)
+        return durations
+    
+    def to_dict(self, outcome):
+        return {
+            "id": self.id,
+            "ts": round(self.wall, 3),
+            "outcome": outcome,
+            "stages": self.stages(),
+            **({"meta": self.meta} if self.meta else {}),
+        }
+
+
+@contextmanager
+def activate(trace):
+    """Make trace current on this thread so HTTP requests report into it"""
+    previous = getattr(_local, "trace", None)
+    _local.trace = trace
+    try:
+        yield trace
+    finally:
+        _local.trace = previous
+
+
+def request_hook(request):
+    """httpx request event hook that attaches the current trace"""
+    trace = getattr(_local, "trace", None)
+    if trace is not None:
+        request.extensions["trace"] = trace.on_http_event
+
+
+class Tracer:
+    """
+    Collects finished traces
+    
+    Appends one compact JSON line per dictation and keeps rolling
+    percentiles per stage over the last window traces.
+    """
+    
+    def __init__(self, path="traces.jsonl", window=200, report_every=10):
+        self.path = path  # None keeps traces in memory only
+        self.window = window
+        self.report_every = report_every
+        self.ids = itertools.count(1)
+        self.history = {}  # stage -> deque of milliseconds
+        self.finished = 0
+        self.lock = threading.Lock()
+        if path:
+            self._load()
+    
+    def start(self, at=None):
+        """Begin a trace; at is the perf_counter() time of the hotkey"""
+        trace = Trace(f"{int(time.time())}-{next(self.ids)}")
+        if at is not None:
+            trace.t0 = at
+        return trace
+    
+    def finish(self, trace, outcome="ok"):
+        """Record a finished trace"""
+        if trace is None:
+            return
+        record = trace.to_dict(outcome)
+        with self.lock:
+            self.finished += 1
+            if outcome == "ok":
+                self._add(record["stages"])
+            report = self.report_every and self.finished % self.report_every == 0
+        
+        if self.path:
+            try:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(record, separators=(",", ":")) + "\n")
+            except OSError as e:
+                logger.warning(f"Could not write trace: {e}")
+        
+        stages = record["stages"]
+        logger.info(
+            f"Trace {trace.id} ({outcome}): speech-to-text {stages.get('speech_to_text', '-')} ms, "
+            f"total {stages.get('total', '-')} ms"
+        )
+        if report:
+            logger.info(f"Latency percentiles: {self.report()}")
+    
+    def percentiles(self):
+        """
+        Rolling percentiles per stage
+        
+        Returns:
+            dict: {stage: {"p50", "p95", "p99", "count"}} in milliseconds
+        """
+        with self.lock:
+            history = {stage: np.array(values) for stage, values in self.history.items() if values}
+        result = {}
+        for stage in STAGES:
+            if stage in history:
+                p50, p95, p99 = np.percentile(history[stage], [50, 95, 99])
+                result[stage] = {
+                    "p50": round(float(p50), 1),
+                    "p95": round(float(p95), 1),
+                    "p99": round(float(p99), 1),
+                    "count": len(history[stage]),
+                }
+        return result
+    
+    def report(self):
+        """One-line p50/p95/p99 summary"""
+        return ", ".join(
+            f"{stage} {p['p50']:.0f}/{p['p95']:.0f}/{p['p99']:.0f}"
+            for stage, p in self.percentiles().items()
+        )
+    
+    def _add(self, stages):
+        for stage, ms in stages.items():
+            self.history.setdefault(stage, deque(maxlen=self.window)).append(ms)
+    
+    def _load(self):
+        """Seed the rolling window from the end of an existing trace file"""
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                lines = deque(f, maxlen=self.window)
+        except OSError as e:
+            logger.warning(f"Could not read traces: {e}")
+            return
+        for line in lines:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if record.get("outcome") == "ok":
+                self._add(record.get("stages", {}))
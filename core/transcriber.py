@@ -1,19 +1,66 @@
 # Transcription Service
+import os
+import time
 import logging
-from groq import Groq
+from concurrent.futures import ThreadPoolExecutor
+
+from .encoding import AudioPayload, PayloadReader
+from .chunking import AudioChunker, decode_audio
+from .backends import create_backend
+from .cache import TranscriptCache
+from .policy import RequestPolicy
+from .postprocess import PostProcessor, Capitalizer, create_postprocessor
+from .ratelimit import RateLimitExceeded
+from .tracing import activate
+from .transport import HttpTransport
 
 logger = logging.getLogger(__name__)
 
 
 class Transcriber:
-    """Handles audio transcription using Groq API"""
+    """Handles audio transcription through a pluggable backend (Groq by default)"""
     
-    def __init__(self, api_key, language="ar"):
+    def __init__(self, api_key, language="ar", transport=None, backend=None, cache=None, policy=None, chunker=None,
+                 rate_limit_queue=300.0, postprocessor=None):
         self.api_key = api_key
         self.language = language
-        self.client = None
+        self.cache = cache  # Optional TranscriptCache of raw transcripts
+        self.policy = policy or RequestPolicy()  # Deadline, retries and hedging
+        self.chunker = chunker  # Optional AudioChunker for recordings too long for one request
+        self.rate_limit_queue = rate_limit_queue  # Seconds a request may queue for rate-limit budget
+        self.postprocessor = postprocessor or PostProcessor()  # Cleanup, vocabulary and capitalization
+        
+        # Backend owns the keep-alive pool, which survives API key changes
+        self.backend = backend or create_backend("groq", transport, api_key=api_key)
+        self.backend.set_api_key(api_key)
+    
+    @property
+    def transport(self):
+        return self.backend.transport
+    
+    @property
+    def requires_api_key(self):
+        return self.backend.requires_api_key
+    
+    def set_backend(self, backend):
+        """Switch to another backend, closing the current one"""
+        if backend is self.backend:
+            return
+        self.backend.close()
+        self.backend = backend
+        self.backend.set_api_key(self.api_key)
+        logger.info(f"Transcription backend set to: {backend.name}")
+    
+    def set_api_key(self, api_key):
+        """Update the API key"""
+        self.api_key = api_key
         if api_key:
-            self.client = Groq(api_key=api_key)
+            self.backend.set_api_key(api_key)
+    
+    def prewarm(self):
+        """Open a connection in the background before audio is ready"""
+        if self.api_key or not self.requires_api_key:
+            self.backend.prewarm()
     
     def set_language(self, language):
         """Update transcription language"""
@@ -31,52 +78,69 @@ class Transcriber:
         Returns:
             Capitalized text
         """
-        import re
-        
-        if not text:
-            return text
-        
-        # Capitalize first letter
-        result = text[0].upper() + text[1:] if len(text) > 0 else text
-        
-        # Capitalize after sentence endings (. ! ?)
-        result = re.sub(r'([.!?]\s+)([a-z])', lambda m: m.group(1) + m.group(2).upper(), result)
-        
-        return result
+        return Capitalizer().apply(text)
+    
+    @staticmethod
+    def _upload_file(audio):
+        """Build the (filename, content) pair sent to the API"""
+        if isinstance(audio, AudioPayload):
+            if audio.mapped:
+                return (audio.name, memoryview(audio.data))  # Read from the map, never copied
+            return (audio.name, bytes(audio.data))
+        if isinstance(audio, (bytes, bytearray, memoryview)):
+            return ("audio.wav", bytes(audio))
+        with open(audio, "rb") as f:
+            return (os.path.basename(audio), f.read())
     
-    def transcribe(self, audio_file_path, auto_capitalize=True):
+    def transcribe(self, audio, auto_capitalize=True, language=None, trace=None, postprocess=True):
         """
-        Transcribe audio file to text
+        Transcribe audio to text
         
         Args:
-            audio_file_path: Path to WAV file
+            audio: AudioPayload, encoded audio bytes/buffer, or path to an audio file
             auto_capitalize: Whether to apply auto-capitalization
+            language: Override the configured language for this request
+            trace: Optional Trace that receives request timings
+            postprocess: Run the post-processing chain (off for text post-processed later)
             
         Returns:
             str: Transcribed text or None on error
         """
-        if not self.api_key:
+        if self.requires_api_key and not self.api_key:
             logger.error("No API key configured")
             raise ValueError("API key required for transcription")
         
-        if not self.client:
-            self.client = Groq(api_key=self.api_key)
-        
+        language = language or self.language
+        if trace is not None:
+            trace.mark("job_start")
         try:
-            logger.info(f"Transcribing audio (language={self.language})...")
+            logger.info(f"Transcribing audio (language={language})...")
             
-            with open(audio_file_path, "rb") as f:
-                result = self.client.audio.transcriptions.create(
-                    file=(audio_file_path, f.read()),
-                    model="whisper-large-v3",
-                    language=self.language,
-                    response_format="text"
-                )
+            upload = self._upload_file(audio)
+            key = None
+            if self.cache is not None:
+                key = self.cache.key(upload[1], language, self.backend.name, self.backend.model)
+                result = self.cache.get(key)
+                if result is not None:
+                    logger.info("Transcript served from cache")
+                    if trace is not None:
+                        trace.meta["cache"] = "hit"
+            if key is None or result is None:
+                duration = audio.duration if isinstance(audio, AudioPayload) else None
+                if self.chunker is not None and self.chunker.should_split(upload[1], duration):
+                    result = self._transcribe_chunks(upload[1], language, trace)
+                else:
+                    result = self._call(upload, language, trace)
+                if key is not None:
+                    self.cache.put(key, result)
+            if trace is not None:
+                trace.mark("transcribed")
             
+            if result and postprocess:
+                result = self.postprocessor.apply(result, capitalize=auto_capitalize)
             if result:
-                # Apply auto-capitalization if enabled
-                if auto_capitalize:
-                    result = self.capitalize_text(result)
+                if trace is not None:
+                    trace.mark("postprocessed")
                 
                 logger.info(f"Transcription complete: {result}")
                 return result
@@ -87,3 +151,141 @@ class Transcriber:
         except Exception as e:
             logger.error(f"Transcription error: {e}")
             raise
+    
+    def _transcribe_chunks(self, data, language, trace=None):
+        """
+        Transcribe a long recording as overlapping chunks in parallel
+        
+        Each chunk is its own request under the policy (deadline, retries,
+        hedging); the texts are merged with the overlaps de-duplicated.
+        
+        Args:
+            data: Encoded payload
+            language: Language code
+            trace: Optional Trace of the dictation
+        
+        Returns:
+            str: Merged transcript
+        """
+        samples, sample_rate = decode_audio(data)
+        spans = self.chunker.spans(samples, sample_rate)
+        logger.info(
+            f"Splitting {len(samples) / sample_rate:.0f}s recording into {len(spans)} chunks "
+            f"({self.chunker.workers} at a time)"
+        )
+        if trace is not None:
+            trace.meta["chunks"] = len(spans)
+        
+        def transcribe_chunk(index, start, end):
+            # Encoded in the worker, so at most `workers` chunks are in memory
+            upload = (f"chunk{index}{self.chunker.suffix}", self.chunker.encode(samples[start:end], sample_rate))
+            return self._call(upload, language, None)
+        
+        executor = ThreadPoolExecutor(max_workers=self.chunker.workers, thread_name_prefix="chunk")
+        try:
+            futures = [executor.submit(transcribe_chunk, i, start, end) for i, (start, end) in enumerate(spans)]
+            texts = [future.result() for future in futures]
+        finally:
+            # On failure, chunks not started yet are dropped
+            executor.shutdown(wait=False, cancel_futures=True)
+        return self.chunker.merge(texts)
+    
+    def _call(self, upload, language, trace):
+        """
+        One upload under the request policy, queued behind the rate limits
+        
+        The deadline only starts once a key has budget, so a burst queues
+        instead of timing out. A request that is rate limited anyway (429)
+        goes back in the queue rather than failing.
+        
+        Raises:
+            RateLimitExceeded: If the queue wait would exceed rate_limit_queue
+        """
+        queue_deadline = time.monotonic() + self.rate_limit_queue
+        while True:
+            self.backend.keys.wait(max(0.0, queue_deadline - time.monotonic()))
+            try:
+                return self.policy.call(
+                    lambda remaining: self._request(upload, language, remaining, trace),
+                    self.backend.is_retryable
+                )
+            except Exception as e:
+                if not self._rate_limited(e) or time.monotonic() >= queue_deadline:
+                    raise
+                logger.info("Rate limited, request queued again")
+    
+    @staticmethod
+    def _rate_limited(error):
+        if isinstance(error, RateLimitExceeded):
+            return True
+        response = getattr(error, "response", None)
+        return (getattr(error, "status_code", None) or getattr(response, "status_code", None)) == 429
+    
+    def _request(self, upload, language, remaining, trace):
+        """One backend call, reporting HTTP timings into the trace"""
+        if not isinstance(upload[1], memoryview):
+            with activate(trace):
+                return self.backend.transcribe(upload, language, timeout=remaining)
+        
+        # Hedged attempts run concurrently, so each gets its own reader over the map
+        with PayloadReader(upload[1]) as reader, activate(trace):
+            return self.backend.transcribe((upload[0], reader), language, timeout=remaining)
+
+
+def create_transcriber(config, concurrency=1):
+    """
+    Build the transcription pipeline described by the app config
+    
+    Args:
+        config: ConfigManager (or anything with get(key))
+        concurrency: Transcriptions the caller runs at once
+    
+    Returns:
+        Transcriber with backend, cache, request policy, chunker and post-processor
+    """
+    # Long recordings go out as parallel chunks
+    chunker = None
+    workers = concurrency
+    if config.get("chunk_long_audio"):
+        chunker = AudioChunker(
+            chunk_seconds=config.get("chunk_seconds") or 60.0,
+            overlap=config.get("chunk_overlap") or 1.5,
+            max_bytes=int((config.get("max_upload_mb") or 24) * 1024 * 1024),
+            workers=config.get("chunk_workers") or 4
+        )
+        workers = max(concurrency, chunker.workers)
+    # Leave room for hedged duplicates
+    pool = max(4, 2 * workers)
+    
+    backend = create_backend(
+        config.get("backend") or "groq",
+        HttpTransport(
+            connect_timeout=config.get("connect_timeout") or 5.0,
+            request_timeout=config.get("request_timeout") or 30.0,
+            max_connections=pool
+        ),
+        base_url=config.get("backend_url"),
+        model=config.get("model"),
+        api_key=config.get("api_key")
+    )
+    # Requests are spread over every key, each with its own rate limits
+    backend.set_extra_keys(config.get("api_keys"))
+    
+    return Transcriber(
+        config.get("api_key"),
+        config.get("language"),
+        backend=backend,
+        cache=TranscriptCache(
+            directory=config.get("cache_dir") or None,
+            max_disk_bytes=int((config.get("cache_disk_mb") or 50) * 1024 * 1024)
+        ),
+        policy=RequestPolicy(
+            deadline=config.get("deadline") or 20.0,
+            max_retries=config.get("max_retries"),
+            hedge=bool(config.get("hedge_requests")),
+            max_workers=pool
+        ),
+        chunker=chunker,
+        rate_limit_queue=config.get("rate_limit_queue") or 300.0,
+        postprocessor=create_postprocessor(config)
+    )
@@ -0,0 +1,90 @@
+# HTTP Transport
+import time
+import threading
+import logging
+import httpx
+
+from .tracing import request_hook
+
+logger = logging.getLogger(__name__)
+
+GROQ_BASE_URL = "https://api.groq.com"
+
+
+class HttpTransport:
+    """Persistent keep-alive connection pool shared by the API clients"""
+    
+    def __init__(self, base_url=GROQ_BASE_URL, connect_timeout=5.0, request_timeout=30.0,
+                 max_connections=4, keepalive_expiry=120.0):
+        self.base_url = base_url
+        self.connect_timeout = connect_timeout
+        self.request_timeout = request_timeout
+        self.keepalive_expiry = keepalive_expiry
+        
+        self.client = httpx.Client(
+            timeout=httpx.Timeout(request_timeout, connect=connect_timeout),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+                keepalive_expiry=keepalive_expiry
+            ),
+            event_hooks={"request": [request_hook]}  # Per-stage timings for traced requests
+        )
+        
+        self.last_used = 0.0
+        self.prewarm_lock = threading.Lock()
+    
+    @property
+    def timeout(self):
+        """Timeout object for per-request overrides"""
+        return httpx.Timeout(self.request_timeout, connect=self.connect_timeout)
+    
+    def timeout_within(self, seconds=None):
+        """Timeout that also respects a deadline seconds from now"""
+        if seconds is None:
+            return self.timeout
+        seconds = max(0.001, seconds)
+        return httpx.Timeout(min(self.request_timeout, seconds), connect=min(self.connect_timeout, seconds))
+    
+    def is_warm(self):
+        """Whether a pooled connection is probably still open"""
+        return time.monotonic() - self.last_used < self.keepalive_expiry / 2
+    
+    def mark_used(self):
+        """Record that a request just went through the pool"""
+        self.last_used = time.monotonic()
+    
+    def prewarm(self, wait=False):
+        """
+        Open a connection (DNS, TCP and TLS) ahead of the first request
+        
+        Args:
+            wait: Block until the handshake completes instead of running in the background
+        """
+        if self.is_warm():
+            return
+        if wait:
+            self._prewarm()
+        else:
+            threading.Thread(target=self._prewarm, daemon=True).start()
+    
+    def _prewarm(self):
+        """Issue a cheap request so the pool holds a ready connection"""
+        if not self.prewarm_lock.acquire(blocking=False):
+            return  # Another prewarm is already in flight
+        try:
+            start = time.perf_counter()
+            self.client.head(self.base_url, timeout=httpx.Timeout(self.connect_timeout))
+            self.mark_used()
+            logger.info(f"Connection prewarmed in {(time.perf_counter() - start) * 1000:.0f} ms")
+        except Exception as e:
+            logger.warning(f"Connection prewarm failed: {e}")
+        finally:
+            self.prewarm_lock.release()
+    
+    def close(self):
+        """Close pooled connections"""
+        try:
+            self.client.close()
+        except Exception:
+            pass
@@ -0,0 +1,242 @@
+# Voice Activity Detection
+import logging
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+logger = logging.getLogger(__name__)
+
+
+def volume_to_rms(volume, block_size):
+    """
+    Convert a level on the recorder's volume scale to per-sample RMS
+    
+    The volume meter, low-volume warning and silence_threshold setting all
+    use np.linalg.norm(block) * 10, which grows with the block size;
+    detectors compare per-sample RMS.
+    
+    Args:
+        volume: Level as np.linalg.norm(block) * 10
+        block_size: Samples per block (frames times channels)
+    
+    Returns:
+        float: Equivalent RMS
+    """
+    return volume / (10 * np.sqrt(block_size))
+
+
+def frame_signal(samples, frame_size):
+    """
+    Split mono samples into complete frames (zero-copy)
+    
+    Args:
+        samples: 1-D float array
+        frame_size: Samples per frame
+    
+    Returns:
+        Array of shape (frames, frame_size); trailing samples are ignored
+    """
+    count = len(samples) // frame_size
+    return samples[:count * frame_size].reshape(count, frame_size)
+
+
+class VoiceActivityDetector:
+    """
+    Base class for detectors that classify whole batches of frames at once
+    
+    Subclasses implement _detect(frames) and keep any state needed so that
+    feeding a signal in one batch or block by block gives the same result.
+    """
+    
+    def process(self, frames):
+        """
+        Classify frames as speech or not
+        
+        Args:
+            frames: Float array of shape (frames, frame_size)
+        
+        Returns:
+            Boolean array with one decision per frame
+        """
+        frames = np.asarray(frames, dtype=np.float32)
+        if frames.ndim == 1:
+            frames = frames[None, :]
+        if not len(frames):
+            return np.zeros(0, dtype=bool)
+        return self._detect(frames)
+    
+    def is_speech(self, block):
+        """Classify a single block (mono or (frames, channels))"""
+        block = np.asarray(block, dtype=np.float32)
+        if block.ndim > 1:
+            block = block.mean(axis=1)
+        return bool(self.process(block[None, :])[0])
+    
+    def reset(self):
+        """Forget adaptive state"""
+    
+    def _detect(self, frames):
+        raise NotImplementedError
+
+
+class EnergyDetector(VoiceActivityDetector):
+    """
+    Frame RMS against an adaptive noise floor
+    
+    The floor is a low percentile of recent frame levels, so stationary
+    room noise raises the bar instead of counting as speech.
+    """
+    
+    def __init__(self, threshold=0.015, margin=3.0, floor_window=128, floor_percentile=10):
+        self.threshold = threshold  # Minimum RMS ever counted as speech
+        self.margin = margin  # Required ratio above the noise floor
+        self.floor_window = floor_window
+        self.floor_percentile = floor_percentile
+        self.reset()
+    
+    def reset(self):
+        # Assume a floor that puts the adaptive bar exactly at the threshold
+        self.history = np.full(self.floor_window, self.threshold / self.margin, dtype=np.float32)
+        self.noise_floor = self.threshold / self.margin
+    
+    def levels(self, frames):
+        """RMS level per frame"""
+        return np.sqrt(np.mean(np.square(frames), axis=1))
+    
+    def floors(self, rms):
+        """Noise floor seen by each frame (from the frames before it)"""
+        series = np.concatenate([self.history, rms])
+        windows = sliding_window_view(series[:-1], self.floor_window)[-len(rms):]
+        floors = np.percentile(windows, self.floor_percentile, axis=1)
+        self.history = series[-self.floor_window:]
+        self.noise_floor = float(floors[-1])
+        return floors
+    
+    def _detect(self, frames):
+        rms = self.levels(frames)
+        floors = self.floors(rms)
+        return rms > np.maximum(self.threshold, floors * self.margin)
+
+
+class SpectralFluxDetector(VoiceActivityDetector):
+    """
+    Energy gate refined with spectral shape, spectral flux and zero-crossing rate
+    
+    Voiced speech is harmonic (low spectral flatness in the speech band)
+    and has a moderate zero-crossing rate; hiss and fan noise are flat and
+    cross zero often. Strong spectral flux catches syllable onsets that
+    are not yet clearly harmonic.
+    """
+    
+    def __init__(self, threshold=0.015, margin=3.0, sample_rate=44100,
+                 max_flatness=0.2, flux_threshold=0.5, max_zcr=0.3):
+        self.energy = EnergyDetector(threshold, margin)
+        self.sample_rate = sample_rate
+        self.max_flatness = max_flatness
+        self.flux_threshold = flux_threshold
+        self.max_zcr = max_zcr
+        self.band = None
+        self.reset()
+    
+    def reset(self):
+        self.energy.reset()
+        self.prev_spectrum = None
+    
+    def spectrum(self, frames):
+        """Windowed magnitude spectrum per frame"""
+        window = np.hanning(frames.shape[1]).astype(np.float32)
+        return np.abs(np.fft.rfft(frames * window, axis=1))
+    
+    def flatness(self, spectrum, frame_size):
+        """Spectral flatness (geometric / arithmetic mean power) in the 100-4000 Hz band"""
+        if self.band is None or len(self.band) != spectrum.shape[1]:
+            freqs = np.fft.rfftfreq(frame_size, 1.0 / self.sample_rate)
+            self.band = (freqs >= 100) & (freqs <= 4000)
+        power = np.square(spectrum[:, self.band]) + 1e-12
+        return np.exp(np.mean(np.log(power), axis=1)) / np.mean(power, axis=1)
+    
+    def flux(self, spectrum):
+        """Normalized positive spectral change per frame"""
+        prev = self.prev_spectrum if self.prev_spectrum is not None else spectrum[:1]
+        previous = np.concatenate([prev, spectrum[:-1]])
+        self.prev_spectrum = spectrum[-1:]
+        rise = np.maximum(spectrum - previous, 0.0).sum(axis=1)
+        return rise / (spectrum.sum(axis=1) + 1e-9)
+    
+    @staticmethod
+    def zero_crossing_rate(frames):
+        """Fraction of adjacent samples that change sign"""
+        signs = np.signbit(frames)
+        return np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / (frames.shape[1] - 1)
+    
+    def _detect(self, frames):
+        loud = self.energy.process(frames)
+        spectrum = self.spectrum(frames)
+        harmonic = self.flatness(spectrum, frames.shape[1]) < self.max_flatness
+        onset = self.flux(spectrum) > self.flux_threshold
+        return loud & (harmonic | onset) & (self.zero_crossing_rate(frames) < self.max_zcr)
+
+
+class HangoverSmoother(VoiceActivityDetector):
+    """
+    Debounces another detector
+    
+    Speech must last `onset` frames to count, and each speech frame keeps
+    the decision on for `hangover` more frames to bridge short gaps.
+    """
+    
+    def __init__(self, detector, onset=2, hangover=8):
+        self.detector = detector
+        self.onset = max(1, onset)
+        self.hangover = max(0, hangover)
+        self.reset()
+    
+    def reset(self):
+        self.detector.reset()
+        self.raw_tail = np.zeros(self.onset - 1, dtype=bool)
+        self.onset_tail = np.zeros(self.hangover, dtype=bool)
+    
+    def _detect(self, frames):
+        raw = self.detector.process(frames)
+        
+        # Onset: all of the last `onset` raw decisions are speech
+        series = np.concatenate([self.raw_tail, raw])
+        started = sliding_window_view(series, self.onset).all(axis=1)
+        self.raw_tail = series[len(series) - (self.onset - 1):]
+        
+        # Hangover: any onset decision within the last `hangover` frames
+        series = np.concatenate([self.onset_tail, started])
+        smoothed = sliding_window_view(series, self.hangover + 1).any(axis=1)
+        self.onset_tail = series[len(series) - self.hangover:]
+        return smoothed
+
+
+DETECTORS = {
+    "energy": EnergyDetector,
+    "spectral": SpectralFluxDetector,
+}
+
+
+def create_vad(name="energy", threshold=0.015, sample_rate=44100, onset=2, hangover=4):
+    """
+    Build a detector by name, wrapped in hangover smoothing
+    
+    Args:
+        name: One of DETECTORS
+        threshold: Minimum RMS level counted as speech
+        sample_rate: Sample rate of the analysed audio
+        onset: Frames of speech needed before a decision turns on
+        hangover: Frames a decision stays on after speech
+    
+    Returns:
+        VoiceActivityDetector
+    """
+    if name not in DETECTORS:
+        logger.warning(f"Unknown VAD '{name}', using energy")
+        name = "energy"
+    if name == "spectral":
+        detector = SpectralFluxDetector(threshold, sample_rate=sample_rate)
+    else:
+        detector = DETECTORS[name](threshold)
+    if onset <= 1 and hangover <= 0:
+        return detector
+    return HangoverSmoother(detector, onset, hangover)
@@ -1,11 +1,24 @@
 """
 Voice Dictation Widget - Professional Edition
 Modern, modular dictation application with Groq API integration
+
+Run with --profile-startup (or KLAM_PROFILE_STARTUP=1) to log per-module
+import times along with the startup phases.
 """
+import os
+import sys
+
+from utils.startup import profiler
+
+if "--profile-startup" in sys.argv or os.environ.get("KLAM_PROFILE_STARTUP"):
+    profiler.install()
+
 from utils.logger import setup_logging
-from ui.widget import DictationWidget
 
 if __name__ == "__main__":
     setup_logging()
-    app = DictationWidget()
+    with profiler.phase("import"):
+        from ui.widget import DictationWidget
+    with profiler.phase("window"):
+        app = DictationWidget()
     app.mainloop()
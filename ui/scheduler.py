@@ -0,0 +1,139 @@
+# Animation Scheduler
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class _Animation:
+    """Registration of one animation callback"""
+    
+    def __init__(self, callback, interval):
+        self.callback = callback
+        self.base_interval = interval
+        self.interval = interval
+        self.due = 0.0
+        self.quiet_frames = 0
+
+
+class AnimationScheduler:
+    """
+    Drives every UI animation from a single Tk timer
+    
+    Each animation is called at its own interval and returns whether it
+    changed anything; animations that stay unchanged are slowed down until
+    they change again. stop() cancels the timer, so a hidden widget causes
+    no wakeups at all.
+    """
+    
+    def __init__(self, root, idle_frames=30, max_interval=0.25):
+        self.root = root
+        self.idle_frames = idle_frames  # Unchanged frames before an animation slows down
+        self.max_interval = max_interval  # Slowest rate in seconds
+        self.animations = {}
+        self.after_id = None
+        self.running = False
+        
+        # Metrics
+        self.ticks = 0
+        self.calls = 0
+    
+    def register(self, name, callback, interval_ms):
+        """
+        Add an animation
+        
+        Args:
+            name: Unique name
+            callback: Called with no arguments; returns True if it redrew something
+            interval_ms: Frame interval while the animation is changing
+        """
+        self.animations[name] = _Animation(callback, interval_ms / 1000)
+        if self.running:
+            self._reschedule()
+    
+    def unregister(self, name):
+        self.animations.pop(name, None)
+    
+    def start(self):
+        """Start ticking (no-op if already running)"""
+        if self.running:
+            return
+        self.running = True
+        now = time.perf_counter()
+        for animation in self.animations.values():
+            animation.interval = animation.base_interval
+            animation.quiet_frames = 0
+            animation.due = now
+        self._reschedule()
+    
+    def stop(self):
+        """Stop ticking until start()"""
+        self.running = False
+        if self.after_id is not None:
+            try:
+                self.root.after_cancel(self.after_id)
+            except Exception:
+                pass
+            self.after_id = None
+    
+    def wake(self, name=None):
+        """Return an animation (or all) to full frame rate, e.g. on new input"""
+        now = time.perf_counter()
+        for key, animation in self.animations.items():
+            if name is None or key == name:
+                animation.interval = animation.base_interval
+                animation.quiet_frames = 0
+                animation.due = min(animation.due, now + animation.interval)
+        if self.running:
+            self._reschedule()
+    
+    def _reschedule(self):
+        """Arm the timer for the next due animation"""
+        if self.after_id is not None:
+            try:
+                self.root.after_cancel(self.after_id)
+            except Exception:
+                pass
+            self.after_id = None
+        if not self.running or not self.animations:
+            return
+        delay = min(animation.due for animation in self.animations.values()) - time.perf_counter()
+        self.after_id = self.root.after(max(1, int(delay * 1000)), self._tick)
+    
+    def _tick(self):
+        """Run every due animation and adapt its rate"""
+        self.after_id = None
+        if not self.running:
+            return
+        self.ticks += 1
+        now = time.perf_counter()
+        for name, animation in list(self.animations.items()):
+            if animation.due > now + 0.002:
+                continue
+            try:
+                changed = animation.callback()
+            except Exception as e:
+                logger.error(f"Animation '{name}' failed: {e}")
+                changed = False
+            self.calls += 1
+            
+            if changed:
+                animation.quiet_frames = 0
+                animation.interval = animation.base_interval
+            else:
+                animation.quiet_frames += 1
+                if animation.quiet_frames >= self.idle_frames:
+                    animation.interval = min(animation.interval * 2, self.max_interval)
+                    animation.quiet_frames = 0
+            animation.due = now + animation.interval
+        self._reschedule()
+    
+    @property
+    def stats(self):
+        """Tick counts and current frame intervals"""
+        return {
+            "running": self.running,
+            "ticks": self.ticks,
+            "calls": self.calls,
+            "intervals_ms": {name: round(a.interval * 1000, 1) for name, a in self.animations.items()},
+        }
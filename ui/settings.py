@@ -111,11 +111,12 @@ class SettingsWindow(ctk.CTkToplevel):
         # Save if valid
         old_hotkey = self.config.get("hotkey")
         
-        self.config.set("api_key", api_key)
-        self.config.set("language", language)
-        self.config.set("hotkey", hotkey if hotkey else "windows+0")
-        self.config.set("silence_duration", silence_duration)
-        self.config.set("auto_capitalize", self.auto_capitalize_var.get())
+        with self.config.batch():
+            self.config.set("api_key", api_key)
+            self.config.set("language", language)
+            self.config.set("hotkey", hotkey if hotkey else "windows+0")
+            self.config.set("silence_duration", silence_duration)
+            self.config.set("auto_capitalize", self.auto_capitalize_var.get())
         
         # Re-register hotkey if changed
         if hotkey and hotkey != old_hotkey:
@@ -3,6 +3,7 @@ import tkinter as tk
 import time
 import math
 import random
+import numpy as np
 from utils.constants import DPI_SCALE, WAVE_ACTIVE_COLOR, WAVE_IDLE_COLOR
 
 
@@ -22,26 +23,33 @@ class AudioVisualizer(tk.Canvas):
         self.bar_spacing = int(4 * DPI_SCALE)  # Space between bars
         self.min_height = int(3 * DPI_SCALE)  # Minimum dot size
         self.max_height = height * 0.7  # Maximum bar height
+        self.idle_amplitude = int(4 * DPI_SCALE)
         
         # Animation state
         self.target_volume = 0.0
         self.current_volume = 0.0
+        self.is_active = False
         
         # Bar state (height and velocity for spring physics)
-        self.bar_heights = [self.min_height] * self.bar_count
-        self.bar_velocities = [0.0] * self.bar_count
-        self.bar_targets = [self.min_height] * self.bar_count
+        self.bar_heights = np.full(self.bar_count, float(self.min_height))
+        self.bar_velocities = np.zeros(self.bar_count)
+        self.drawn_heights = np.full(self.bar_count, -1)  # Pixel heights on the canvas
         
-        # Random phases for idle animation
-        self.bar_phases = [random.random() * math.pi * 2 for _ in range(self.bar_count)]
+        # Symmetric factor (1.0 at center, 0.0 at edges) and mirrored random
+        # phases, so the right half always matches the left
+        center = self.bar_count // 2
+        distance = np.abs(np.arange(self.bar_count) - center)
+        self.sym_factors = 1.0 - distance / center if center > 0 else np.ones(self.bar_count)
+        left = [random.random() * math.pi * 2 for _ in range(center + 1)]
+        self.bar_phases = np.array(left + left[-2::-1])
         
-        # Create bars
+        # Create bars; x positions are fixed, so they are cached
         self.bars = []
         total_width = (self.bar_width * self.bar_count) + (self.bar_spacing * (self.bar_count - 1))
         start_x = (width - total_width) / 2
+        self.bar_x = [start_x + i * (self.bar_width + self.bar_spacing) for i in range(self.bar_count)]
         
-        for i in range(self.bar_count):
-            x = start_x + i * (self.bar_width + self.bar_spacing)
+        for x in self.bar_x:
             bar = self.create_line(
                 x, height/2,
                 x, height/2,
@@ -51,85 +59,86 @@ class AudioVisualizer(tk.Canvas):
             )
             self.bars.append(bar)
         
-        self._animate()
+        # Render metrics
+        self.frames = 0
+        self.skipped_frames = 0  # Frames where no bar moved by a pixel
+        self.bar_updates = 0
+        self.frame_time = 0.0  # Smoothed seconds per frame
+        self.max_frame_time = 0.0
     
     def set_volume(self, vol):
         """Set target volume for animation"""
         self.target_volume = min(vol * 60, 1.0)
     
-    def _get_symmetric_factor(self, index):
-        """Get position factor for symmetric design (0=edge, 1=center)"""
-        center = self.bar_count // 2
-        distance_from_center = abs(index - center)
-        max_distance = center
-        return 1.0 - (distance_from_center / max_distance) if max_distance > 0 else 1.0
+    def _targets(self, t):
+        """Target heights of all bars for time t"""
+        if self.is_active:
+            # Active mode: audio-reactive, center bars tallest
+            base_amplitude = self.min_height + (self.max_height - self.min_height) * self.current_volume
+            noise = np.sin(t * 3 + self.bar_phases) * 0.2 + 1.0
+            return self.min_height + (base_amplitude - self.min_height) * self.sym_factors * noise
+        
+        # Idle mode: gentle symmetric pulsing
+        idle_wave = np.sin(t * 2 + self.bar_phases) * 0.5 + 0.5
+        return (self.min_height + self.idle_amplitude * idle_wave) * (0.3 + 0.7 * self.sym_factors)
     
-    def _animate(self):
-        """Animate the bars with symmetric mirroring"""
-        # Smooth volume transition
-        diff = self.target_volume - self.current_volume
-        self.current_volume += diff * 0.25
+    def tick(self):
+        """
+        Advance the spring physics and redraw the bars that changed
         
-        t = time.time()
-        center = self.bar_count // 2
+        Called by the AnimationScheduler about every 16 ms.
         
-        # Determine if we're in active mode
+        Returns:
+            bool: Whether anything was redrawn
+        """
+        if not self.winfo_viewable():
+            return False
+        start = time.perf_counter()
+        
+        # Smooth volume transition
+        self.current_volume += (self.target_volume - self.current_volume) * 0.25
         is_active = self.current_volume > 0.05
+        recolor = is_active != self.is_active
+        self.is_active = is_active
         
-        # Update bar targets
-        for i in range(self.bar_count):
-            # Get symmetric factor (1.0 at center, 0.0 at edges)
-            sym_factor = self._get_symmetric_factor(i)
-            
-            if is_active:
-                # Active mode: audio-reactive with symmetry
-                # Center bars are tallest, edge bars are smallest
-                base_amplitude = self.min_height + (self.max_height - self.min_height) * self.current_volume
-                
-                # Add some randomness for natural feel (but keep it symmetric)
-                if i <= center:
-                    # Left half or center - generate random
-                    noise = math.sin(t * 3 + self.bar_phases[i]) * 0.2 + 1.0
-                    target = self.min_height + (base_amplitude - self.min_height) * sym_factor * noise
-                else:
-                    # Right half - mirror the left
-                    mirror_index = self.bar_count - 1 - i
-                    target = self.bar_targets[mirror_index]
-                
-                self.bar_targets[i] = target
-            else:
-                # Idle mode: gentle symmetric pulsing
-                idle_wave = math.sin(t * 2 + self.bar_phases[i]) * 0.5 + 0.5
-                idle_amplitude = self.min_height + int(4 * DPI_SCALE) * idle_wave
-                
-                # Make it symmetric
-                if i <= center:
-                    self.bar_targets[i] = idle_amplitude * (0.3 + 0.7 * sym_factor)
-                else:
-                    mirror_index = self.bar_count - 1 - i
-                    self.bar_targets[i] = self.bar_targets[mirror_index]
-        
-        # Apply spring physics to reach targets smoothly
+        # Spring physics to reach targets smoothly
         spring_strength = 0.18
         damping = 0.72
+        force = (self._targets(time.time()) - self.bar_heights) * spring_strength
+        self.bar_velocities = self.bar_velocities * damping + force
+        self.bar_heights += self.bar_velocities
         
-        for i, bar in enumerate(self.bars):
-            # Spring physics
-            force = (self.bar_targets[i] - self.bar_heights[i]) * spring_strength
-            self.bar_velocities[i] = self.bar_velocities[i] * damping + force
-            self.bar_heights[i] += self.bar_velocities[i]
-            
-            # Clamp height
-            h = max(self.min_height, min(self.bar_heights[i], self.max_height))
-            
-            # Update bar position (centered vertically)
-            x = self.coords(bar)[0]
-            y_center = self.height / 2
-            self.coords(bar, x, y_center - h/2, x, y_center + h/2)
-            
-            # Update color based on state
+        pixels = np.rint(np.clip(self.bar_heights, self.min_height, self.max_height)).astype(int)
+        changed = np.flatnonzero(pixels != self.drawn_heights)
+        y_center = self.height / 2
+        for i in changed:
+            x = self.bar_x[i]
+            h = pixels[i]
+            self.coords(self.bars[i], x, y_center - h/2, x, y_center + h/2)
+        self.drawn_heights = pixels
+        
+        if recolor:
             color = WAVE_ACTIVE_COLOR if is_active else WAVE_IDLE_COLOR
-            self.itemconfig(bar, fill=color)
+            for bar in self.bars:
+                self.itemconfig(bar, fill=color)
         
-        # Schedule next frame (60 FPS)
-        self.after(16, self._animate)
+        # Metrics
+        elapsed = time.perf_counter() - start
+        self.frames += 1
+        self.bar_updates += len(changed)
+        if not len(changed) and not recolor:
+            self.skipped_frames += 1
+        self.frame_time += (elapsed - self.frame_time) * 0.05
+        self.max_frame_time = max(self.max_frame_time, elapsed)
+        return bool(len(changed)) or recolor
+    
+    @property
+    def stats(self):
+        """Frame-time and redraw metrics"""
+        return {
+            "frames": self.frames,
+            "skipped_frames": self.skipped_frames,
+            "bar_updates_per_frame": round(self.bar_updates / self.frames, 2) if self.frames else 0.0,
+            "frame_time_ms": round(self.frame_time * 1000, 3),
+            "max_frame_time_ms": round(self.max_frame_time * 1000, 3),
+        }
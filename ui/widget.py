@@ -7,19 +7,13 @@ import time
 import math
 import os
 import logging
-import pyperclip
-import pyautogui
-import keyboard
-import pygame
 from ctypes import windll, byref, Structure, c_long
-import win32gui
-import pystray
-from PIL import Image, ImageDraw
 
 from utils.constants import *
+from utils.startup import lazy_import, profiler
 from config import ConfigManager
-from core import AudioRecorder, Transcriber
 from ui.visualizer import AudioVisualizer
+from ui.scheduler import AnimationScheduler
 from ui.settings import SettingsWindow
 
 logger = logging.getLogger(__name__)
@@ -28,6 +22,12 @@ logger = logging.getLogger(__name__)
 ctk.set_appearance_mode("Dark")
 ctk.set_default_color_theme("blue")
 
+# Heavy modules load on first use; core, pystray and PIL are imported by the init methods
+pyautogui = lazy_import("pyautogui")
+keyboard = lazy_import("keyboard")
+pygame = lazy_import("pygame")
+win32gui = lazy_import("win32gui")
+
 
 class DictationWidget(ctk.CTk):
     """Main voice dictation widget"""
@@ -37,8 +37,8 @@ class DictationWidget(ctk.CTk):
         
         logger.info("Starting Voice Dictation Widget")
         
-        # Config
-        self.config = ConfigManager()
+        # Config (written in the background, reloaded when edited by hand)
+        self.config = ConfigManager(watch=True)
         
         # Window setup
         self._setup_window()
@@ -57,36 +57,111 @@ class DictationWidget(ctk.CTk):
         # Audio quality warning
         self.show_low_volume_warning = False
         
-        # Components
-        self.recorder = AudioRecorder(SAMPLE_RATE, CHANNELS, BLOCK_SIZE)
-        self.transcriber = Transcriber(
-            self.config.get("api_key"),
-            self.config.get("language")
-        )
+        # Chunks of the current recording in streaming mode
+        self.stream_session = None
+        
+        # Set once the recorder, transcriber, sound, hotkeys and tray exist
+        self.ready = threading.Event()
+        self.init_finished = threading.Event()  # Set even if startup failed
+        self.init_cancelled = threading.Event()  # Exit during startup skips the remaining phases
+        self.beep_sound = None
         
         # UI
-        self._create_ui()
+        with profiler.phase("ui"):
+            self._create_ui()
         
         # Bind drag events
         self._bind_drag_events()
         
-        # Sound
-        self._init_sound()
-        
-        # Hotkeys
-        self._register_hotkeys()
-        
         # Start hidden
         self.withdraw()
         
-        # Animations
-        self._pulse_indicator()
-        
-        # System Tray
-        self.setup_tray()
+        # Animations share one timer that only runs while the widget is shown
+        self.indicator_color = None
+        self.scheduler = AnimationScheduler(self)
+        self.scheduler.register("visualizer", self.visualizer.tick, 16)
+        self.scheduler.register("indicator", self._pulse_indicator, 50)
         
         # Exit handler
         self.protocol("WM_DELETE_WINDOW", self._exit_app)
+        
+        # Subsystems: in the background once the window is up, or right away
+        if self.config.get("lazy_startup"):
+            self.after_idle(self._start_background_init)
+        else:
+            self._init_subsystems()
+    
+    def _start_background_init(self):
+        """Initialise subsystems off the Tk thread after the first frame"""
+        profiler.mark("window_ready")
+        threading.Thread(target=self._init_subsystems, daemon=True).start()
+    
+    def _init_subsystems(self):
+        """Create the audio and API components, then sound, hotkeys and tray"""
+        phases = (
+            ("core", self._init_core),
+            ("sound", self._init_sound),
+            ("hotkeys", self._register_hotkeys),
+            ("tray", self.setup_tray),
+        )
+        try:
+            for name, init in phases:
+                if self.init_cancelled.is_set():
+                    logger.info(f"Startup cancelled before {name}")
+                    return
+                with profiler.phase(name):
+                    init()
+            self.ready.set()
+        except Exception as e:
+            logger.error(f"Startup failed: {e}")
+            self.after(0, self._show_message, "error", "Startup Error", f"Initialisation failed:\n{e}")
+        finally:
+            self.init_finished.set()
+            profiler.finish()
+    
+    def _init_core(self):
+        """Create the recorder, transcriber, tracer and job queue"""
+        from core import AudioRecorder, TranscriptionQueue
+        from core.transcriber import create_transcriber
+        from core.postprocess import config_signature
+        from core.sinks import create_output
+        from core.tracing import Tracer
+        from core.buffer import SpillBuffer
+        
+        self.recorder = AudioRecorder(
+            SAMPLE_RATE, CHANNELS, BLOCK_SIZE,
+            upload_rate=self.config.get("upload_sample_rate") or UPLOAD_SAMPLE_RATE,
+            codec=self.config.get("upload_codec") or UPLOAD_CODEC
+        )
+        self.transcriber = create_transcriber(self.config, concurrency=2)  # The job queue runs two at once
+        self.postprocess_signature = config_signature(self.config)
+        
+        # Optionally keep the microphone stream open with a pre-roll buffer
+        self._sync_standby()
+        
+        # Long recordings spill to disk; keep what a crash left behind
+        self._sync_spill()
+        if self.recorder.spill_dir:
+            recovered = SpillBuffer.recover(self.recorder.spill_dir)
+            if recovered:
+                self.after(0, self._show_message, "info", "Recording Recovered",
+                    f"{len(recovered)} interrupted recording(s) saved to:\n" + "\n".join(recovered))
+        
+        # Per-stage latency of each dictation, hotkey to paste
+        self.tracer = Tracer(self.config.get("trace_file") or None)
+        self.trace = None
+        
+        # Text goes out through the configured sinks (clipboard + paste by default)
+        self.output = create_output(self.config, paste=self._paste_to_window, focus=self._focus_window)
+        self.output_signature = self._output_signature()
+        self.stream_delivery = None
+        
+        # Background transcription; results are pasted in recording order
+        self.jobs = TranscriptionQueue(
+            max_workers=2,
+            on_result=self._on_job_result,
+            on_error=self._on_job_error
+        )
     
     def _setup_window(self):
         """Configure window properties"""
@@ -261,6 +336,9 @@ class DictationWidget(ctk.CTk):
     
     def setup_tray(self):
         """Setup system tray icon"""
+        import pystray
+        from PIL import Image, ImageDraw
+        
         def create_icon():
             img = Image.new('RGB', (64, 64), color='black')
             draw = ImageDraw.Draw(img)
@@ -286,7 +364,8 @@ class DictationWidget(ctk.CTk):
     
     def _toggle_from_tray(self, icon=None, item=None):
         """Toggle recording from tray"""
-        self.after(0, self._toggle)
+        at = time.perf_counter()
+        self.after(0, lambda: self._toggle(at))
     
     def _start_drag(self, event):
         """Start dragging the widget"""
@@ -316,14 +395,16 @@ class DictationWidget(ctk.CTk):
         # Save final position to config
         x = self.winfo_x()
         y = self.winfo_y()
-        self.config.set("widget_x", x)
-        self.config.set("widget_y", y)
+        with self.config.batch():
+            self.config.set("widget_x", x)
+            self.config.set("widget_y", y)
         logger.info(f"Widget position saved: ({x}, {y})")
     
     def _reset_position(self, icon=None, item=None):
         """Reset widget position to default centered location"""
-        self.config.set("widget_x", None)
-        self.config.set("widget_y", None)
+        with self.config.batch():
+            self.config.set("widget_x", None)
+            self.config.set("widget_y", None)
         logger.info("Widget position reset to default")
         
         # Re-position if currently visible
@@ -332,7 +413,8 @@ class DictationWidget(ctk.CTk):
     
     def _toggle_from_hotkey(self):
         """Toggle recording from hotkey"""
-        self.after(0, self._toggle)
+        at = time.perf_counter()
+        self.after(0, lambda: self._toggle(at))
     
     def _toggle_language(self):
         """Toggle between ar/en"""
@@ -343,11 +425,17 @@ class DictationWidget(ctk.CTk):
         self.lang_indicator.configure(text=new_lang.upper())
         logger.info(f"Language switched to: {new_lang}")
     
-    def _toggle(self):
+    def _toggle(self, hotkey_time=None):
         """Toggle recording on/off"""
+        if not self.ready.is_set():
+            logger.info("Still starting up, ignoring toggle")
+            return
         if self.is_visible:
             self._stop_and_hide()
         else:
+            self.trace = self.tracer.start(hotkey_time)
+            self.trace.mark("toggle")
+            
             # Save current foreground window
             try:
                 self.prev_window = win32gui.GetForegroundWindow()
@@ -358,26 +446,97 @@ class DictationWidget(ctk.CTk):
             
             self._position_widget()
             self.deiconify()
+            self.scheduler.start()
             self.is_visible = True
             self._start_recording()
     
     def _start_recording(self):
         """Start audio recording"""
         logger.info("Recording started")
+        # Errors flagged while the widget was hidden were never shown; don't replay them now
+        self.error_flash_count = 0
         if self.beep_sound:
             self.beep_sound.play()
         
+        # Get the TLS handshake out of the way while the user speaks
+        self._update_transcriber()
+        self.transcriber.prewarm()
+        
         # Setup recorder callbacks
-        self.recorder.on_volume_change = lambda vol: self.visualizer.set_volume(vol)
+        self._sync_standby()
+        self._sync_spill()
+        self.recorder.on_volume_change = self.visualizer.set_volume
         self.recorder.on_recording_complete = self._on_recording_complete
-        self.recorder.on_low_volume_warning = self._on_low_volume_warning
+        # Called from the record loop thread; Tk geometry changes belong on the main loop
+        self.recorder.on_low_volume_warning = lambda is_low: self.after(0, self._on_low_volume_warning, is_low)
+        self.recorder.low_volume_threshold = self.config.get("min_volume_threshold") or 0.01
+        self.recorder.ui_rate = self.config.get("ui_update_rate") or 15.0
+        self.recorder.vad_mode = self.config.get("vad") or "energy"
+        self.recorder.trim_silence = self.config.get("trim_silence") is not False
+        self.recorder.gate.max_pause = self.config.get("max_pause") or 1.0
+        self.recorder.set_upload_format(
+            self.config.get("upload_sample_rate") or UPLOAD_SAMPLE_RATE,
+            self.config.get("upload_codec") or UPLOAD_CODEC
+        )
+        
+        # Streaming mode transcribes finished chunks while the user keeps speaking,
+        # and their text goes out as soon as it is ready
+        self.stream_session = None
+        self.stream_delivery = None
+        self._sync_output()
+        self.recorder.streaming = bool(self.config.get("streaming_mode") and self._has_credentials())
+        if self.recorder.streaming:
+            from core import StreamingSession
+            self.stream_delivery = self._open_delivery(self.trace)
+            self.stream_session = StreamingSession(
+                self.transcriber,
+                auto_capitalize=self._auto_capitalize(),
+                on_text=self.stream_delivery.write
+            )
+            self.recorder.on_chunk_ready = self.stream_session.submit
         
         # Start recording
         self.recorder.start(
             self.config.get("silence_threshold"),
-            self.config.get("silence_duration")
+            self.config.get("silence_duration"),
+            trace=self.trace
         )
     
+    def _output_signature(self):
+        return [self.config.get(key) for key in ("output_sinks", "output_file", "output_socket", "typing_interval")]
+    
+    def _sync_output(self):
+        """Rebuild the output sinks when their settings change and nothing is being delivered"""
+        from core.sinks import create_output
+        
+        signature = self._output_signature()
+        if signature != self.output_signature and self.output.idle:
+            self.output.close()
+            self.output = create_output(self.config, paste=self._paste_to_window, focus=self._focus_window)
+            self.output_signature = signature
+    
+    def _open_delivery(self, trace):
+        """Reserve the next turn at the output sinks for a dictation"""
+        return self.output.open({"window": self.prev_window}, trace, on_finish=self._on_delivered)
+    
+    def _on_delivered(self, delivery):
+        """A dictation has fully reached the sinks (or ended without text)"""
+        self.tracer.finish(delivery.trace, delivery.outcome)
+    
+    def _sync_standby(self):
+        """Open or close the standby stream to match the config"""
+        if self.config.get("standby_mode"):
+            self.recorder.enter_standby((self.config.get("preroll_ms") or 400) / 1000)
+        elif self.recorder.in_standby:
+            self.recorder.leave_standby()
+    
+    def _sync_spill(self):
+        """Switch long-recording (disk-spilling) mode to match the config"""
+        directory = None
+        if self.config.get("long_recording"):
+            directory = self.config.get("spill_dir") or "recordings"
+        self.recorder.set_spill(directory, self.config.get("spill_ram_seconds") or 10.0)
+    
     def _stop_and_hide(self):
         """Stop recording and hide widget"""
         if not self.is_visible:
@@ -389,66 +548,188 @@ class DictationWidget(ctk.CTk):
         
         self.is_visible = False
         self.recorder.stop()
-        self.withdraw()
+        self._hide_widget()
         self.visualizer.set_volume(0)
     
-    def _on_recording_complete(self, audio_file, error=None):
+    def _hide_widget(self):
+        """Withdraw the widget and stop animating while it is hidden"""
+        self.withdraw()
+        self.scheduler.stop()
+    
+    def _on_recording_complete(self, payload, error=None, no_speech=False):
         """Callback when recording completes"""
-        self.after(0, self.withdraw)
+        self.after(0, self._hide_widget)
         self.is_visible = False
         
-        if error or not audio_file:
+        session = self.stream_session
+        self.stream_session = None
+        delivery = self.stream_delivery
+        self.stream_delivery = None
+        trace = self.trace
+        self.trace = None
+        
+        if session and session.chunk_count and not error:
+            # Earlier chunks carried speech, so a silent final chunk is expected
+            # Only the last short chunk is still in flight
+            if payload:
+                session.submit(payload)
+            self._transcribe_stream(session, delivery)
+            return
+        
+        if session:
+            session.cancel()
+        
+        if no_speech:
+            # The speech gate found nothing worth uploading
+            self._show_message("info", "No Speech Detected",
+                "Nothing was sent for transcription because no speech was heard.\n"
+                "If you were speaking, move closer to the microphone or raise its input level.")
+            if delivery:
+                delivery.close("no_speech")
+            else:
+                self.tracer.finish(trace, "no_speech")
+            return
+        
+        if error or not payload:
             logger.error(f"Recording failed: {error}")
             self.error_flash_count = 6
+            if delivery:
+                delivery.close("error" if error else "no_speech")
+            else:
+                self.tracer.finish(trace, "error" if error else "no_speech")
             return
         
         # Transcribe
-        self._transcribe(audio_file)
+        self._transcribe(payload, trace, delivery)
     
-    def _transcribe(self, filename):
-        """Transcribe audio file"""
-        try:
-            # Check API key
-            if not self.config.get("api_key"):
-                logger.error("No API key configured")
-                self.error_flash_count = 6
-                messagebox.showerror("API Key Required",
-                    "Please configure your Groq API key in Settings")
-                return
-            
-            # Update transcriber with latest config
-            self.transcriber.api_key = self.config.get("api_key")
-            self.transcriber.language = self.config.get("language")
-            
-            # Transcribe with auto-capitalization setting
-            auto_cap = self.config.get("auto_capitalize")
-            if auto_cap is None:
-                auto_cap = True  # Default to True if not set
-            
-            result = self.transcriber.transcribe(filename, auto_capitalize=auto_cap)
-            
-            if result:
-                pyperclip.copy(result)
-                
-                # Robust paste with retry logic
-                if self.prev_window:
-                    self._paste_to_window(self.prev_window)
-                else:
-                    logger.info("No previous window saved - text in clipboard only")
-        
-        except Exception as e:
-            logger.error(f"Transcription error: {e}")
+    def _transcribe(self, payload, trace=None, delivery=None):
+        """Queue the audio payload for transcription"""
+        # Check API key
+        if not self._has_credentials():
+            logger.error("No API key configured")
             self.error_flash_count = 6
-            messagebox.showerror("Transcription Error",
-                f"API Error: {str(e)}\nText may be in clipboard if partial success.")
+            self._show_message("error", "API Key Required",
+                "Please configure your Groq API key in Settings")
+            if delivery:
+                delivery.close("error")
+            else:
+                self.tracer.finish(trace, "error")
+            payload.close()
+            return
         
-        finally:
-            # Cleanup temp file
-            if filename and os.path.exists(filename):
-                try:
-                    os.remove(filename)
-                except:
-                    pass
+        # Update transcriber with latest config
+        self._update_transcriber()
+        
+        # Settings are captured now so later changes don't affect queued jobs
+        auto_cap = self._auto_capitalize()
+        language = self.config.get("language")
+        
+        def work():
+            try:
+                return self.transcriber.transcribe(payload, auto_capitalize=auto_cap, language=language, trace=trace)
+            finally:
+                payload.close()  # Removes the file behind a memory-mapped payload
+        
+        # A delivery left over from a streaming start keeps its place in line
+        delivery = delivery or self._open_delivery(trace)
+        
+        def cancel():
+            payload.close()
+            delivery.cancel()
+        
+        job = self.jobs.submit(work, on_cancel=cancel, context={"delivery": delivery, "streamed": False})
+        logger.info(f"Transcription job {job.id} submitted")
+    
+    def _transcribe_stream(self, session, delivery):
+        """Queue completion of a dictation whose text is streamed out as chunks finish"""
+        def cancel():
+            session.cancel()
+            delivery.cancel()
+        
+        job = self.jobs.submit(
+            lambda: session.finish(delivery.trace),
+            on_cancel=cancel,
+            context={"delivery": delivery, "streamed": True}
+        )
+        logger.info(f"Streaming job {job.id} submitted ({session.chunk_count} chunks)")
+    
+    def _on_job_result(self, job):
+        """Send a finished transcription to the output sinks (called in submission order)"""
+        delivery = job.context["delivery"]
+        if job.result and not job.context["streamed"]:
+            delivery.write(job.result)
+        delivery.close("ok" if job.result else "empty")
+    
+    def _on_job_error(self, job):
+        """Report a failed transcription on the UI thread"""
+        logger.error(f"Transcription error: {job.error}")
+        job.context["delivery"].close("error")
+        self.error_flash_count = 6
+        self._show_message("error", "Transcription Error",
+            f"API Error: {str(job.error)}\nText may be in clipboard if partial success.")
+    
+    def _show_message(self, kind, title, message):
+        """Show a message box from any thread"""
+        show = messagebox.showerror if kind == "error" else messagebox.showinfo
+        self.after(0, lambda: show(title, message))
+    
+    def _has_credentials(self):
+        """Whether the configured backend can be called"""
+        return bool(self.config.get("api_key")) or not self.transcriber.requires_api_key
+    
+    def _update_transcriber(self):
+        """Update transcriber with latest config"""
+        self.transcriber.set_api_key(self.config.get("api_key"))
+        self.transcriber.backend.set_extra_keys(self.config.get("api_keys"))
+        self.transcriber.language = self.config.get("language")
+        self._sync_postprocessor()
+    
+    def _sync_postprocessor(self):
+        """Rebuild the post-processing chain when its settings or vocabulary file change"""
+        from core.postprocess import create_postprocessor, config_signature
+        
+        signature = config_signature(self.config)
+        if signature != self.postprocess_signature:
+            self.postprocess_signature = signature
+            self.transcriber.postprocessor = create_postprocessor(self.config)
+    
+    def _auto_capitalize(self):
+        """Get auto-capitalization setting"""
+        auto_cap = self.config.get("auto_capitalize")
+        if auto_cap is None:
+            auto_cap = True  # Default to True if not set
+        return auto_cap
+    
+    @staticmethod
+    def _wait_foreground(window_handle, timeout=0.05):
+        """Poll until the window has focus, instead of sleeping a fixed time"""
+        deadline = time.perf_counter() + timeout
+        while win32gui.GetForegroundWindow() != window_handle:
+            if time.perf_counter() >= deadline:
+                return False
+            time.sleep(0.005)
+        return True
+    
+    def _focus_window(self, window_handle):
+        """
+        Bring a window to the foreground
+        
+        Returns:
+            bool: Whether it has focus
+        """
+        if not win32gui.IsWindow(window_handle):
+            logger.warning("Previous window no longer exists")
+            return False
+        if win32gui.GetForegroundWindow() == window_handle:
+            return True
+        for attempt in range(3):
+            try:
+                win32gui.SetForegroundWindow(window_handle)
+                if self._wait_foreground(window_handle):
+                    return True
+            except Exception as e:
+                logger.debug(f"Focus attempt {attempt + 1} failed: {e}")
+        return False
     
     def _paste_to_window(self, window_handle):
         """
@@ -456,28 +737,27 @@ class DictationWidget(ctk.CTk):
         
         Windows has security restrictions on SetForegroundWindow that can cause failures.
         This method implements multiple strategies to maximize success rate.
+        
+        Returns:
+            False if the window is gone, so the sink stops pasting this dictation
         """
         import ctypes
         
         # Check if window still exists
         if not win32gui.IsWindow(window_handle):
             logger.warning("Previous window no longer exists")
-            messagebox.showinfo("Text Copied",
+            self._show_message("info", "Text Copied",
                 "Window was closed. Text is in clipboard - paste manually (Ctrl+V)")
-            return
+            return False
         
-        # Strategy 1: Simple SetForegroundWindow with retry
-        for attempt in range(3):
+        # Strategy 1: Already focused (later segments of a dictation), or a plain SetForegroundWindow
+        if self._focus_window(window_handle):
             try:
-                win32gui.SetForegroundWindow(window_handle)
-                time.sleep(0.05)  # Short delay to let window come to foreground
                 pyautogui.hotkey('ctrl', 'v')
-                logger.info(f"Text pasted successfully (attempt {attempt + 1})")
+                logger.info("Text pasted successfully")
                 return  # Success!
             except Exception as e:
-                logger.debug(f"Paste attempt {attempt + 1} failed: {e}")
-                if attempt < 2:
-                    time.sleep(0.1 * (attempt + 1))  # Exponential backoff
+                logger.debug(f"Paste failed: {e}")
         
         # Strategy 2: AttachThreadInput method
         logger.info("Trying AttachThreadInput method...")
@@ -493,7 +773,7 @@ class DictationWidget(ctk.CTk):
                 try:
                     # Now try to set foreground
                     win32gui.SetForegroundWindow(window_handle)
-                    time.sleep(0.05)
+                    self._wait_foreground(window_handle)
                     pyautogui.hotkey('ctrl', 'v')
                     logger.info("Text pasted successfully (AttachThreadInput method)")
                     return  # Success!
@@ -508,15 +788,13 @@ class DictationWidget(ctk.CTk):
         try:
             # Restore window if minimized
             ctypes.windll.user32.ShowWindow(window_handle, 9)  # SW_RESTORE
-            time.sleep(0.05)
             
             # Bring to top
             win32gui.BringWindowToTop(window_handle)
-            time.sleep(0.05)
             
             # Try setting foreground again
             win32gui.SetForegroundWindow(window_handle)
-            time.sleep(0.05)
+            self._wait_foreground(window_handle, 0.1)
             
             pyautogui.hotkey('ctrl', 'v')
             logger.info("Text pasted successfully (BringWindowToTop method)")
@@ -542,20 +820,23 @@ class DictationWidget(ctk.CTk):
             self.show_low_volume_warning = False
     
     def _pulse_indicator(self):
-        """Animate the recording indicator"""
+        """Animate the recording indicator; returns whether its color changed"""
         if self.error_flash_count > 0:
-            self.indicator.configure(text_color=ERROR_COLOR if self.error_flash_count % 2 == 0 else GLASS_BG)
+            color = ERROR_COLOR if self.error_flash_count % 2 == 0 else GLASS_BG
             self.error_flash_count -= 1
         elif self.recorder.is_recording:
             t = time.time()
             alpha = 0.5 + 0.5 * math.sin(t * 4)
             r = int(255 * (0.6 + 0.4 * alpha))
             color = f"#{r:02x}4757"
-            self.indicator.configure(text_color=color)
         else:
-            self.indicator.configure(text_color=WAVE_IDLE_COLOR)
+            color = WAVE_IDLE_COLOR
         
-        self.after(50, self._pulse_indicator)
+        if color == self.indicator_color:
+            return False
+        self.indicator.configure(text_color=color)
+        self.indicator_color = color
+        return True
     
     def _exit_app(self, icon=None, item=None):
         """Clean shutdown"""
@@ -565,8 +846,31 @@ class DictationWidget(ctk.CTk):
         self.is_shutting_down = True
         logger.info("Shutting down...")
         
-        # Stop recording
+        # Stop a background startup at its next phase; wait for it from the
+        # main loop, which its Tk calls may need to finish
+        self.init_cancelled.set()
+        self.after(0, self._finish_exit, time.monotonic() + 10)
+    
+    def _finish_exit(self, deadline):
+        """Tear down once a background startup has stopped (or after the deadline)"""
+        if not self.init_finished.is_set() and time.monotonic() < deadline:
+            self.after(50, self._finish_exit, deadline)
+            return
+        
+        self.scheduler.stop()
+        if not hasattr(self, "jobs"):
+            # Startup stopped before the audio and API components existed
+            self.config.close()
+            self.destroy()
+            return
+        
+        # Stop recording and release the microphone
         self.recorder.stop()
+        self.recorder.leave_standby()
+        
+        # Drop queued transcriptions
+        self.jobs.shutdown()
+        self.output.close()
         
         # Unregister hotkeys
         try:
@@ -585,6 +889,13 @@ class DictationWidget(ctk.CTk):
         if hasattr(self, 'tray_icon'):
             self.tray_icon.stop()
         
+        # Abandon in-flight requests, then close pooled connections (and the local server, if any)
+        self.transcriber.policy.shutdown()
+        self.transcriber.backend.close()
+        
+        # Write pending config changes
+        self.config.close()
+        
         # Destroy window
         try:
             self.quit()
@@ -17,6 +17,8 @@ except:
 SAMPLE_RATE = 44100
 CHANNELS = 1
 BLOCK_SIZE = 1024
+UPLOAD_SAMPLE_RATE = 16000  # Whisper works at 16 kHz
+UPLOAD_CODEC = "flac"
 
 # UI Settings (with DPI scaling)
 WIDGET_WIDTH = int(200 * DPI_SCALE)
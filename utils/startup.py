@@ -0,0 +1,143 @@
+# Startup Profiling and Lazy Imports
+import sys
+import time
+import types
+import builtins
+import importlib
+import threading
+import logging
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+
+class StartupProfiler:
+    """
+    Times startup phases and, when enabled, every top-level import
+    
+    Phases are always recorded (they are cheap); per-module import times
+    need install(), which wraps __import__ until finish().
+    """
+    
+    def __init__(self):
+        self.start_time = time.perf_counter()
+        self.phases = []  # (name, start offset, seconds)
+        self.imports = {}  # top-level module -> cumulative seconds
+        self.lazy_imports = {}  # module -> seconds, loaded on first use
+        self.installed = False
+        self.finished = False
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self._original_import = None
+    
+    def install(self):
+        """Start timing imports"""
+        if self.installed:
+            return
+        self.installed = True
+        self._original_import = builtins.__import__
+        builtins.__import__ = self._import
+    
+    def uninstall(self):
+        if self.installed:
+            builtins.__import__ = self._original_import
+            self.installed = False
+    
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        if level or name in sys.modules:
+            return self._original_import(name, globals, locals, fromlist, level)
+        depth = getattr(self.local, "depth", 0)
+        self.local.depth = depth + 1
+        start = time.perf_counter()
+        try:
+            return self._original_import(name, globals, locals, fromlist, level)
+        finally:
+            self.local.depth = depth
+            if depth == 0:
+                # Outermost import only, so children are not counted twice
+                top = name.partition(".")[0]
+                with self.lock:
+                    self.imports[top] = self.imports.get(top, 0.0) + time.perf_counter() - start
+    
+    @contextmanager
+    def phase(self, name):
+        """Time a startup phase"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self.lock:
+                self.phases.append((name, start - self.start_time, time.perf_counter() - start))
+    
+    def mark(self, name):
+        """Record a point in time, e.g. the first frame"""
+        with self.lock:
+            self.phases.append((name, time.perf_counter() - self.start_time, 0.0))
+    
+    def record_lazy(self, name, seconds):
+        with self.lock:
+            self.lazy_imports[name] = seconds
+    
+    def report(self, top=15):
+        """
+        Returns:
+            dict: phases and slowest imports in milliseconds
+        """
+        with self.lock:
+            phases = list(self.phases)
+            imports = sorted(self.imports.items(), key=lambda item: item[1], reverse=True)[:top]
+            lazy = dict(self.lazy_imports)
+        return {
+            "total_ms": round((time.perf_counter() - self.start_time) * 1000, 1),
+            "phases": [
+                {"name": name, "at_ms": round(at * 1000, 1), "ms": round(seconds * 1000, 1)}
+                for name, at, seconds in phases
+            ],
+            "imports_ms": {name: round(seconds * 1000, 1) for name, seconds in imports},
+            "lazy_imports_ms": {name: round(seconds * 1000, 1) for name, seconds in lazy.items()},
+        }
+    
+    def finish(self):
+        """Stop timing imports and log the startup report once"""
+        if self.finished:
+            return
+        self.finished = True
+        self.uninstall()
+        report = self.report()
+        phases = ", ".join(f"{p['name']} {p['ms']:.0f} ms" if p['ms'] else f"{p['name']} @{p['at_ms']:.0f} ms"
+                           for p in report["phases"])
+        logger.info(f"Startup finished in {report['total_ms']:.0f} ms: {phases}")
+        if report["imports_ms"]:
+            imports = ", ".join(f"{name} {ms:.0f}" for name, ms in report["imports_ms"].items())
+            logger.info(f"Slowest imports (ms): {imports}")
+
+
+profiler = StartupProfiler()
+
+
+class LazyModule(types.ModuleType):
+    """Module placeholder that imports the real module on first attribute access"""
+    
+    def __init__(self, name):
+        super().__init__(name)
+        self.__dict__["_lazy_lock"] = threading.Lock()
+        self.__dict__["_lazy_module"] = None
+    
+    def _load(self):
+        with self._lazy_lock:
+            if self._lazy_module is None:
+                start = time.perf_counter()
+                module = importlib.import_module(self.__name__)
+                profiler.record_lazy(self.__name__, time.perf_counter() - start)
+                # Later lookups hit the copied attributes directly
+                self.__dict__.update(module.__dict__)
+                self.__dict__["_lazy_module"] = module
+        return self._lazy_module
+    
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+
+def lazy_import(name):
+    """Return name's module if already loaded, else a placeholder that loads it on first use"""
+    return sys.modules.get(name) or LazyModule(name)